@@ -0,0 +1,67 @@
+"""
+Loading a page of user profiles, one GET /users/{user_id}/profile per user vs
+one GET /users/profiles?ids=... request.
+
+Requests go through the ASGI app in-process (no network), so the per-request
+numbers understate what a browser would see for the one-per-user path.
+
+Run from the app directory:
+	python -m benchmarks.batch_profiles
+"""
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import db
+
+USERS = 2_000
+PAGE_SIZES = (10, 50, 200)
+RUNS = 20
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.executemany(
+		"INSERT INTO Users (user_id, name, email, pass, age, avg_heart_rate) VALUES (?, ?, ?, 'x', 40, 72)",
+		((user_id, f"user {user_id}", f"user{user_id}@example.com") for user_id in range(1, USERS + 1)),
+	)
+	conn.commit()
+	conn.close()
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+		from main import app
+
+		print(f"{USERS} users, mean of {RUNS} page loads")
+		with TestClient(app) as client:
+			for size in PAGE_SIZES:
+				ids = list(range(size, 0, -1))
+
+				def one_per_user() -> None:
+					for user_id in ids:
+						client.get(f"/users/{user_id}/profile").raise_for_status()
+
+				def batched() -> None:
+					client.get("/users/profiles", params={"ids": ",".join(map(str, ids))}).raise_for_status()
+
+				for label, load in (("one per user", one_per_user), ("batched", batched)):
+					load()
+					start = time.perf_counter()
+					for _ in range(RUNS):
+						load()
+					elapsed_ms = (time.perf_counter() - start) * 1000 / RUNS
+					print(f"{size:>4} profiles {label:<13} mean_ms={elapsed_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,93 @@
+"""
+Medication catalog reads, SQL vs the in-process catalog cache.
+
+A scratch database is seeded with MEDICATIONS medications. Two reads are timed,
+each from SQL on one aiosqlite connection and from CatalogCache:
+- the full list: the query GET /medications ran before vs the pre-encoded JSON
+- a name-prefix search: LIKE 'q%' vs the sorted name index
+
+Run from the app directory:
+	python -m benchmarks.catalog_cache
+"""
+import asyncio
+import json
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import aiosqlite
+
+import db
+from cache import CatalogCache
+from repositories import medications as meds_repo
+from repositories.records import fetch_records
+
+MEDICATIONS = 5_000
+RUNS = 500
+PREFIXES = ("met", "a", "zo", "ibu", "pred")
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	rng = random.Random(7)
+	names = {prefix.capitalize() + "".join(rng.choices(string.ascii_lowercase, k=6)) for prefix in PREFIXES for _ in range(40)}
+	while len(names) < MEDICATIONS:
+		names.add("".join(rng.choices(string.ascii_lowercase, k=9)).capitalize())
+	conn.executemany(
+		"INSERT INTO Medications (name, dosage, description) VALUES (?, '10mg', 'reference entry')",
+		((name,) for name in names),
+	)
+	conn.commit()
+	conn.close()
+
+
+async def measure(label: str, read: Callable[[int], Awaitable[Any]]) -> None:
+	await read(0)
+	start = time.perf_counter()
+	for n in range(RUNS):
+		await read(n)
+	print(f"{label:<28} mean_ms={(time.perf_counter() - start) * 1000 / RUNS:>8.3f}")
+
+
+async def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		path = Path(tmp) / "bench.sqlite3"
+		seed(path)
+		async with aiosqlite.connect(path.as_posix()) as conn:
+			conn.row_factory = aiosqlite.Row
+			catalog = CatalogCache("medication_id", revalidate_seconds=60)
+			catalog.replace(1, await meds_repo.get_all_medications(conn))
+
+			async def list_sql(n: int) -> bytes:
+				records = await fetch_records(conn, "SELECT * FROM Medications ORDER BY name")
+				return records.to_json()
+
+			async def list_cached(n: int) -> bytes:
+				return catalog.to_json()
+
+			async def search_sql(n: int) -> Any:
+				cursor = await conn.execute(
+					"SELECT * FROM Medications WHERE name LIKE ? ORDER BY name LIMIT 20",
+					(PREFIXES[n % len(PREFIXES)] + "%",),
+				)
+				return await cursor.fetchall()
+
+			async def search_cached(n: int) -> Any:
+				return catalog.search(PREFIXES[n % len(PREFIXES)], 20)
+
+			assert json.loads(await list_sql(0)) == json.loads(await list_cached(0)), "cached list must match the query"
+			print(f"{MEDICATIONS} medications, mean of {RUNS} reads")
+			await measure("list: SELECT + encode", list_sql)
+			await measure("list: cached JSON", list_cached)
+			await measure("search: LIKE 'q%'", search_sql)
+			await measure("search: sorted index", search_cached)
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
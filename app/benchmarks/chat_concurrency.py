@@ -0,0 +1,166 @@
+"""
+Chat turns per second, the Flask /chat (src/app.py) vs the FastAPI /chat (main.py).
+
+Gemini and Firestore are replaced by in-process fakes that only wait (GEMINI_LATENCY_MS
+per generation, FIRESTORE_LATENCY_MS per document read or write), so the numbers show
+how each path handles waiting on the network, not the network itself. SQLite is real:
+each turn reads the user's comprehensive data and logs one extracted symptom.
+
+The Flask path is served by FLASK_THREADS worker threads (a threaded WSGI server); each
+turn blocks its thread and every SQLite access runs asyncio.run on a fresh connection.
+The FastAPI path runs every turn as a task on the app's event loop with the shared pool.
+
+Run from the app directory (needs flask, google-generativeai and google-cloud-firestore
+from requirements.txt installed; no credentials are used):
+	python -m benchmarks.chat_concurrency
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+import google.generativeai as genai
+import httpx
+from fastapi.testclient import TestClient
+
+import db
+
+USERS = 50
+GEMINI_LATENCY_MS = 300
+FIRESTORE_LATENCY_MS = 20
+FLASK_THREADS = 8
+CONCURRENCY = (1, 8, 32)
+TURNS_PER_CLIENT = 4
+
+REPLY = json.dumps({"response": "Sorry to hear that. Rest and drink water.", "symptoms": ["headache"]})
+
+
+class FakeResponse:
+	text = REPLY
+
+
+class FakeModel:
+	"""Stands in for genai.GenerativeModel: waits GEMINI_LATENCY_MS, then answers."""
+
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def generate_content(self, prompt, **kwargs):
+		time.sleep(GEMINI_LATENCY_MS / 1000)
+		return FakeResponse()
+
+	async def generate_content_async(self, prompt, **kwargs):
+		await asyncio.sleep(GEMINI_LATENCY_MS / 1000)
+		return FakeResponse()
+
+
+class FakeSnapshot:
+	exists = False
+
+	def to_dict(self):
+		return {}
+
+
+class FakeDocument:
+	"""Stands in for a Firestore client, collection or document: every read or write waits."""
+
+	def __init__(self, is_async: bool):
+		self.is_async = is_async
+
+	def collection(self, name):
+		return self
+
+	def document(self, name):
+		return self
+
+	def get(self):
+		return self._wait(FakeSnapshot())
+
+	def set(self, data, merge=False):
+		return self._wait(None)
+
+	def _wait(self, result):
+		if not self.is_async:
+			time.sleep(FIRESTORE_LATENCY_MS / 1000)
+			return result
+
+		async def wait():
+			await asyncio.sleep(FIRESTORE_LATENCY_MS / 1000)
+			return result
+		return wait()
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.executemany(
+		"INSERT INTO Users (user_id, name, email, pass, age) VALUES (?, ?, ?, 'x', 40)",
+		((user_id, f"user {user_id}", f"user{user_id}@example.com") for user_id in range(1, USERS + 1)),
+	)
+	conn.commit()
+	conn.close()
+
+
+def flask_turns(flask_app, turns: int, concurrency: int) -> float:
+	def turn(n: int) -> None:
+		response = flask_app.test_client().post("/chat", json={"user_id": n % USERS + 1, "message": "I have a headache"})
+		assert response.status_code == 200, response.data
+
+	start = time.perf_counter()
+	with ThreadPoolExecutor(min(concurrency, FLASK_THREADS)) as pool:
+		list(pool.map(turn, range(turns)))
+	return turns / (time.perf_counter() - start)
+
+
+async def fastapi_turns(app, turns: int, concurrency: int) -> float:
+	limit = asyncio.Semaphore(concurrency)
+	async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+		async def turn(n: int) -> None:
+			async with limit:
+				response = await client.post("/chat", json={"user_id": n % USERS + 1, "message": "I have a headache"})
+				response.raise_for_status()
+
+		start = time.perf_counter()
+		await asyncio.gather(*(turn(n) for n in range(turns)))
+		return turns / (time.perf_counter() - start)
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+
+		genai.GenerativeModel = FakeModel
+		from src.storage import firebase_handler
+		firebase_handler._db_client = FakeDocument(is_async=False)
+		firebase_handler._async_db_client = FakeDocument(is_async=True)
+		from src.app import app as flask_app
+		from main import app
+
+		print(
+			f"Gemini {GEMINI_LATENCY_MS} ms, Firestore {FIRESTORE_LATENCY_MS} ms per call (simulated), "
+			f"Flask on {FLASK_THREADS} threads"
+		)
+		with TestClient(app) as client:
+			for concurrency in CONCURRENCY:
+				turns = concurrency * TURNS_PER_CLIENT
+				flask_rate = flask_turns(flask_app, turns, concurrency)
+				fastapi_rate = client.portal.call(fastapi_turns, app, turns, concurrency)
+				print(
+					f"concurrency={concurrency:>3} turns={turns:>4} "
+					f"flask_turns_per_s={flask_rate:>7.2f} fastapi_turns_per_s={fastapi_rate:>7.2f}"
+				)
+			symptoms = sqlite3.connect(db.DB_PATH).execute("SELECT COUNT(*) FROM Symptoms").fetchone()[0]
+			print(f"symptoms logged: {symptoms}")
+
+
+if __name__ == "__main__":
+	main()
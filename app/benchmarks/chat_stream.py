@@ -0,0 +1,165 @@
+"""
+Time until the user sees the answer, POST /chat vs POST /chat/stream (server-sent events).
+
+Gemini is replaced by an in-process fake that waits FIRST_CHUNK_MS before its first chunk
+and CHUNK_INTERVAL_MS between chunks, streaming the JSON reply in CHUNKS pieces (with
+stream=False it waits for all of them and returns the whole reply). Firestore is faked as in
+benchmarks.chat_concurrency. The app is served by uvicorn on a local port, since in-process transports
+hand the whole body over at once. The numbers show what streaming changes, given those
+model timings:
+- /chat: the first text arrives with the full response
+- /chat/stream: the first "delta" event arrives after the first chunk holding reply text
+
+Each turn's streamed text is checked against the final event's "response".
+
+Run from the app directory (needs uvicorn, google-generativeai and google-cloud-firestore
+from requirements.txt installed; no credentials are used):
+	python -m benchmarks.chat_stream
+"""
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+import google.generativeai as genai
+import httpx
+import uvicorn
+
+import db
+from benchmarks.chat_concurrency import FakeDocument
+
+FIRST_CHUNK_MS = 300
+CHUNK_INTERVAL_MS = 40
+CHUNKS = 25
+TURNS = 20
+
+ANSWER = (
+	"I'm sorry you're dealing with a headache again. Given your blood pressure readings this week, "
+	"it would be worth checking it now, drinking a glass of water and resting somewhere quiet. "
+	"If it gets worse or comes with blurred vision, please contact your doctor."
+)
+REPLY = json.dumps({"response": ANSWER, "symptoms": ["headache"]})
+
+
+class FakeChunk:
+	def __init__(self, text: str):
+		self.text = text
+
+
+class FakeStream:
+	def __init__(self, pieces):
+		self.pieces = pieces
+
+	async def __aiter__(self):
+		await asyncio.sleep(FIRST_CHUNK_MS / 1000)
+		for n, piece in enumerate(self.pieces):
+			if n:
+				await asyncio.sleep(CHUNK_INTERVAL_MS / 1000)
+			yield FakeChunk(piece)
+
+
+class FakeModel:
+	"""Stands in for genai.GenerativeModel, streaming REPLY in CHUNKS pieces."""
+
+	def __init__(self, *args, **kwargs):
+		pass
+
+	async def generate_content_async(self, prompt, stream=False, **kwargs):
+		size = -(-len(REPLY) // CHUNKS)
+		pieces = [REPLY[n:n + size] for n in range(0, len(REPLY), size)]
+		if stream:
+			return FakeStream(pieces)
+		await asyncio.sleep((FIRST_CHUNK_MS + CHUNK_INTERVAL_MS * (len(pieces) - 1)) / 1000)
+		return FakeChunk(REPLY)
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.execute("INSERT INTO Users (user_id, name, email, pass, age) VALUES (1, 'Bench User', 'bench@example.com', 'x', 52)")
+	conn.commit()
+	conn.close()
+
+
+async def time_turns(base_url: str) -> None:
+	payload = {"user_id": 1, "message": "I have a headache again"}
+	blocking, first_delta, complete = [], [], []
+	async with httpx.AsyncClient(base_url=base_url) as client:
+		for _ in range(TURNS):
+			start = time.perf_counter()
+			response = await client.post("/chat", json=payload)
+			response.raise_for_status()
+			blocking.append((time.perf_counter() - start) * 1000)
+
+			start = time.perf_counter()
+			streamed, final = "", None
+			async with client.stream("POST", "/chat/stream", json=payload) as response:
+				response.raise_for_status()
+				event = None
+				async for line in response.aiter_lines():
+					if line.startswith("event: "):
+						event = line[len("event: "):]
+					elif line.startswith("data: "):
+						data = json.loads(line[len("data: "):])
+						if event == "delta":
+							if not streamed:
+								first_delta.append((time.perf_counter() - start) * 1000)
+							streamed += data["text"]
+						elif event == "symptoms":
+							final = data
+			complete.append((time.perf_counter() - start) * 1000)
+			assert final is not None and streamed == final["response"] == ANSWER, (streamed, final)
+
+	print(f"{'/chat full response':<28} median_ms={statistics.median(blocking):>8.1f}")
+	print(f"{'/chat/stream first delta':<28} median_ms={statistics.median(first_delta):>8.1f}")
+	print(f"{'/chat/stream final event':<28} median_ms={statistics.median(complete):>8.1f}")
+	async with httpx.AsyncClient(base_url=base_url) as client:
+		stats = (await client.get("/health/chat")).json()["time_to_first_token"]
+	print(f"server-side time to first token: p50_ms={stats['p50_ms']:.1f} p95_ms={stats['p95_ms']:.1f}")
+
+
+def free_port() -> int:
+	with socket.socket() as sock:
+		sock.bind(("127.0.0.1", 0))
+		return sock.getsockname()[1]
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+
+		genai.GenerativeModel = FakeModel
+		from src.storage import firebase_handler
+		firebase_handler._async_db_client = FakeDocument(is_async=True)
+		from main import app
+
+		print(
+			f"model: first chunk after {FIRST_CHUNK_MS} ms, then {CHUNKS} chunks "
+			f"{CHUNK_INTERVAL_MS} ms apart (simulated), {TURNS} turns each"
+		)
+		port = free_port()
+		server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+		thread = threading.Thread(target=server.run, daemon=True)
+		thread.start()
+		while not server.started:
+			time.sleep(0.01)
+		try:
+			asyncio.run(time_turns(f"http://127.0.0.1:{port}"))
+		finally:
+			server.should_exit = True
+			thread.join()
+
+
+if __name__ == "__main__":
+	main()
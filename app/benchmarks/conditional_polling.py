@@ -0,0 +1,114 @@
+"""
+Polling the list endpoints with and without If-None-Match.
+
+A scratch database is seeded with USERS users, each with NOTIFICATIONS
+notifications and DAYS days of metrics. Each client polls its notification
+list, metric history and profile POLLS times, either unconditionally or sending
+back the ETag of its previous response, with nothing written in between (the
+common case for a poll). Requests go through the ASGI app in-process, so the
+times are server-side cost without network transfer; bytes are response bodies.
+
+The DB side is also timed directly: the list queries the endpoints run vs the
+UserTableVersions lookup that replaces them on a 304.
+
+Run from the app directory:
+	python -m benchmarks.conditional_polling
+"""
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiosqlite
+from fastapi.testclient import TestClient
+
+import db
+from repositories import notifications as notifications_repo
+from repositories.data_versions import get_user_table_version
+from repositories.records import fetch_records
+
+USERS = 10
+NOTIFICATIONS = 500
+DAYS = 365
+POLLS = 200
+
+ENDPOINTS = ("/notifications/{user_id}", "/metrics/{user_id}", "/users/{user_id}/profile")
+METRICS_QUERY = (
+	"SELECT metric_id, user_id, date, steps, heart_rate, sleep_hours, blood_pressure, mood, notes "
+	"FROM DailyMetrics WHERE user_id = ? ORDER BY date DESC"
+)
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	for user_id in range(1, USERS + 1):
+		conn.execute(
+			"INSERT INTO Users (user_id, name, email, pass) VALUES (?, ?, ?, 'x')",
+			(user_id, f"user {user_id}", f"user{user_id}@example.com"),
+		)
+		conn.executemany(
+			"INSERT INTO Notifications (user_id, title, message, is_read, created_at) VALUES (?, 'Reminder', 'Time for your evening walk and a glass of water', ?, datetime('2024-01-01', ?))",
+			((user_id, n % 2, f"+{n} hours") for n in range(NOTIFICATIONS)),
+		)
+		conn.executemany(
+			"INSERT INTO DailyMetrics (user_id, date, steps, heart_rate, sleep_hours, blood_pressure, mood) VALUES (?, date('2024-01-01', ?), 8000, 70, 7.5, '120/80', 'good')",
+			((user_id, f"+{day} days") for day in range(DAYS)),
+		)
+	conn.commit()
+	conn.close()
+
+
+def poll(client: TestClient, path: str, conditional: bool) -> None:
+	etags: Dict[int, Optional[str]] = {}
+	total_bytes = 0
+	start = time.perf_counter()
+	for n in range(POLLS):
+		user_id = n % USERS + 1
+		headers = {"If-None-Match": etags[user_id]} if conditional and etags.get(user_id) else {}
+		response = client.get(path.format(user_id=user_id), headers=headers)
+		assert response.status_code in (200, 304), response.status_code
+		etags[user_id] = response.headers.get("etag")
+		total_bytes += len(response.content)
+	elapsed_ms = (time.perf_counter() - start) * 1000 / POLLS
+	label = "If-None-Match" if conditional else "unconditional"
+	print(f"{path:<28} {label:<14} mean_ms={elapsed_ms:>7.2f} bytes_per_poll={total_bytes // POLLS:>7}")
+
+
+async def time_queries(path: Path) -> None:
+	async with aiosqlite.connect(path.as_posix()) as conn:
+		notifications_query, _ = notifications_repo.user_notifications_query(1, False, None)
+		reads = (
+			("notification list", lambda user_id: fetch_records(conn, notifications_query, (user_id,))),
+			("metric history", lambda user_id: fetch_records(conn, METRICS_QUERY, (user_id,))),
+			("version stamp", lambda user_id: get_user_table_version(conn, user_id, "Notifications")),
+		)
+		for label, read in reads:
+			await read(1)
+			start = time.perf_counter()
+			for n in range(POLLS):
+				await read(n % USERS + 1)
+			print(f"db {label:<25} mean_ms={(time.perf_counter() - start) * 1000 / POLLS:>7.3f}")
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+		from main import app
+
+		print(f"{USERS} users, {NOTIFICATIONS} notifications and {DAYS} days of metrics each, {POLLS} polls")
+		with TestClient(app) as client:
+			for path in ENDPOINTS:
+				poll(client, path, conditional=False)
+				poll(client, path, conditional=True)
+		asyncio.run(time_queries(db.DB_PATH))
+
+
+if __name__ == "__main__":
+	main()
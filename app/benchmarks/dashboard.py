@@ -0,0 +1,102 @@
+"""
+Dashboard page load, three client round trips vs GET /users/{user_id}/dashboard.
+
+The three-request path is what src/app/dashboard/page.tsx used to send:
+/users/{id}/profile, /metrics/{id}?limit=1 and /alerts/{id}/upcoming. The
+dashboard path is the single aggregated request, which also carries the
+unread count and the day's medication schedule. Requests go through the ASGI
+app in-process (no network), after a warm-up pass, against a scratch database
+with a year of metrics and schedule rows for each user.
+
+Run from the app directory:
+	python -m benchmarks.dashboard
+"""
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from fastapi.testclient import TestClient
+
+import db
+
+USERS = 20
+DAYS = 365
+REQUESTS = 300
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.execute("INSERT INTO Medications (name, dosage) VALUES ('bench medication', '10mg')")
+	for user_id in range(1, USERS + 1):
+		conn.execute(
+			"INSERT INTO Users (user_id, name, email, pass) VALUES (?, ?, ?, 'x')",
+			(user_id, f"user {user_id}", f"user{user_id}@example.com"),
+		)
+		conn.executemany(
+			"INSERT INTO DailyMetrics (user_id, date, steps, heart_rate, sleep_hours) VALUES (?, date('now', ?), 8000, 70, 7.5)",
+			[(user_id, f"-{day} days") for day in range(DAYS)],
+		)
+		cursor = conn.execute(
+			"INSERT INTO UserMedications (user_id, medication_id, frequency, start_date) VALUES (?, 1, 'daily', date('now', '-1 year'))",
+			(user_id,),
+		)
+		conn.executemany(
+			"INSERT INTO MedicationSchedule (user_med_id, date, time, status) VALUES (?, date('now', ?), '08:00', 'taken')",
+			[(cursor.lastrowid, f"-{day} days") for day in range(DAYS)],
+		)
+		conn.executemany(
+			"INSERT INTO Alerts (user_id, alert_type, title, message, alert_time) VALUES (?, 'medication', 'Take medication', 'bench', datetime('now', ?))",
+			[(user_id, f"{hours} hours") for hours in range(-24 * 30, 48, 6)],
+		)
+		conn.executemany(
+			"INSERT INTO Notifications (user_id, title, message) VALUES (?, 'title', 'message')",
+			[(user_id,)] * 200,
+		)
+	conn.commit()
+	conn.close()
+
+
+def measure(label: str, load: Callable[[int], None]) -> None:
+	for user_id in range(1, USERS + 1):
+		load(user_id)
+	samples: List[float] = []
+	for n in range(REQUESTS):
+		start = time.perf_counter()
+		load(n % USERS + 1)
+		samples.append((time.perf_counter() - start) * 1000)
+	samples.sort()
+	print(
+		f"{label:<16} p50_ms={statistics.median(samples):>7.2f} "
+		f"p95_ms={samples[int(len(samples) * 0.95)]:>7.2f}"
+	)
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+		from main import app
+
+		with TestClient(app) as client:
+			def three_requests(user_id: int) -> None:
+				client.get(f"/users/{user_id}/profile").raise_for_status()
+				client.get(f"/metrics/{user_id}", params={"limit": 1}).raise_for_status()
+				client.get(f"/alerts/{user_id}/upcoming", params={"hours_ahead": 24}).raise_for_status()
+
+			def dashboard(user_id: int) -> None:
+				client.get(f"/users/{user_id}/dashboard").raise_for_status()
+
+			print(f"{USERS} users, {DAYS} days of metrics and schedule each, {REQUESTS} page loads")
+			measure("3 requests", three_requests)
+			measure("dashboard", dashboard)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,117 @@
+"""
+Model calls and latency for the preview-then-save notification flow, with and without the
+notification cache (cache.NotificationCache).
+
+Each of USERS users previews a notification (GET /notifications/{user_id}/generate-preview)
+and then saves the same one (POST /notifications/{user_id}/personalized). Gemini is
+replaced by an in-process fake that takes MODEL_MS per call and counts the calls. The
+uncached run drops the cache between the two requests, as every request did before.
+After that, a new symptom for one user bumps their data version, so their next save has to
+call the model again.
+
+Run from the app directory (needs google-generativeai installed; no credentials are used):
+	python -m benchmarks.notification_cache
+"""
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+import google.generativeai as genai
+from fastapi.testclient import TestClient
+
+import db
+from cache import get_cache_stats, notification_cache
+
+MODEL_MS = 800
+USERS = 10
+REPLY = json.dumps({
+	"title": "Time for a walk?",
+	"message": "Your step count dipped this week. A 10 minute walk after lunch could help your energy.",
+	"notification_type": "wellness",
+})
+
+
+class FakeResponse:
+	def __init__(self, text: str):
+		self.text = text
+
+
+class FakeModel:
+	"""Stands in for genai.GenerativeModel: a fixed reply after MODEL_MS."""
+
+	calls = 0
+
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def generate_content(self, prompt, **kwargs):
+		FakeModel.calls += 1
+		time.sleep(MODEL_MS / 1000)
+		return FakeResponse(REPLY)
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.executemany(
+		"INSERT INTO Users (user_id, name, email, pass, age) VALUES (?, ?, ?, 'x', 40)",
+		((n, f"User {n}", f"user{n}@example.com") for n in range(1, USERS + 1)),
+	)
+	conn.commit()
+	conn.close()
+
+
+def preview_then_save(client: TestClient, cached: bool) -> None:
+	notification_cache.invalidate()
+	FakeModel.calls = 0
+	previews, saves = [], []
+	payload = {"notification_type": "wellness", "custom_context": "Step count dropped this week"}
+	for user_id in range(1, USERS + 1):
+		start = time.perf_counter()
+		client.get(f"/notifications/{user_id}/generate-preview", params=payload).raise_for_status()
+		previews.append((time.perf_counter() - start) * 1000)
+		if not cached:
+			notification_cache.invalidate()
+		start = time.perf_counter()
+		client.post(f"/notifications/{user_id}/personalized", json=payload).raise_for_status()
+		saves.append((time.perf_counter() - start) * 1000)
+	label = "cached" if cached else "uncached"
+	print(
+		f"{label:<9} model_calls={FakeModel.calls:>3} preview_median_ms={statistics.median(previews):>7.1f} "
+		f"save_median_ms={statistics.median(saves):>7.1f}"
+	)
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+
+		genai.GenerativeModel = FakeModel
+		from main import app
+
+		print(f"model: {MODEL_MS} ms per call (simulated), preview then save for {USERS} users")
+		with TestClient(app) as client:
+			preview_then_save(client, cached=False)
+			preview_then_save(client, cached=True)
+
+			payload = {"notification_type": "wellness", "custom_context": "Step count dropped this week"}
+			client.post("/symptoms/1", json={"symptom": "fatigue", "severity": "mild"}).raise_for_status()
+			calls = FakeModel.calls
+			client.post("/notifications/1/personalized", json=payload).raise_for_status()
+			print(f"save after a new symptom: model_calls={FakeModel.calls - calls}")
+
+			stats = get_cache_stats()["notifications"]
+		print(json.dumps({key: stats[key] for key in ("entries", "bytes", "hits", "misses", "stale", "generated", "model_calls_avoided")}, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,152 @@
+"""
+Latency of loading the AI prompt profile, multi-query path vs one snapshot query.
+
+The multi-query path is what get_comprehensive_user_data used to run: the Users
+row, then recent symptoms, disorders, medications and reports as four more
+statements, each a separate trip through the aiosqlite worker thread. The
+snapshot path is users_repo.get_user_profile_snapshot, which folds the four
+sections into JSON columns of a single statement.
+
+Both paths use one connection, and each round of runs visits every seeded
+user, so the pages are warm and the difference is per-statement overhead.
+
+Run from the app directory:
+	python -m benchmarks.profile_snapshot
+"""
+import asyncio
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict
+
+import aiosqlite
+
+import db
+from repositories import users as users_repo
+
+USERS = 200
+RUNS = 10
+
+MULTI_QUERY_STATEMENTS = (
+	"SELECT * FROM Users WHERE user_id = ?",
+	"""
+	SELECT symptom_id, user_id, symptom, severity, duration, notes, log_date
+	FROM Symptoms
+	WHERE user_id = ? AND log_date >= datetime('now', '-30 days')
+	ORDER BY log_date DESC
+	LIMIT 10
+	""",
+	"""
+	SELECT ud.user_disorder_id, ud.user_id, ud.disorder_id, ud.diagnosed_date, ud.resolved_date,
+		d.name as disorder_name, d.description
+	FROM UserDisorders ud
+	JOIN Disorders d ON ud.disorder_id = d.disorder_id
+	WHERE ud.user_id = ?
+	ORDER BY ud.diagnosed_date DESC
+	""",
+	"""
+	SELECT ms.schedule_id, ms.user_med_id, ms.date, ms.time, ms.status,
+		m.name as medication_name, m.dosage, m.description, um.frequency
+	FROM MedicationSchedule ms
+	JOIN UserMedications um ON ms.user_med_id = um.user_med_id
+	JOIN Medications m ON um.medication_id = m.medication_id
+	WHERE um.user_id = ? AND ms.date >= date('now', '-30 days')
+	ORDER BY ms.date DESC, ms.time DESC
+	LIMIT 5
+	""",
+	"""
+	SELECT report_id, user_id, report_date, report_type, content
+	FROM Reports
+	WHERE user_id = ? AND report_date >= date('now', '-30 days')
+	ORDER BY report_id DESC
+	LIMIT 3
+	""",
+)
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.executemany(
+		"INSERT INTO Disorders (name, description) VALUES (?, 'bench disorder')",
+		[(f"disorder {n}",) for n in range(20)],
+	)
+	conn.executemany(
+		"INSERT INTO Medications (name, dosage, description) VALUES (?, '10mg', 'bench medication')",
+		[(f"medication {n}",) for n in range(20)],
+	)
+	for user_id in range(1, USERS + 1):
+		conn.execute(
+			"INSERT INTO Users (user_id, name, email, pass) VALUES (?, ?, ?, 'x')",
+			(user_id, f"user {user_id}", f"user{user_id}@example.com"),
+		)
+		conn.executemany(
+			"INSERT INTO Symptoms (user_id, symptom, severity, duration, log_date) VALUES (?, ?, 'mild', '2 hours', datetime('now', ?))",
+			[(user_id, f"symptom {n % 7}", f"-{n} hours") for n in range(0, 24 * 60, 6)],
+		)
+		conn.executemany(
+			"INSERT INTO UserDisorders (user_id, disorder_id, diagnosed_date) VALUES (?, ?, date('now', '-1 year'))",
+			[(user_id, (user_id + n) % 20 + 1) for n in range(3)],
+		)
+		for n in range(4):
+			cursor = conn.execute(
+				"INSERT INTO UserMedications (user_id, medication_id, frequency, start_date) VALUES (?, ?, 'daily', date('now', '-60 days'))",
+				(user_id, (user_id + n) % 20 + 1),
+			)
+			conn.executemany(
+				"INSERT INTO MedicationSchedule (user_med_id, date, time, status) VALUES (?, date('now', ?), '08:00', 'taken')",
+				[(cursor.lastrowid, f"-{day} days") for day in range(60)],
+			)
+		conn.executemany(
+			"INSERT INTO Reports (user_id, report_date, report_type, content) VALUES (?, date('now', ?), 'daily', 'bench report')",
+			[(user_id, f"-{day} days") for day in range(60)],
+		)
+	conn.commit()
+	conn.close()
+
+
+async def multi_query(conn: aiosqlite.Connection, user_id: int) -> Any:
+	sections = []
+	for statement in MULTI_QUERY_STATEMENTS:
+		cursor = await conn.execute(statement, (user_id,))
+		sections.append([dict(row) for row in await cursor.fetchall()])
+	return sections
+
+
+async def snapshot(conn: aiosqlite.Connection, user_id: int) -> Any:
+	return await users_repo.get_user_profile_snapshot(conn, user_id)
+
+
+async def measure(
+	conn: aiosqlite.Connection,
+	label: str,
+	load: Callable[[aiosqlite.Connection, int], Awaitable[Any]],
+) -> Dict[str, float]:
+	for user_id in range(1, USERS + 1):
+		await load(conn, user_id)
+	start = time.perf_counter()
+	for _ in range(RUNS):
+		for user_id in range(1, USERS + 1):
+			await load(conn, user_id)
+	elapsed_ms = (time.perf_counter() - start) * 1000 / (RUNS * USERS)
+	print(f"{label:<12} mean_ms={elapsed_ms:>7.3f}")
+	return {"mean_ms": elapsed_ms}
+
+
+async def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		path = Path(tmp) / "bench.sqlite3"
+		seed(path)
+		conn = await aiosqlite.connect(path.as_posix())
+		conn.row_factory = aiosqlite.Row
+		print(f"{USERS} users, mean profile load over {RUNS} rounds")
+		multi = await measure(conn, "5 queries", multi_query)
+		single = await measure(conn, "snapshot", snapshot)
+		await conn.close()
+		print(f"speedup x{multi['mean_ms'] / single['mean_ms']:.2f}")
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Assembling the conversation prompt, rendered from scratch vs from the cached prefix.
+
+A scratch database is seeded with a user who has SYMPTOMS recent symptoms and a few
+medications and reports; Firestore is replaced by an in-process fake that returns a summary
+for each of the past 7 days and a short conversation for today, waiting FIRESTORE_LATENCY_MS
+per document read. Each cold run drops the cached segments first, so it renders the whole
+prompt and reads the summaries; warm runs reuse the prefix and read only today's history.
+The profile string itself comes from the profile cache in both cases.
+
+Run from the app directory (needs google-generativeai and google-cloud-firestore installed;
+no credentials are used):
+	python -m benchmarks.prompt_assembly
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+
+import db
+from cache import get_cache_stats, prompt_segment_cache
+
+SYMPTOMS = 30
+FIRESTORE_LATENCY_MS = 20
+RUNS = 50
+
+
+class FakeSnapshot:
+	exists = True
+
+	def __init__(self, date_str: str):
+		self.date_str = date_str
+
+	def to_dict(self):
+		return {
+			"summary": f"On {self.date_str} the user reported mild headaches and poor sleep, walked 30 minutes and felt tired.",
+			"conversation": [
+				{"sender": "user", "message": "I slept badly again"},
+				{"sender": "ai", "message": "Sorry to hear that. Did you have caffeine late in the day?"},
+			],
+		}
+
+
+class FakeAsyncFirestore:
+	"""Stands in for the async Firestore client; every document read waits FIRESTORE_LATENCY_MS."""
+
+	def __init__(self, date_str: str = ""):
+		self.date_str = date_str
+
+	def collection(self, name):
+		return self
+
+	def document(self, name):
+		return FakeAsyncFirestore(name)
+
+	async def get(self):
+		await asyncio.sleep(FIRESTORE_LATENCY_MS / 1000)
+		return FakeSnapshot(self.date_str)
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.execute(
+		"INSERT INTO Users (user_id, name, email, pass, age, gender, height_cm, weight_kg, medical_conditions, allergies) "
+		"VALUES (1, 'Bench User', 'bench@example.com', 'x', 52, 'female', 165, 70, 'hypertension, asthma', 'penicillin')"
+	)
+	conn.executemany(
+		"INSERT INTO Symptoms (user_id, symptom, severity, duration, log_date) VALUES (1, ?, 'mild', '2 hours', datetime('now', ?))",
+		((f"symptom {n}", f"-{n} days") for n in range(SYMPTOMS)),
+	)
+	conn.executemany("INSERT INTO Medications (name, dosage) VALUES (?, '10mg')", (("Lisinopril",), ("Albuterol",)))
+	conn.executemany(
+		"INSERT INTO UserMedications (user_id, medication_id, start_date, frequency) VALUES (1, ?, '2024-01-01', 'daily')",
+		((1,), (2,)),
+	)
+	conn.commit()
+	conn.close()
+
+
+async def measure(label: str, cold: bool) -> None:
+	from src.chatbot.prompt_builder import assemble_prompt_async
+
+	start = time.perf_counter()
+	for _ in range(RUNS):
+		if cold:
+			prompt_segment_cache.invalidate()
+		await assemble_prompt_async(1, "I have a headache again")
+	print(f"{label:<20} mean_ms={(time.perf_counter() - start) * 1000 / RUNS:>8.3f}")
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+
+		from src.storage import firebase_handler
+		firebase_handler._async_db_client = FakeAsyncFirestore()
+		from main import app
+
+		print(f"Firestore {FIRESTORE_LATENCY_MS} ms per document read (simulated), mean of {RUNS} prompts")
+		with TestClient(app) as client:
+			client.portal.call(measure, "rendered from scratch", True)
+			client.portal.call(measure, "cached prefix", False)
+		print(json.dumps(get_cache_stats()["prompt_segments"], indent=2))
+
+
+if __name__ == "__main__":
+	main()
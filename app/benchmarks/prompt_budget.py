@@ -0,0 +1,165 @@
+"""
+Conversation prompt size and assembly time for light and heavy users, with and without
+the token budget (src/chatbot/prompt_budget.py).
+
+Two synthetic users are seeded:
+- light: a handful of profile fields, no summaries and a two-message conversation today
+- heavy: every profile field filled (long conditions and stored summaries), 15 disorders,
+  the full symptom / medication / report windows, a long summary for each of the past
+  7 days and 10 long messages today
+
+Firestore is an in-process fake with no latency, and the prompt cache is dropped before
+every run, so the time is the whole assembly (SQLite profile read, formatting and
+trimming). The model is not called; its cost grows with the prompt's token count, which is
+the estimated column.
+
+Run from the app directory (needs google-generativeai and google-cloud-firestore installed;
+no credentials are used):
+	python -m benchmarks.prompt_budget
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+
+import db
+from cache import prompt_segment_cache
+
+LIGHT_USER, HEAVY_USER = 1, 2
+RUNS = 50
+LONG_TEXT = (
+	"Reports intermittent tension headaches in the afternoons, usually after long stretches at the "
+	"computer, eased by water and a short walk; sleep has been broken by a neighbour's building work. "
+)
+
+
+class FakeSnapshot:
+	def __init__(self, data):
+		self.data = data
+		self.exists = data is not None
+
+	def to_dict(self):
+		return self.data
+
+
+class FakeAsyncFirestore:
+	"""Stands in for the async Firestore client: users/{id}/dailyData/{date} documents from memory."""
+
+	def __init__(self, path=()):
+		self.path = path
+
+	def collection(self, name):
+		return self
+
+	def document(self, name):
+		return FakeAsyncFirestore(self.path + (name,))
+
+	async def get(self):
+		user_id, date_str = self.path
+		today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+		if user_id == str(LIGHT_USER):
+			data = {"conversation": [{"sender": "user", "message": "Slept well."}, {"sender": "ai", "message": "Great!"}]}
+			return FakeSnapshot(data if date_str == today else None)
+		if date_str == today:
+			conversation = [
+				{"sender": "user" if n % 2 == 0 else "ai", "message": LONG_TEXT * 3}
+				for n in range(10)
+			]
+			return FakeSnapshot({"conversation": conversation})
+		return FakeSnapshot({"summary": f"{date_str}: " + LONG_TEXT * 6})
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.execute(
+		"INSERT INTO Users (user_id, name, email, pass, age) VALUES (?, 'Light User', 'light@example.com', 'x', 30)",
+		(LIGHT_USER,),
+	)
+	conn.execute(
+		"""
+		INSERT INTO Users (
+			user_id, name, email, pass, age, gender, height_cm, weight_kg, bmi, blood_group, activity_level,
+			gym_member, smoker, alcohol, medications, ever_hospitalized, ever_concussion,
+			medical_conditions, allergies, avg_sleep_hours, avg_blood_pressure, avg_heart_rate,
+			avg_water_intake, steps_per_day, cholesterol_level, blood_sugar_level, emergency_contact,
+			yesterday_summary, last_month_summary, last_checkup
+		) VALUES (?, 'Heavy User', 'heavy@example.com', 'x', 58, 'male', 178, 96, 30.3, 'O+', 'low',
+			0, 1, 1, 1, 1, 0, ?, ?, 5.5, '145/95', 84, 1.2, 3000, 240, 130, 'Jane Doe +1 555 0100', ?, ?, '2024-01-10')
+		""",
+		(HEAVY_USER, LONG_TEXT * 4, LONG_TEXT * 2, LONG_TEXT * 8, LONG_TEXT * 16),
+	)
+	conn.executemany(
+		"INSERT INTO Symptoms (user_id, symptom, severity, duration, notes) VALUES (?, ?, 'moderate', '3 hours', ?)",
+		((HEAVY_USER, f"symptom {n}", LONG_TEXT) for n in range(20)),
+	)
+	conn.executemany("INSERT INTO Disorders (name, description) VALUES (?, ?)", ((f"Disorder {n}", LONG_TEXT) for n in range(15)))
+	conn.executemany(
+		"INSERT INTO UserDisorders (user_id, disorder_id, diagnosed_date) VALUES (?, ?, '2020-01-01')",
+		((HEAVY_USER, n) for n in range(1, 16)),
+	)
+	conn.executemany("INSERT INTO Medications (name, dosage) VALUES (?, '20mg')", ((f"Medication {n}",) for n in range(5)))
+	conn.executemany(
+		"INSERT INTO UserMedications (user_id, medication_id, start_date, frequency) VALUES (?, ?, '2024-01-01', 'twice daily')",
+		((HEAVY_USER, n) for n in range(1, 6)),
+	)
+	conn.executemany(
+		"INSERT INTO Reports (user_id, report_date, report_type, content) VALUES (?, date('now'), 'lab', ?)",
+		((HEAVY_USER, LONG_TEXT * 5) for _ in range(3)),
+	)
+	conn.commit()
+	conn.close()
+
+
+async def measure(label: str, user_id: int, budget: int) -> None:
+	from src.chatbot import prompt_builder
+
+	prompt_builder.CHAT_PROMPT_TOKEN_BUDGET = budget
+	timings = []
+	log = io.StringIO()
+	with contextlib.redirect_stdout(log):
+		for _ in range(RUNS):
+			prompt_segment_cache.invalidate()
+			start = time.perf_counter()
+			prompt = await prompt_builder.assemble_prompt_async(user_id, "My head hurts again, what should I do?")
+			timings.append((time.perf_counter() - start) * 1000)
+	print(
+		f"{label:<20} tokens~={prompt_builder.estimate_tokens(prompt):>6} bytes={len(prompt.encode('utf-8')):>7} "
+		f"median_ms={statistics.median(timings):>7.3f}"
+	)
+	trims = [line for line in log.getvalue().splitlines() if line.startswith("Trimmed")]
+	if trims:
+		print(f"    {trims[-1]}")
+
+
+def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		os.chdir(tmp)
+		db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+		seed(db.DB_PATH)
+
+		from src.storage import firebase_handler
+		firebase_handler._async_db_client = FakeAsyncFirestore()
+		from main import app
+		from src.chatbot import prompt_builder
+
+		budget = prompt_builder.CHAT_PROMPT_TOKEN_BUDGET
+		print(f"budget {budget} tokens, median of {RUNS} cold assemblies")
+		with TestClient(app) as client:
+			for label, user_id in (("light", LIGHT_USER), ("heavy", HEAVY_USER)):
+				client.portal.call(measure, f"{label}, no budget", user_id, 10 ** 9)
+				client.portal.call(measure, f"{label}, budget", user_id, budget)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,104 @@
+"""
+Read throughput of the read-only pool at different sizes while writes keep landing.
+
+A scratch WAL database is seeded with notifications for a few users. For every
+pool size, READERS concurrent tasks poll like the notification center (latest
+page plus unread count) for DURATION seconds while a background task keeps
+inserting notifications through the single writer. Reads scale with the pool
+only as far as there are cores for the connection threads to run on.
+
+Run from the app directory:
+	python -m benchmarks.read_pool_scaling
+"""
+import asyncio
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import db
+from repositories import notifications as notifications_repo
+
+USERS = 20
+NOTIFICATIONS_PER_USER = 5_000
+POOL_SIZES = (1, 2, 4, 8)
+READERS = 32
+DURATION = 3.0
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	conn.execute("PRAGMA journal_mode = WAL;")
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.executemany(
+		"INSERT INTO Users (name, email, pass) VALUES (?, ?, 'x')",
+		[(f"user{i}", f"user{i}@example.com") for i in range(USERS)],
+	)
+	conn.executemany(
+		"INSERT INTO Notifications (user_id, title, message, notification_type) VALUES (?, ?, ?, 'general')",
+		[
+			(user_id, f"title {n}", "message body " * 8)
+			for user_id in range(1, USERS + 1)
+			for n in range(NOTIFICATIONS_PER_USER)
+		],
+	)
+	conn.commit()
+	conn.close()
+
+
+async def write_load(writer: db.WriteQueue, stop: asyncio.Event) -> int:
+	writes = 0
+	while not stop.is_set():
+		await writer.submit(
+			notifications_repo.create_notification,
+			user_id=random.randint(1, USERS),
+			title="background",
+			message="write load",
+		)
+		writes += 1
+	return writes
+
+
+async def reader(pool: db.ConnectionPool, deadline: float) -> int:
+	reads = 0
+	while time.monotonic() < deadline:
+		async with pool.connection() as conn:
+			user_id = random.randint(1, USERS)
+			await notifications_repo.get_user_notifications(conn, user_id=user_id, limit=50)
+			await notifications_repo.get_unread_notification_count(conn, user_id=user_id)
+		reads += 1
+	return reads
+
+
+async def run_for_pool_size(path: Path, size: int) -> None:
+	pool = db.ConnectionPool(path.as_posix(), max_size=size, min_size=size, readonly=True)
+	writer = db.WriteQueue(path.as_posix())
+	await pool.open()
+	await writer.start()
+	stop = asyncio.Event()
+	writes_task = asyncio.create_task(write_load(writer, stop))
+	deadline = time.monotonic() + DURATION
+	reads = sum(await asyncio.gather(*(reader(pool, deadline) for _ in range(READERS))))
+	stop.set()
+	writes = await writes_task
+	await writer.stop()
+	await pool.close()
+	print(
+		f"pool_size={size:<2} polls/s={reads / DURATION:>9.1f} "
+		f"writes/s={writes / DURATION:>8.1f} avg_wait_ms={pool.stats()['avg_wait_ms']:.2f}"
+	)
+
+
+async def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		path = Path(tmp) / "bench.sqlite3"
+		seed(path)
+		print(f"{USERS} users x {NOTIFICATIONS_PER_USER} notifications, {READERS} concurrent readers, {DURATION}s per run")
+		for size in POOL_SIZES:
+			await run_for_pool_size(path, size)
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Cost of turning a 10k-row result into a response body, dict path vs record path.
+
+The dict path is what a response_model list endpoint used to do: aiosqlite.Row
+per row, dict(row) in the repository, then FastAPI validates the list against
+List[SymptomOut], dumps it back to JSON-ready Python and renders it with
+JSONResponse. The record path is repositories.records: plain tuples sharing one
+column-name tuple, encoded straight to JSON text.
+
+For each path this reports the mean latency, the memory blocks still allocated
+once the rows are materialized (before serialization), and the peak traced
+memory of the whole path.
+
+Run from the app directory:
+	python -m benchmarks.row_materialization
+"""
+import asyncio
+import gc
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List
+
+import aiosqlite
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+import db
+from main import SymptomOut
+from repositories import symptoms as symptoms_repo
+from repositories.records import fetch_records
+
+ROWS = 10_000
+RUNS = 20
+
+symptom_list = TypeAdapter(List[SymptomOut])
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.execute("INSERT INTO Users (name, email, pass) VALUES ('bench', 'bench@example.com', 'x')")
+	conn.executemany(
+		"INSERT INTO Symptoms (user_id, symptom, severity, duration, notes, log_date) VALUES (1, ?, 'mild', '2 hours', ?, ?)",
+		[
+			(f"symptom {n % 50}", None if n % 3 else "noticed after lunch", f"2024-01-01 {n % 24:02d}:00:{n % 60:02d}")
+			for n in range(ROWS)
+		],
+	)
+	conn.commit()
+	conn.close()
+
+
+async def dict_rows(conn: aiosqlite.Connection) -> Any:
+	return await symptoms_repo.get_user_symptoms(conn, user_id=1)
+
+
+def dict_body(rows: Any) -> bytes:
+	return JSONResponse(symptom_list.dump_python(symptom_list.validate_python(rows), mode="json")).body
+
+
+async def record_rows(conn: aiosqlite.Connection) -> Any:
+	query, params = symptoms_repo.user_symptoms_query(1)
+	return await fetch_records(conn, query, params)
+
+
+def record_body(records: Any) -> bytes:
+	return records.to_json()
+
+
+async def old_dict_rows(conn: aiosqlite.Connection) -> Any:
+	# The repositories before the record layer: one aiosqlite.Row per row, copied into a dict
+	query, params = symptoms_repo.user_symptoms_query(1)
+	cursor = await conn.execute(query, params)
+	return [dict(row) for row in await cursor.fetchall()]
+
+
+async def measure(
+	conn: aiosqlite.Connection,
+	label: str,
+	materialize: Callable[[aiosqlite.Connection], Awaitable[Any]],
+	serialize: Callable[[Any], bytes],
+) -> bytes:
+	body = serialize(await materialize(conn))
+	start = time.perf_counter()
+	for _ in range(RUNS):
+		serialize(await materialize(conn))
+	elapsed_ms = (time.perf_counter() - start) * 1000 / RUNS
+
+	gc.collect()
+	tracemalloc.start()
+	rows = await materialize(conn)
+	live_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+	serialize(rows)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del rows
+
+	print(f"{label:<20} mean_ms={elapsed_ms:>7.1f} live_blocks={live_blocks:>7} peak_kib={peak / 1024:>8.0f}")
+	return body
+
+
+async def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		path = Path(tmp) / "bench.sqlite3"
+		seed(path)
+		conn = await aiosqlite.connect(path.as_posix())
+		conn.row_factory = aiosqlite.Row
+		print(f"{ROWS} symptom rows, mean of {RUNS} runs")
+		old = await measure(conn, "Row + dict + model", old_dict_rows, dict_body)
+		await measure(conn, "tuple dict + model", dict_rows, dict_body)
+		new = await measure(conn, "records -> json", record_rows, record_body)
+		await conn.close()
+		assert old == new, "record path must render the same bytes as the dict path"
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
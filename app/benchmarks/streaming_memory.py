@@ -0,0 +1,95 @@
+"""
+Peak memory and time to first byte of a large list response, buffered vs streamed.
+
+A scratch database is seeded with ROWS symptom logs for a single user. The
+buffered path is what the list endpoints do by default: fetchall, one dict per
+row, jsonable_encoder and a single json.dumps of the whole body. The streamed
+path is streaming.iter_rows_encoded, which keeps one chunk of rows in memory and
+hands each encoded chunk to the client as soon as it is ready. Memory is
+measured with tracemalloc, so only Python allocations are counted.
+
+Run from the app directory (the row count defaults to 1,000,000):
+	python -m benchmarks.streaming_memory [rows]
+"""
+import asyncio
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable, Tuple
+
+import aiosqlite
+from fastapi.encoders import jsonable_encoder
+
+import db
+from repositories import symptoms as symptoms_repo
+from streaming import STREAM_CHUNK_SIZE, iter_rows_encoded
+
+ROWS = 1_000_000
+
+
+def seed(path: Path, rows: int) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	conn.execute("INSERT INTO Users (name, email, pass) VALUES ('bench', 'bench@example.com', 'x')")
+	conn.executemany(
+		"INSERT INTO Symptoms (user_id, symptom, severity, duration, notes, log_date) VALUES (1, ?, 'mild', '2 hours', ?, ?)",
+		(
+			(f"symptom {n % 50}", "noticed after lunch, eased by evening", f"2020-01-01 {n % 24:02d}:00:{n % 60:02d}")
+			for n in range(rows)
+		),
+	)
+	conn.commit()
+	conn.close()
+
+
+async def buffered(conn: aiosqlite.Connection) -> Tuple[int, float]:
+	query, params = symptoms_repo.user_symptoms_query(1)
+	cursor = await conn.execute(query, params)
+	rows = [dict(row) for row in await cursor.fetchall()]
+	body = json.dumps(jsonable_encoder(rows)).encode("utf-8")
+	return len(body), time.perf_counter()
+
+
+async def streamed(conn: aiosqlite.Connection) -> Tuple[int, float]:
+	query, params = symptoms_repo.user_symptoms_query(1)
+	size = 0
+	first_byte = None
+	async for chunk in iter_rows_encoded(conn, query, params):
+		if first_byte is None:
+			first_byte = time.perf_counter()
+		size += len(chunk)
+	return size, first_byte
+
+
+async def measure(path: Path, label: str, fn: Callable[[aiosqlite.Connection], Awaitable[Tuple[int, float]]]) -> None:
+	conn = await aiosqlite.connect(path.as_posix())
+	conn.row_factory = aiosqlite.Row
+	tracemalloc.start()
+	start = time.perf_counter()
+	size, first_byte = await fn(conn)
+	elapsed = time.perf_counter() - start
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	await conn.close()
+	print(
+		f"{label:<9} peak_mb={peak / 2**20:>8.1f} first_byte_ms={(first_byte - start) * 1000:>9.1f} "
+		f"total_s={elapsed:>6.2f} body_mb={size / 2**20:.1f}"
+	)
+
+
+async def main(rows: int) -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		path = Path(tmp) / "bench.sqlite3"
+		seed(path, rows)
+		print(f"{rows} symptom rows for one user, stream chunk size {STREAM_CHUNK_SIZE}")
+		await measure(path, "buffered", buffered)
+		await measure(path, "streamed", streamed)
+
+
+if __name__ == "__main__":
+	asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
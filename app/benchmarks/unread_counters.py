@@ -0,0 +1,115 @@
+"""
+Cost of the polled unread-count endpoint, COUNT(*) vs the trigger-maintained counter.
+
+A scratch database is seeded with USERS users that each have NOTIFICATIONS
+notifications, half of them unread. The COUNT(*) path is the query
+get_unread_notification_count used to run (served by the covering
+idx_notifications_user_read_created index, so it walks every unread entry);
+the counter path is the UserCounters primary-key lookup it runs now.
+
+The counters move the work to the write side, so this also times inserting a
+batch of notifications and marking them all read, with and without the
+counter triggers.
+
+Run from the app directory:
+	python -m benchmarks.unread_counters
+"""
+import asyncio
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import aiosqlite
+
+import db
+from repositories import notifications as notifications_repo
+
+USERS = 3
+NOTIFICATIONS = 100_000
+RUNS = 200
+WRITE_BATCH = 10_000
+
+COUNT_QUERY = "SELECT COUNT(*) FROM Notifications WHERE user_id = ? AND is_read = FALSE"
+COUNTER_TRIGGERS = (
+	"trg_notifications_insert_counter",
+	"trg_notifications_update_counter",
+	"trg_notifications_delete_counter",
+)
+
+
+def seed(path: Path) -> None:
+	conn = sqlite3.connect(path)
+	for _, _, sql in db.load_migrations():
+		conn.executescript(sql)
+	for user_id in range(1, USERS + 1):
+		conn.execute(
+			"INSERT INTO Users (user_id, name, email, pass) VALUES (?, ?, ?, 'x')",
+			(user_id, f"user {user_id}", f"user{user_id}@example.com"),
+		)
+		conn.executemany(
+			"INSERT INTO Notifications (user_id, title, message, is_read, created_at) VALUES (?, 'title', 'message', ?, datetime('2024-01-01', ?))",
+			((user_id, n % 2, f"+{n} minutes") for n in range(NOTIFICATIONS)),
+		)
+	conn.commit()
+	conn.close()
+
+
+async def count_scan(conn: aiosqlite.Connection, user_id: int) -> int:
+	cursor = await conn.execute(COUNT_QUERY, (user_id,))
+	return (await cursor.fetchone())[0]
+
+
+async def counter_lookup(conn: aiosqlite.Connection, user_id: int) -> int:
+	return await notifications_repo.get_unread_notification_count(conn, user_id)
+
+
+async def measure_read(conn: aiosqlite.Connection, label: str, fn: Callable[[aiosqlite.Connection, int], Awaitable[int]]) -> int:
+	result = await fn(conn, 1)
+	start = time.perf_counter()
+	for n in range(RUNS):
+		await fn(conn, n % USERS + 1)
+	elapsed_ms = (time.perf_counter() - start) * 1000 / RUNS
+	print(f"{label:<16} mean_ms={elapsed_ms:>8.3f} unread={result}")
+	return result
+
+
+def measure_writes(path: Path, label: str, drop_counter_triggers: bool) -> None:
+	conn = sqlite3.connect(path)
+	conn.execute("BEGIN")
+	if drop_counter_triggers:
+		for name in COUNTER_TRIGGERS:
+			conn.execute(f"DROP TRIGGER {name}")
+	start = time.perf_counter()
+	conn.executemany(
+		"INSERT INTO Notifications (user_id, title, message) VALUES (1, 'title', 'message')",
+		((),) * WRITE_BATCH,
+	)
+	inserted = time.perf_counter()
+	conn.execute("UPDATE Notifications SET is_read = TRUE WHERE user_id = 1 AND is_read = FALSE")
+	marked = time.perf_counter()
+	conn.rollback()
+	conn.close()
+	print(
+		f"{label:<16} insert_{WRITE_BATCH}_ms={(inserted - start) * 1000:>8.1f} "
+		f"mark_all_read_ms={(marked - inserted) * 1000:>8.1f}"
+	)
+
+
+async def main() -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		path = Path(tmp) / "bench.sqlite3"
+		seed(path)
+		conn = await aiosqlite.connect(path.as_posix())
+		print(f"{USERS} users x {NOTIFICATIONS} notifications (half unread), mean of {RUNS} reads")
+		scanned = await measure_read(conn, "COUNT(*)", count_scan)
+		counted = await measure_read(conn, "UserCounters", counter_lookup)
+		await conn.close()
+		assert scanned == counted, "counter must match the COUNT(*)"
+		measure_writes(path, "no counters", drop_counter_triggers=True)
+		measure_writes(path, "with counters", drop_counter_triggers=False)
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
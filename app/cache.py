@@ -0,0 +1,353 @@
+import bisect
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "1000"))
+PROFILE_CACHE_MAX_BYTES = int(os.getenv("PROFILE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+# Upper bound on an entry's age, so time windows ("last 30 days") roll forward without writes
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "3600"))
+# How long a catalog copy is served before its version stamp is checked again, which is
+# how long another process's catalog write can take to show up here
+CATALOG_CACHE_REVALIDATE_SECONDS = float(os.getenv("CATALOG_CACHE_REVALIDATE_SECONDS", "5"))
+PROMPT_CACHE_MAX_ENTRIES = int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", "1000"))
+PROMPT_CACHE_MAX_BYTES = int(os.getenv("PROMPT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Upper bound on a cached prompt segment's age, so a summary saved by another process for a
+# day already in the window (not just today's) still shows up
+PROMPT_CACHE_TTL = float(os.getenv("PROMPT_CACHE_TTL", "3600"))
+NOTIFICATION_CACHE_MAX_ENTRIES = int(os.getenv("NOTIFICATION_CACHE_MAX_ENTRIES", "1000"))
+NOTIFICATION_CACHE_MAX_BYTES = int(os.getenv("NOTIFICATION_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+# How long a generated notification is reused while the user's data stays unchanged
+NOTIFICATION_CACHE_TTL = float(os.getenv("NOTIFICATION_CACHE_TTL", "900"))
+
+
+class VersionedLRUCache:
+	"""
+	LRU cache whose entries are only valid for the data version they were built from.
+
+	get() misses when the caller's current version differs from the stored one, so
+	invalidation is just a version bump at write time. Bounded by entry count and by
+	the approximate size of the cached values; thread-safe for the Flask workers.
+	"""
+
+	def __init__(self, max_entries: int, max_bytes: int, ttl: Optional[float] = None):
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.ttl = ttl
+		self._entries: "OrderedDict[Hashable, Tuple[Hashable, Any, int, float]]" = OrderedDict()
+		self._bytes = 0
+		self._lock = threading.Lock()
+		self._hits = 0
+		self._misses = 0
+		self._stale = 0
+		self._evictions = 0
+
+	def get(self, key: Hashable, version: Hashable) -> Optional[Any]:
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				self._misses += 1
+				return None
+			stored_version, value, size, stored_at = entry
+			if stored_version != version or (self.ttl is not None and time.monotonic() - stored_at > self.ttl):
+				self._drop(key)
+				self._misses += 1
+				self._stale += 1
+				return None
+			self._entries.move_to_end(key)
+			self._hits += 1
+			return value
+
+	def put(self, key: Hashable, version: Hashable, value: Any, size: Optional[int] = None) -> None:
+		"""`size` overrides sys.getsizeof(value), e.g. for a tuple whose bulk is one string in it."""
+		size = sys.getsizeof(value) if size is None else size
+		with self._lock:
+			if key in self._entries:
+				self._drop(key)
+			if size > self.max_bytes:
+				return
+			self._entries[key] = (version, value, size, time.monotonic())
+			self._bytes += size
+			while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+				oldest = next(iter(self._entries))
+				self._drop(oldest)
+				self._evictions += 1
+
+	def invalidate(self, key: Optional[Hashable] = None) -> None:
+		with self._lock:
+			if key is None:
+				self._entries.clear()
+				self._bytes = 0
+			elif key in self._entries:
+				self._drop(key)
+
+	def _drop(self, key: Hashable) -> None:
+		_, _, size, _ = self._entries.pop(key)
+		self._bytes -= size
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			lookups = self._hits + self._misses
+			return {
+				"entries": len(self._entries),
+				"bytes": self._bytes,
+				"max_entries": self.max_entries,
+				"max_bytes": self.max_bytes,
+				"ttl_seconds": self.ttl,
+				"hits": self._hits,
+				"misses": self._misses,
+				"stale": self._stale,
+				"evictions": self._evictions,
+				"hit_rate": self._hits / lookups if lookups else 0.0,
+			}
+
+
+class CatalogCache:
+	"""
+	In-process copy of a small reference table (Disorders, Medications), sorted by name,
+	with the JSON list pre-encoded and a case-insensitive sorted name index for prefix search.
+
+	The copy is tagged with the table's version stamp. Writes made through this process are
+	applied in place (write-through); any other change, including writes from other
+	processes, shows up as a version the copy was not built from and the caller reloads it.
+	"""
+
+	def __init__(self, id_column: str, revalidate_seconds: float):
+		self.id_column = id_column
+		self.revalidate_seconds = revalidate_seconds
+		self.version: Optional[int] = None
+		self._rows: List[Dict[str, Any]] = []
+		self._by_id: Dict[int, Dict[str, Any]] = {}
+		self._index: List[Tuple[str, int]] = []
+		self._json: Optional[bytes] = None
+		self._checked_at = 0.0
+		self._lock = threading.Lock()
+		self._hits = 0
+		self._reloads = 0
+		self._revalidations = 0
+		self._write_throughs = 0
+
+	def is_fresh(self) -> bool:
+		"""Loaded, and its version was confirmed within the last revalidate_seconds."""
+		return self.version is not None and time.monotonic() - self._checked_at < self.revalidate_seconds
+
+	def confirm(self) -> None:
+		"""Record that the stored version is still the table's current one."""
+		with self._lock:
+			self._checked_at = time.monotonic()
+			self._revalidations += 1
+
+	def replace(self, version: int, rows: List[Dict[str, Any]]) -> None:
+		with self._lock:
+			self._build(rows)
+			self.version = version
+			self._checked_at = time.monotonic()
+			self._reloads += 1
+
+	def apply_write(self, version: int, row: Dict[str, Any]) -> None:
+		"""
+		Write-through of a row this process just inserted or updated, committed as `version`.
+		Applied only when the copy is exactly one version behind; otherwise another write got
+		in between and the copy is marked stale so the next read reloads it.
+		"""
+		with self._lock:
+			if self.version is None or version != self.version + 1:
+				self._checked_at = 0.0
+				return
+			rows = [entry for entry in self._rows if entry[self.id_column] != row[self.id_column]]
+			rows.append(dict(row))
+			self._build(rows)
+			self.version = version
+			self._write_throughs += 1
+
+	def _build(self, rows: List[Dict[str, Any]]) -> None:
+		self._rows = sorted(rows, key=lambda row: (row["name"], row[self.id_column]))
+		self._by_id = {row[self.id_column]: row for row in self._rows}
+		self._index = sorted((row["name"].casefold(), position) for position, row in enumerate(self._rows))
+		self._json = None
+
+	def rows(self) -> List[Dict[str, Any]]:
+		with self._lock:
+			self._hits += 1
+			return self._rows
+
+	def to_json(self) -> bytes:
+		"""The rows as the JSON array the list endpoint returns, encoded once per version."""
+		with self._lock:
+			self._hits += 1
+			if self._json is None:
+				self._json = json.dumps(self._rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+			return self._json
+
+	def get(self, row_id: int) -> Optional[Dict[str, Any]]:
+		with self._lock:
+			self._hits += 1
+			return self._by_id.get(row_id)
+
+	def search(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+		"""Up to `limit` rows whose name starts with `prefix`, both ignoring case, in that same order."""
+		key = prefix.casefold()
+		with self._lock:
+			self._hits += 1
+			matches = []
+			start = bisect.bisect_left(self._index, (key, -1))
+			for name, position in self._index[start:]:
+				if not name.startswith(key) or len(matches) >= limit:
+					break
+				matches.append(position)
+			return [self._rows[position] for position in matches]
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			return {
+				"rows": len(self._rows),
+				"version": self.version,
+				"revalidate_seconds": self.revalidate_seconds,
+				"hits": self._hits,
+				"reloads": self._reloads,
+				"revalidations": self._revalidations,
+				"write_throughs": self._write_throughs,
+			}
+
+
+class PromptSegmentCache:
+	"""
+	Rendered segments of the AI conversation prompt, per user.
+
+	Each cached segment is a VersionedLRUCache entry tagged with the versions of the data it
+	was rendered from, so it is reused until that data changes. record_prompt() takes the
+	byte size of every segment of each assembled prompt, cached or not, so the stats show
+	how large each part of the prompt is and how much of it was served from cache.
+	"""
+
+	def __init__(self, cached_segments: Tuple[str, ...], max_entries: int, max_bytes: int, ttl: Optional[float] = None):
+		self._caches = {segment: VersionedLRUCache(max_entries, max_bytes, ttl) for segment in cached_segments}
+		self._lock = threading.Lock()
+		self._prompts = 0
+		self._prompt_bytes = 0
+		self._reused_bytes = 0
+		self._segment_bytes: Dict[str, int] = {}
+		self._last_segment_bytes: Dict[str, int] = {}
+
+	def get(self, segment: str, user_id: int, version: Hashable) -> Optional[Any]:
+		return self._caches[segment].get(user_id, version)
+
+	def put(self, segment: str, user_id: int, version: Hashable, value: Any, size: Optional[int] = None) -> None:
+		self._caches[segment].put(user_id, version, value, size)
+
+	def invalidate(self, user_id: Optional[int] = None) -> None:
+		for cache in self._caches.values():
+			cache.invalidate(user_id)
+
+	def record_prompt(self, segment_bytes: Dict[str, int], reused_bytes: int) -> None:
+		"""Account one assembled prompt: the size of each segment and how many bytes came from cache."""
+		with self._lock:
+			self._prompts += 1
+			self._prompt_bytes += sum(segment_bytes.values())
+			self._reused_bytes += reused_bytes
+			for segment, size in segment_bytes.items():
+				self._segment_bytes[segment] = self._segment_bytes.get(segment, 0) + size
+			self._last_segment_bytes = dict(segment_bytes)
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			prompts = self._prompts
+			segments = {
+				segment: {
+					"avg_bytes": total / prompts if prompts else 0.0,
+					"last_bytes": self._last_segment_bytes.get(segment, 0),
+				}
+				for segment, total in self._segment_bytes.items()
+			}
+			summary = {
+				"prompts": prompts,
+				"avg_prompt_bytes": self._prompt_bytes / prompts if prompts else 0.0,
+				"reused_bytes_ratio": self._reused_bytes / self._prompt_bytes if self._prompt_bytes else 0.0,
+				"segments": segments,
+			}
+		summary["caches"] = {segment: cache.stats() for segment, cache in self._caches.items()}
+		return summary
+
+
+class NotificationCache:
+	"""
+	AI-generated notifications, keyed by user, notification type and custom context.
+
+	Entries are tagged with the user data version the prompt was built from and expire after
+	`ttl` seconds, so a preview followed by a save of the same notification (or a repeat
+	request while the user's data is unchanged) reuses one model reply. Every hit is a model
+	call avoided.
+	"""
+
+	def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+		self._cache = VersionedLRUCache(max_entries, max_bytes, ttl)
+		self._lock = threading.Lock()
+		self._stored = 0
+
+	@staticmethod
+	def _key(user_id: int, notification_type: str, custom_context: Optional[str]) -> Tuple[int, str, str]:
+		# No context and an empty one build the same prompt
+		context_hash = hashlib.sha256((custom_context or "").encode("utf-8")).hexdigest()
+		return user_id, notification_type, context_hash
+
+	def get(
+		self, user_id: int, notification_type: str, custom_context: Optional[str], version: Hashable
+	) -> Optional[Dict[str, Any]]:
+		notification = self._cache.get(self._key(user_id, notification_type, custom_context), version)
+		return dict(notification) if notification is not None else None
+
+	def put(
+		self,
+		user_id: int,
+		notification_type: str,
+		custom_context: Optional[str],
+		version: Hashable,
+		notification: Dict[str, Any],
+	) -> None:
+		notification = dict(notification)
+		size = sys.getsizeof(notification) + sum(sys.getsizeof(value) for value in notification.values())
+		self._cache.put(self._key(user_id, notification_type, custom_context), version, notification, size)
+		with self._lock:
+			self._stored += 1
+
+	def invalidate(self) -> None:
+		self._cache.invalidate()
+
+	def stats(self) -> Dict[str, Any]:
+		stats = self._cache.stats()
+		with self._lock:
+			stats["generated"] = self._stored
+		stats["model_calls_avoided"] = stats["hits"]
+		return stats
+
+
+# Rendered get_comprehensive_user_data strings, keyed by user_id and UserDataVersions
+profile_cache = VersionedLRUCache(PROFILE_CACHE_MAX_ENTRIES, PROFILE_CACHE_MAX_BYTES, PROFILE_CACHE_TTL)
+
+# The Disorders / Medications catalogs, tagged with their UserTableVersions stamps (user_id 0)
+disorder_catalog = CatalogCache("disorder_id", CATALOG_CACHE_REVALIDATE_SECONDS)
+medication_catalog = CatalogCache("medication_id", CATALOG_CACHE_REVALIDATE_SECONDS)
+
+# The conversation prompt's static prefix and past-summaries block (src/chatbot/prompt_builder.py)
+prompt_segment_cache = PromptSegmentCache(
+	("prefix", "summaries"), PROMPT_CACHE_MAX_ENTRIES, PROMPT_CACHE_MAX_BYTES, PROMPT_CACHE_TTL
+)
+
+# Generated personalized notifications (src/chatbot/personalized_notification_generator.py)
+notification_cache = NotificationCache(NOTIFICATION_CACHE_MAX_ENTRIES, NOTIFICATION_CACHE_MAX_BYTES, NOTIFICATION_CACHE_TTL)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+	return {
+		"profile": profile_cache.stats(),
+		"disorder_catalog": disorder_catalog.stats(),
+		"medication_catalog": medication_catalog.stats(),
+		"prompt_segments": prompt_segment_cache.stats(),
+		"notifications": notification_cache.stats(),
+	}
@@ -0,0 +1,98 @@
+"""
+Conditional GETs (ETag / If-None-Match) for per-user reads.
+
+A response's ETag combines the UserTableVersions stamp of the table it reads
+with the request path, query string and response format, so it changes whenever
+the user's rows in that table do and differs between endpoints and parameter sets
+that read the same table. When the client already holds the current tag the
+endpoint answers 304 with no body, and the read query never runs.
+
+The stamp is read before the data: a write landing in between can only make the
+body newer than its tag (one redundant download on the next poll), never older.
+"""
+import hashlib
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from db import acquire_connection, READ
+from repositories.data_versions import get_user_table_version
+from repositories.records import fetch_records, RowConverters
+from streaming import JSON_MEDIA_TYPE, RowStreamResponse, wants_ndjson, wants_stream
+
+
+# Clients may keep the body but must revalidate it before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(request: Request, user_id: int, table: str, version: int) -> str:
+	variant = f"{request.url.path}?{request.url.query}|{wants_ndjson(request)}"
+	digest = hashlib.blake2b(variant.encode("utf-8"), digest_size=8).hexdigest()
+	return f'"{table}.{user_id}.{version}.{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+	"""If-None-Match uses the weak comparison, so W/"x" matches "x"."""
+	header = request.headers.get("if-none-match")
+	if not header:
+		return False
+	for tag in header.split(","):
+		tag = tag.strip()
+		if tag.startswith("W/"):
+			tag = tag[2:]
+		if tag == etag or tag == "*":
+			return True
+	return False
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+	return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+	return Response(status_code=304, headers=etag_headers(etag))
+
+
+async def current_etag(request: Request, user_id: int, table: str) -> str:
+	async with acquire_connection(READ) as conn:
+		version = await get_user_table_version(conn, user_id, table)
+	return make_etag(request, user_id, table, version)
+
+
+async def conditional_records_response(
+	request: Request,
+	user_id: int,
+	table: str,
+	query: str,
+	params: Sequence[Any] = (),
+	converters: Optional[RowConverters] = None,
+) -> Response:
+	"""records_response with an ETag from `table`'s stamp for `user_id`, or a 304."""
+	async with acquire_connection(READ) as conn:
+		version = await get_user_table_version(conn, user_id, table)
+		etag = make_etag(request, user_id, table, version)
+		if etag_matches(request, etag):
+			return not_modified(etag)
+		records = await fetch_records(conn, query, params)
+	return Response(records.to_json(converters), media_type=JSON_MEDIA_TYPE, headers=etag_headers(etag))
+
+
+async def conditional_rows_response(
+	request: Request,
+	user_id: int,
+	table: str,
+	query: str,
+	params: Sequence[Any],
+	stream: bool = False,
+	converters: Optional[RowConverters] = None,
+) -> Response:
+	"""rows_response with an ETag from `table`'s stamp for `user_id`, or a 304."""
+	if not wants_stream(request, stream):
+		return await conditional_records_response(request, user_id, table, query, params, converters)
+	etag = await current_etag(request, user_id, table)
+	if etag_matches(request, etag):
+		return not_modified(etag)
+	response = RowStreamResponse(query, params, ndjson=wants_ndjson(request), converters=converters)
+	response.headers.update(etag_headers(etag))
+	return response
@@ -1,25 +1,576 @@
-import aiosqlite
+import asyncio
+import functools
+import os
+import re
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiosqlite
 
 DB_PATH = Path("data/db.sqlite3")
-SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+# Connection modes callers declare when borrowing a connection
+READ = "read"
+WRITE = "write"
+
+# Pool configuration, overridable through the environment.
+# Reads use their own read-only pool, sized independently of the write path.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5.0"))
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30.0"))
+
+# Group commit configuration for the single writer
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "64"))
+DB_WRITE_MAX_LATENCY_MS = float(os.getenv("DB_WRITE_MAX_LATENCY_MS", "2.0"))
+
+# Applied once per connection when it is opened, instead of on every request
+CONNECTION_PRAGMAS = (
+	"PRAGMA foreign_keys = ON;",
+	"PRAGMA busy_timeout = 5000;",
+	"PRAGMA temp_store = MEMORY;",
+)
+
+# Read-only connections additionally refuse any write at the SQLite level
+READ_ONLY_PRAGMAS = CONNECTION_PRAGMAS + (
+	"PRAGMA query_only = ON;",
+)
+
+# The writer fsyncs the WAL on every commit, i.e. once per batch
+WRITER_PRAGMAS = CONNECTION_PRAGMAS + (
+	"PRAGMA journal_mode = WAL;",
+	"PRAGMA synchronous = FULL;",
+)
+
+
+class PoolTimeoutError(Exception):
+	"""Raised when no pooled connection becomes available within the wait timeout."""
+
+
+class _UnitOfWorkAborted(Exception):
+	"""Signals the writer to roll back a unit of work whose body raised."""
+
+
+class ConnectionPool:
+	"""
+	Bounded pool of long-lived aiosqlite connections.
+	Connections are opened lazily up to max_size, configured once with CONNECTION_PRAGMAS,
+	and handed out most-recently-used first so the warmest connection is reused.
+	A readonly pool opens the file with URI mode=ro and query_only, so under WAL its
+	readers run in parallel against snapshots without ever taking the write lock.
+	"""
+
+	def __init__(
+		self,
+		database: str,
+		max_size: int = DB_POOL_SIZE,
+		min_size: int = DB_POOL_MIN_SIZE,
+		timeout: float = DB_POOL_TIMEOUT,
+		health_check_interval: float = DB_POOL_HEALTH_CHECK_INTERVAL,
+		readonly: bool = False,
+	) -> None:
+		if max_size < 1:
+			raise ValueError("max_size must be at least 1")
+		self.database = database
+		self.max_size = max_size
+		self.min_size = min(min_size, max_size)
+		self.timeout = timeout
+		self.health_check_interval = health_check_interval
+		self.readonly = readonly
+		self._idle: "asyncio.LifoQueue[Tuple[aiosqlite.Connection, float]]" = asyncio.LifoQueue()
+		self._size = 0
+		self._waiting = 0
+		self._closed = False
+		self._stats = {
+			"checkouts": 0,
+			"timeouts": 0,
+			"connections_opened": 0,
+			"connections_discarded": 0,
+			"health_checks": 0,
+			"total_wait_ms": 0.0,
+			"max_wait_ms": 0.0,
+		}
+
+	async def _connect(self) -> aiosqlite.Connection:
+		if self.readonly:
+			uri = f"{Path(self.database).resolve().as_uri()}?mode=ro"
+			conn = await aiosqlite.connect(uri, uri=True)
+			pragmas = READ_ONLY_PRAGMAS
+		else:
+			conn = await aiosqlite.connect(self.database)
+			pragmas = CONNECTION_PRAGMAS
+		try:
+			for pragma in pragmas:
+				await conn.execute(pragma)
+		except Exception:
+			await conn.close()
+			raise
+		conn.row_factory = aiosqlite.Row
+		self._stats["connections_opened"] += 1
+		return conn
+
+	async def open(self) -> None:
+		"""Pre-open min_size connections so the first requests do not pay for connecting."""
+		while self._size < self.min_size:
+			self._size += 1
+			try:
+				conn = await self._connect()
+			except Exception:
+				self._size -= 1
+				raise
+			self._idle.put_nowait((conn, time.monotonic()))
+
+	async def _discard(self, conn: aiosqlite.Connection) -> None:
+		self._size -= 1
+		self._stats["connections_discarded"] += 1
+		try:
+			await conn.close()
+		except Exception:
+			pass
+
+	async def _is_healthy(self, conn: aiosqlite.Connection, last_used: float) -> bool:
+		if time.monotonic() - last_used < self.health_check_interval:
+			return True
+		self._stats["health_checks"] += 1
+		try:
+			await conn.execute("SELECT 1")
+			return True
+		except Exception:
+			return False
+
+	async def acquire(self) -> aiosqlite.Connection:
+		"""Check out a connection, waiting up to `timeout` seconds when the pool is exhausted."""
+		if self._closed:
+			raise RuntimeError("Connection pool is closed")
+		started = time.monotonic()
+		while True:
+			if self._idle.empty() and self._size < self.max_size:
+				self._size += 1
+				try:
+					conn = await self._connect()
+				except Exception:
+					self._size -= 1
+					raise
+				break
+
+			remaining = self.timeout - (time.monotonic() - started)
+			if remaining <= 0:
+				self._stats["timeouts"] += 1
+				raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+			self._waiting += 1
+			try:
+				conn, last_used = await asyncio.wait_for(self._idle.get(), remaining)
+			except asyncio.TimeoutError:
+				self._stats["timeouts"] += 1
+				raise PoolTimeoutError(f"No database connection available after {self.timeout}s")
+			finally:
+				self._waiting -= 1
+
+			if await self._is_healthy(conn, last_used):
+				break
+			# Broken connection: drop it and loop round to open a replacement
+			await self._discard(conn)
+
+		waited_ms = (time.monotonic() - started) * 1000
+		self._stats["checkouts"] += 1
+		self._stats["total_wait_ms"] += waited_ms
+		self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], waited_ms)
+		return conn
+
+	async def release(self, conn: aiosqlite.Connection) -> None:
+		"""Return a connection, rolling back anything the borrower left uncommitted."""
+		try:
+			if conn.in_transaction:
+				await conn.rollback()
+		except Exception:
+			await self._discard(conn)
+			return
+		if self._closed:
+			await self._discard(conn)
+			return
+		self._idle.put_nowait((conn, time.monotonic()))
+
+	@asynccontextmanager
+	async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+		conn = await self.acquire()
+		try:
+			yield conn
+		finally:
+			await self.release(conn)
+
+	async def close(self) -> None:
+		"""Close idle connections; connections still checked out are closed on release."""
+		self._closed = True
+		while not self._idle.empty():
+			conn, _ = self._idle.get_nowait()
+			await self._discard(conn)
+
+	def stats(self) -> Dict[str, Any]:
+		checkouts = self._stats["checkouts"]
+		return {
+			"readonly": self.readonly,
+			"max_size": self.max_size,
+			"size": self._size,
+			"idle": self._idle.qsize(),
+			"in_use": self._size - self._idle.qsize(),
+			"waiting": self._waiting,
+			**self._stats,
+			"avg_wait_ms": self._stats["total_wait_ms"] / checkouts if checkouts else 0.0,
+		}
+
+
+WriteOperation = Callable[..., Awaitable[Any]]
+
+
+class WriteQueue:
+	"""
+	Single writer for the database.
+	Write operations are queued and executed by one task on one dedicated connection,
+	batched into a single transaction (one WAL fsync per batch). Each operation runs
+	inside its own savepoint so a failing write only rolls back itself.
+	"""
+
+	def __init__(
+		self,
+		database: str,
+		batch_size: int = DB_WRITE_BATCH_SIZE,
+		max_latency_ms: float = DB_WRITE_MAX_LATENCY_MS,
+	) -> None:
+		if batch_size < 1:
+			raise ValueError("batch_size must be at least 1")
+		self.database = database
+		self.batch_size = batch_size
+		self.max_latency = max_latency_ms / 1000
+		self._queue: "asyncio.Queue[Optional[Tuple[WriteOperation, asyncio.Future]]]" = asyncio.Queue()
+		self._conn: Optional[aiosqlite.Connection] = None
+		self._task: Optional[asyncio.Task] = None
+		self._start_lock = asyncio.Lock()
+		self._stats = {
+			"batches": 0,
+			"writes": 0,
+			"failed_writes": 0,
+			"failed_batches": 0,
+			"max_batch_size": 0,
+			"total_commit_ms": 0.0,
+			"max_commit_ms": 0.0,
+		}
+
+	async def start(self) -> None:
+		async with self._start_lock:
+			if self._task is not None:
+				return
+			conn = await aiosqlite.connect(self.database, isolation_level=None)
+			try:
+				for pragma in WRITER_PRAGMAS:
+					await conn.execute(pragma)
+			except Exception:
+				await conn.close()
+				raise
+			conn.row_factory = aiosqlite.Row
+			self._conn = conn
+			self._task = asyncio.create_task(self._run())
+
+	async def stop(self) -> None:
+		"""Finish the writes already queued, then close the writer connection."""
+		if self._task is None:
+			return
+		self._queue.put_nowait(None)
+		await self._task
+		self._task = None
+		while not self._queue.empty():
+			item = self._queue.get_nowait()
+			if item is not None and not item[1].done():
+				item[1].set_exception(RuntimeError("Database writer stopped"))
+		await self._conn.close()
+		self._conn = None
+
+	async def submit(self, operation: WriteOperation, *args: Any, **kwargs: Any) -> Any:
+		"""Queue `operation(conn, *args, **kwargs)` and wait for the batch containing it to commit."""
+		if self._task is None:
+			await self.start()
+		future = asyncio.get_running_loop().create_future()
+		self._queue.put_nowait((functools.partial(operation, *args, **kwargs), future))
+		return await future
+
+	@asynccontextmanager
+	async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+		"""
+		Hand the writer connection to the caller for a multi-statement unit of work.
+		The block runs as one queued operation: the writer waits while it executes,
+		its statements share the batch transaction, and an exception in the block
+		rolls back only this unit's savepoint. Leaving the block waits for the commit.
+		Do not call run_write inside the block; it would queue behind this unit.
+		"""
+		loop = asyncio.get_running_loop()
+		granted: asyncio.Future = loop.create_future()
+		finished: asyncio.Future = loop.create_future()
+
+		async def hand_over(conn: aiosqlite.Connection) -> None:
+			granted.set_result(conn)
+			await finished
+
+		done = asyncio.ensure_future(self.submit(hand_over))
+		try:
+			await asyncio.wait({granted, done}, return_when=asyncio.FIRST_COMPLETED)
+		except BaseException:
+			# Cancelled while queued: make sure the writer never waits on us
+			finished.set_exception(_UnitOfWorkAborted())
+			done.cancel()
+			raise
+		if not granted.done():
+			done.result()
+		try:
+			yield granted.result()
+		except BaseException:
+			finished.set_exception(_UnitOfWorkAborted())
+			try:
+				await done
+			except _UnitOfWorkAborted:
+				pass
+			raise
+		finished.set_result(None)
+		await done
+
+	async def _collect(self, first: Tuple[WriteOperation, asyncio.Future]) -> Tuple[List[Tuple[WriteOperation, asyncio.Future]], bool]:
+		batch = [first]
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + self.max_latency
+		while len(batch) < self.batch_size:
+			remaining = deadline - loop.time()
+			try:
+				if remaining <= 0:
+					item = self._queue.get_nowait()
+				else:
+					item = await asyncio.wait_for(self._queue.get(), remaining)
+			except (asyncio.QueueEmpty, asyncio.TimeoutError):
+				break
+			if item is None:
+				return batch, True
+			batch.append(item)
+		return batch, False
+
+	async def _run(self) -> None:
+		stopping = False
+		while not stopping:
+			first = await self._queue.get()
+			if first is None:
+				break
+			batch, stopping = await self._collect(first)
+			await self._commit_batch(batch)
+
+	async def _commit_batch(self, batch: List[Tuple[WriteOperation, asyncio.Future]]) -> None:
+		conn = self._conn
+		outcomes: List[Tuple[asyncio.Future, Any, bool]] = []
+		started = time.monotonic()
+		try:
+			await conn.execute("BEGIN IMMEDIATE")
+			for operation, future in batch:
+				if future.cancelled():
+					continue
+				await conn.execute("SAVEPOINT write_op")
+				try:
+					result = await operation(conn)
+				except Exception as exc:
+					await conn.execute("ROLLBACK TO write_op")
+					await conn.execute("RELEASE write_op")
+					outcomes.append((future, exc, False))
+				else:
+					await conn.execute("RELEASE write_op")
+					outcomes.append((future, result, True))
+			await conn.execute("COMMIT")
+		except Exception as exc:
+			if conn.in_transaction:
+				await conn.execute("ROLLBACK")
+			self._stats["failed_batches"] += 1
+			self._stats["failed_writes"] += len(batch)
+			for _, future in batch:
+				if not future.done():
+					future.set_exception(exc)
+			return
+
+		commit_ms = (time.monotonic() - started) * 1000
+		self._stats["batches"] += 1
+		self._stats["writes"] += len(outcomes)
+		self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(outcomes))
+		self._stats["total_commit_ms"] += commit_ms
+		self._stats["max_commit_ms"] = max(self._stats["max_commit_ms"], commit_ms)
+		for future, value, ok in outcomes:
+			if future.done():
+				continue
+			if ok:
+				future.set_result(value)
+			else:
+				self._stats["failed_writes"] += 1
+				future.set_exception(value)
+
+	def stats(self) -> Dict[str, Any]:
+		batches = self._stats["batches"]
+		return {
+			"batch_size_limit": self.batch_size,
+			"max_latency_ms": self.max_latency * 1000,
+			"queued": self._queue.qsize(),
+			**self._stats,
+			"avg_batch_size": self._stats["writes"] / batches if batches else 0.0,
+			"avg_commit_ms": self._stats["total_commit_ms"] / batches if batches else 0.0,
+		}
+
+
+_pools: Dict[str, ConnectionPool] = {}
+
+
+def get_pool(mode: str = WRITE) -> ConnectionPool:
+	if mode not in (READ, WRITE):
+		raise ValueError(f"Unknown connection mode: {mode!r}")
+	if mode not in _pools:
+		if mode == READ:
+			_pools[mode] = ConnectionPool(DB_PATH.as_posix(), max_size=DB_READ_POOL_SIZE, readonly=True)
+		else:
+			_pools[mode] = ConnectionPool(DB_PATH.as_posix())
+	return _pools[mode]
+
+
+async def init_db_pool() -> None:
+	"""Warm both pools; call after ensure_database_initialized so the read-only pool finds the file."""
+	await get_pool(WRITE).open()
+	await get_pool(READ).open()
+
+
+async def close_db_pool() -> None:
+	for mode in list(_pools):
+		await _pools.pop(mode).close()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+	return {mode: get_pool(mode).stats() for mode in (READ, WRITE)}
+
+
+_writer: Optional[WriteQueue] = None
+
+
+def get_writer() -> WriteQueue:
+	global _writer
+	if _writer is None:
+		_writer = WriteQueue(DB_PATH.as_posix())
+	return _writer
+
+
+async def start_db_writer() -> None:
+	await get_writer().start()
+
+
+async def stop_db_writer() -> None:
+	global _writer
+	if _writer is not None:
+		await _writer.stop()
+		_writer = None
+
+
+def get_write_stats() -> Dict[str, Any]:
+	return get_writer().stats()
+
+
+async def run_write(operation: WriteOperation, *args: Any, **kwargs: Any) -> Any:
+	"""Run `operation(conn, *args, **kwargs)` on the single writer and return its result."""
+	return await get_writer().submit(operation, *args, **kwargs)
+
+
+def load_migrations() -> List[Tuple[int, str, str]]:
+	"""Return (version, name, sql) for every numbered migration file, in version order."""
+	migrations = []
+	for path in MIGRATIONS_DIR.glob("*.sql"):
+		match = MIGRATION_FILE_PATTERN.match(path.name)
+		if not match:
+			continue
+		migrations.append((int(match.group(1)), match.group(2), path.read_text(encoding="utf-8")))
+	migrations.sort()
+	versions = [version for version, _, _ in migrations]
+	if len(versions) != len(set(versions)):
+		raise RuntimeError(f"Duplicate migration version in {MIGRATIONS_DIR}")
+	return migrations
+
+
+async def apply_migrations(conn: aiosqlite.Connection) -> List[int]:
+	"""Apply the migrations newer than the recorded schema_version, each in its own transaction."""
+	await conn.execute(
+		"""
+		CREATE TABLE IF NOT EXISTS schema_version (
+			version INTEGER PRIMARY KEY,
+			name TEXT NOT NULL,
+			applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+		)
+		"""
+	)
+	await conn.commit()
+	cursor = await conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+	current_version = (await cursor.fetchone())[0]
+
+	applied = []
+	for version, name, sql in load_migrations():
+		if version <= current_version:
+			continue
+		# executescript commits anything pending first, so the script carries its own transaction
+		try:
+			await conn.executescript(
+				f"BEGIN;\n{sql}\n;INSERT INTO schema_version (version, name) VALUES ({version}, '{name}');\nCOMMIT;"
+			)
+		except Exception:
+			if conn.in_transaction:
+				await conn.rollback()
+			raise
+		applied.append(version)
+	return applied
 
 
 async def ensure_database_initialized() -> None:
 	DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 	async with aiosqlite.connect(DB_PATH.as_posix()) as db:
 		await db.execute("PRAGMA foreign_keys = ON;")
-		schema_sql = SCHEMA_PATH.read_text(encoding="utf-8")
-		await db.executescript(schema_sql)
-		await db.commit()
+		await db.execute("PRAGMA journal_mode = WAL;")
+		applied = await apply_migrations(db)
+		if applied:
+			print(f"Applied database migrations: {applied}")
+
+
+@asynccontextmanager
+async def acquire_connection(mode: str = WRITE) -> AsyncIterator[aiosqlite.Connection]:
+	"""
+	Borrow a pooled connection for the duration of the block.
+	Pass READ for queries so they are served by the read-only pool; single-statement
+	writes should go through run_write instead.
+	"""
+	async with get_pool(mode).connection() as conn:
+		yield conn
+
+
+@asynccontextmanager
+async def unit_of_work(mode: str = WRITE) -> AsyncIterator[aiosqlite.Connection]:
+	"""
+	One connection and one transaction shared by every repository call in the block.
+	READ borrows a read-only connection and holds a snapshot, so multi-table reads are
+	consistent. WRITE runs the block on the single writer, committing on success and
+	rolling back on error.
+	"""
+	if mode == WRITE:
+		async with get_writer().transaction() as conn:
+			yield conn
+		return
+
+	async with acquire_connection(READ) as conn:
+		await conn.execute("BEGIN")
+		try:
+			yield conn
+		except BaseException:
+			await conn.rollback()
+			raise
+		await conn.commit()
 
 
 async def get_db_connection() -> AsyncIterator[aiosqlite.Connection]:
-	conn = await aiosqlite.connect(DB_PATH.as_posix())
-	await conn.execute("PRAGMA foreign_keys = ON;")
-	conn.row_factory = aiosqlite.Row
-	try:
+	"""Generator form of acquire_connection, usable as a FastAPI dependency."""
+	async with get_pool().connection() as conn:
 		yield conn
-	finally:
-		await conn.close()
@@ -0,0 +1,65 @@
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+# Samples kept per metric for the percentiles
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "1000"))
+
+
+class LatencyStats:
+	"""
+	Latency samples for one stage. Count, mean and max cover the process lifetime;
+	the percentiles cover the last `window` samples, so they follow recent behaviour.
+	"""
+
+	def __init__(self, window: int = LATENCY_WINDOW):
+		self.window = window
+		self._samples: Deque[float] = deque(maxlen=window)
+		self._lock = threading.Lock()
+		self._count = 0
+		self._total_ms = 0.0
+		self._max_ms = 0.0
+
+	def record(self, ms: float) -> None:
+		with self._lock:
+			self._samples.append(ms)
+			self._count += 1
+			self._total_ms += ms
+			self._max_ms = max(self._max_ms, ms)
+
+	def stats(self) -> Dict[str, Any]:
+		with self._lock:
+			samples = sorted(self._samples)
+			count = self._count
+			total_ms = self._total_ms
+			max_ms = self._max_ms
+
+		def percentile(fraction: float) -> float:
+			if not samples:
+				return 0.0
+			return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+		return {
+			"count": count,
+			"avg_ms": total_ms / count if count else 0.0,
+			"p50_ms": percentile(0.50),
+			"p95_ms": percentile(0.95),
+			"p99_ms": percentile(0.99),
+			"max_ms": max_ms,
+			"window": self.window,
+		}
+
+
+# Streamed chat replies (POST /chat/stream): model request sent -> first reply text sent
+chat_time_to_first_token = LatencyStats()
+# ... and -> the reply fully received from the model
+chat_stream_model_time = LatencyStats()
+
+
+def get_chat_latency_stats() -> Dict[str, Dict[str, Any]]:
+	return {
+		"time_to_first_token": chat_time_to_first_token.stats(),
+		"model_stream": chat_stream_model_time.stats(),
+	}
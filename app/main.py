@@ -1,25 +1,59 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
+import datetime
 import os
 import requests
-from fastapi import FastAPI, Request, Depends, HTTPException
-from fastapi.responses import RedirectResponse, HTMLResponse
+from fastapi import FastAPI, Request, Depends, HTTPException, Query
+from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse, Response
 from google_auth_oauthlib.flow import Flow
 from google.oauth2.credentials import Credentials
-from pydantic import BaseModel
-from typing import List, Optional
-from db import ensure_database_initialized, get_db_connection
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional, Tuple, Type
+from cache import get_cache_stats
+from conditional import (
+	conditional_records_response,
+	conditional_rows_response,
+	current_etag,
+	etag_headers,
+	etag_matches,
+	not_modified,
+)
+from db import (
+	acquire_connection,
+	close_db_pool,
+	ensure_database_initialized,
+	get_pool_stats,
+	get_write_stats,
+	init_db_pool,
+	PoolTimeoutError,
+	READ,
+	run_write,
+	start_db_writer,
+	stop_db_writer,
+)
+from repositories import alerts as alerts_repo
+from repositories import daily_metrics as daily_metrics_repo
+from repositories import disorders as disorders_repo
+from repositories import medications as medications_repo
+from repositories import notifications as notifications_repo
+from repositories import reports as reports_repo
+from repositories import rollups as rollups_repo
+from repositories import symptoms as symptoms_repo
+from repositories.pagination import InvalidCursorError
+from repositories.users import PROFILE_FIELDS
+from latency import get_chat_latency_stats
+from streaming import EventStreamResponse, JSON_MEDIA_TYPE, records_response, rows_response
 from services import (
 	add_user_tokens, 
 	create_notification, 
-	get_user_notifications, 
+	get_user_notifications_page,
 	mark_notification_read, 
 	mark_all_notifications_read,
 	get_unread_notification_count,
 	delete_notification,
 	create_alert,
-	get_user_alerts,
+	get_user_alerts_page,
 	get_upcoming_alerts,
 	update_alert,
 	deactivate_alert,
@@ -27,24 +61,45 @@ from services import (
 	get_active_alert_count,
 	# User profile functions
 	get_user_profile,
+	get_user_profiles,
 	update_user_profile,
 	# Symptoms functions
 	add_symptom_log,
-	get_user_symptoms,
+	add_symptom_logs_bulk,
+	get_user_symptoms_page,
 	get_recent_symptoms,
 	# Disorders functions
 	add_disorder,
 	add_user_disorder,
+	find_disorder,
+	get_disorder_catalog,
 	# Medications functions
 	add_medication,
+	find_medication,
+	get_medication_catalog,
+	search_medications,
 	add_user_medication,
 	add_medication_schedule,
+	add_medication_regimen,
+	add_medication_schedules_bulk,
+	update_medication_schedule_status,
 	# Daily metrics functions
 	add_daily_metric,
+	add_daily_metrics_bulk,
+	get_user_metrics_page,
 	# Reports functions
 	add_report,
+	get_user_reports_page,
 	get_user_data_by_date,
+	get_user_data_by_date_range,
 	get_comprehensive_user_data,
+	get_user_dashboard,
+	DASHBOARD_SECTIONS,
+	load_catalog_caches,
+	# AI conversation functions
+	handle_chat_turn,
+	stream_chat_turn,
+	summarize_user_day,
 	# Personalized notification functions
 	generate_personalized_notification,
 	generate_daily_personalized_notification,
@@ -86,6 +141,25 @@ app = FastAPI(title="Global Health API", version="0.1.0")
 @app.on_event("startup")
 async def on_startup() -> None:
 	await ensure_database_initialized()
+	await init_db_pool()
+	await start_db_writer()
+	await load_catalog_caches()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+	await stop_db_writer()
+	await close_db_pool()
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+	return JSONResponse(status_code=503, content={"detail": "Database busy, please retry"})
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+	return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
 class UserCreate(BaseModel):
@@ -118,6 +192,11 @@ class NotificationOut(BaseModel):
 	created_at: str
 
 
+class NotificationPage(BaseModel):
+	items: List[NotificationOut]
+	next_cursor: Optional[str] = None
+
+
 class AlertCreate(BaseModel):
 	alert_type: str
 	title: str
@@ -136,6 +215,11 @@ class AlertOut(BaseModel):
 	created_at: str
 
 
+class AlertPage(BaseModel):
+	items: List[AlertOut]
+	next_cursor: Optional[str] = None
+
+
 class UserProfileUpdate(BaseModel):
 	name: Optional[str] = None
 	age: Optional[int] = None
@@ -165,6 +249,11 @@ class UserProfileUpdate(BaseModel):
 	emergency_contact: Optional[str] = None
 
 
+class UserProfilesRequest(BaseModel):
+	ids: List[int]
+	fields: Optional[List[str]] = None
+
+
 class SymptomCreate(BaseModel):
 	symptom: str
 	severity: Optional[str] = None
@@ -182,6 +271,11 @@ class SymptomOut(BaseModel):
 	log_date: str
 
 
+class SymptomPage(BaseModel):
+	items: List[SymptomOut]
+	next_cursor: Optional[str] = None
+
+
 class DisorderCreate(BaseModel):
 	name: str
 	description: Optional[str] = None
@@ -213,6 +307,28 @@ class MedicationScheduleCreate(BaseModel):
 	status: Optional[str] = None
 
 
+MEDICATION_SCHEDULE_STATUSES = ("pending", "taken", "missed")
+
+
+class MedicationScheduleStatusUpdate(BaseModel):
+	status: str
+
+
+class RegimenScheduleEntry(BaseModel):
+	date: str
+	time: str
+	status: Optional[str] = None
+
+
+class MedicationRegimenCreate(BaseModel):
+	medication_id: Optional[int] = None  # existing medication, or
+	medication: Optional[MedicationCreate] = None  # a new one to create
+	start_date: str
+	end_date: Optional[str] = None
+	frequency: Optional[str] = None
+	schedule: List[RegimenScheduleEntry] = []
+
+
 class DailyMetricCreate(BaseModel):
 	date: str
 	steps: Optional[int] = None
@@ -234,14 +350,87 @@ class PersonalizedNotificationRequest(BaseModel):
 	custom_context: Optional[str] = None
 
 
+class ChatRequest(BaseModel):
+	user_id: int
+	message: str
+
+
+class SummarizeRequest(BaseModel):
+	user_id: int
+
+
 class MultipleNotificationsRequest(BaseModel):
 	notification_types: Optional[List[str]] = None  # If None, uses default types
 
 
+# Upper bound on rows accepted by the bulk endpoints in one request
+MAX_BULK_ROWS = 10_000
+
+# Page sizes for the keyset-paginated /page list endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Longest date range /reports/{user_id}/summary/range summarizes in one request
+MAX_SUMMARY_RANGE_DAYS = 90
+
+# Upper bound on user ids accepted by /users/profiles in one request
+MAX_PROFILE_BATCH_IDS = 5_000
+
+
+def _validate_bulk_rows(rows: List[Dict[str, Any]], model: Type[BaseModel]) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+	"""Validate each row on its own; returns ([(index, row)], [error]) so bad rows do not reject the batch"""
+	if len(rows) > MAX_BULK_ROWS:
+		raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ROWS} rows per request")
+	valid = []
+	errors = []
+	for index, row in enumerate(rows):
+		try:
+			valid.append((index, model(**row).dict()))
+		except ValidationError as e:
+			detail = [{"loc": err["loc"], "msg": err["msg"]} for err in e.errors()]
+			errors.append({"index": index, "detail": detail})
+	return valid, errors
+
+
+def _bulk_response(valid: List[Tuple[int, Dict[str, Any]]], ids: List[Optional[int]], db_errors: Dict[int, str], errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+	"""Map insert results back to the positions of the submitted rows"""
+	inserted = []
+	for position, (index, _) in enumerate(valid):
+		if position in db_errors:
+			errors.append({"index": index, "detail": db_errors[position]})
+		else:
+			inserted.append({"index": index, "id": ids[position]})
+	errors.sort(key=lambda error: error["index"])
+	return {
+		"inserted_count": len(inserted),
+		"error_count": len(errors),
+		"inserted": inserted,
+		"errors": errors,
+	}
+
+
 @app.get("/health")
 async def health() -> dict:
 	return {"status": "ok"}
 
+
+@app.get("/health/db")
+async def health_db() -> dict:
+	"""Connection pool and write batching statistics"""
+	return {"status": "ok", "pool": get_pool_stats(), "writer": get_write_stats()}
+
+
+@app.get("/health/cache")
+async def health_cache() -> dict:
+	"""Hit/miss and memory statistics for the in-process caches"""
+	return get_cache_stats()
+
+
+@app.get("/health/chat")
+async def health_chat() -> dict:
+	"""Time to first token and model time of streamed chat replies"""
+	return get_chat_latency_stats()
+
 from starlette.middleware.sessions import SessionMiddleware
 app.add_middleware(SessionMiddleware, secret_key="super-secret-key")
 
@@ -319,7 +508,7 @@ async def revoke(request: Request):
 
 @app.post("/users", response_model=UserOut, status_code=201)
 async def create_user(payload: UserCreate):
-	async for conn in get_db_connection():
+	async def insert_user(conn):
 		cursor = await conn.execute(
 			"""
 			INSERT INTO Users (name, age, gender)
@@ -329,23 +518,56 @@ async def create_user(payload: UserCreate):
 			(payload.name, payload.age, payload.gender),
 		)
 		row = await cursor.fetchone()
-		await conn.commit()
 		return dict(row)
 
+	return await run_write(insert_user)
+
 
 @app.get("/users", response_model=List[UserOut])
 async def list_users():
-	async for conn in get_db_connection():
-		cursor = await conn.execute(
-			"SELECT user_id, name, age, gender, created_at FROM Users ORDER BY user_id DESC"
+	return await records_response(
+		"SELECT user_id, name, age, gender, created_at FROM Users ORDER BY user_id DESC"
+	)
+
+
+async def _user_profiles_response(user_ids: List[int], fields: Optional[List[str]]) -> Dict[str, Any]:
+	if not user_ids:
+		raise HTTPException(status_code=400, detail="No user ids given")
+	if len(user_ids) > MAX_PROFILE_BATCH_IDS:
+		raise HTTPException(status_code=400, detail=f"At most {MAX_PROFILE_BATCH_IDS} user ids per request")
+	unknown = [name for name in fields or () if name not in PROFILE_FIELDS]
+	if unknown:
+		raise HTTPException(
+			status_code=400,
+			detail=f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(PROFILE_FIELDS)}",
 		)
-		rows = await cursor.fetchall()
-		return [dict(r) for r in rows]
+	items, missing_ids = await get_user_profiles(user_ids, fields)
+	return {"items": items, "missing_ids": missing_ids}
+
+
+@app.get("/users/profiles")
+async def get_user_profiles_endpoint(ids: str, fields: Optional[str] = None):
+	"""
+	Get the profiles of many users in one request, in the order of `ids`.
+	`ids` and the optional `fields` projection are comma-separated.
+	"""
+	try:
+		user_ids = [int(value) for value in ids.split(",") if value.strip()]
+	except ValueError:
+		raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+	selected = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+	return await _user_profiles_response(user_ids, selected)
+
+
+@app.post("/users/profiles")
+async def post_user_profiles_endpoint(payload: UserProfilesRequest):
+	"""Same as GET /users/profiles, for id lists too long for a URL"""
+	return await _user_profiles_response(payload.ids, payload.fields)
 
 
 @app.get("/users/{user_id}", response_model=UserOut)
 async def get_user(user_id: int):
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		cursor = await conn.execute(
 			"SELECT user_id, name, age, gender, created_at FROM Users WHERE user_id = ?",
 			(user_id,),
@@ -357,14 +579,74 @@ async def get_user(user_id: int):
 
 
 @app.get("/users/{user_id}/profile")
-async def get_user_profile_endpoint(user_id: int):
-	"""Get comprehensive user profile with all health data"""
+async def get_user_profile_endpoint(request: Request, response: Response, user_id: int):
+	"""Get comprehensive user profile with all health data; honours If-None-Match"""
+	etag = await current_etag(request, user_id, "Users")
+	if etag_matches(request, etag):
+		return not_modified(etag)
 	profile = await get_user_profile(user_id)
 	if not profile:
 		raise HTTPException(status_code=404, detail="User not found")
+	response.headers.update(etag_headers(etag))
 	return profile
 
 
+@app.get("/users/{user_id}/dashboard")
+async def get_user_dashboard_endpoint(
+	user_id: int,
+	sections: Optional[str] = None,
+	metrics_limit: int = Query(7, ge=1, le=MAX_PAGE_SIZE),
+	hours_ahead: int = Query(24, ge=1),
+	date: Optional[str] = None,
+	debug: bool = False,
+):
+	"""
+	Get the dashboard page data in one request: profile header, latest metrics, upcoming
+	alerts, unread notification count and the day's medication schedule.
+	`sections` is an optional comma-separated subset of those.
+	"""
+	selected = None
+	if sections:
+		selected = [name.strip() for name in sections.split(",") if name.strip()]
+		unknown = [name for name in selected if name not in DASHBOARD_SECTIONS]
+		if unknown:
+			raise HTTPException(
+				status_code=400,
+				detail=f"Unknown sections: {', '.join(unknown)}; choose from {', '.join(DASHBOARD_SECTIONS)}",
+			)
+	data = await get_user_dashboard(
+		user_id=user_id,
+		sections=selected,
+		metrics_limit=metrics_limit,
+		alerts_hours_ahead=hours_ahead,
+		date=date,
+		debug=debug,
+	)
+	if data is None:
+		raise HTTPException(status_code=404, detail="User not found")
+	return data
+
+
+@app.get("/users/{user_id}/rollups")
+async def get_user_rollups(
+	user_id: int,
+	from_date: Optional[datetime.date] = Query(None, alias="from"),
+	to_date: Optional[datetime.date] = Query(None, alias="to"),
+):
+	"""
+	Get the user's per-day rollups (symptom count, medication adherence, metrics,
+	notification count) between from and to (inclusive), oldest first
+	"""
+	if from_date and to_date and to_date < from_date:
+		raise HTTPException(status_code=400, detail="to must not be before from")
+	query, params = rollups_repo.user_rollups_query(
+		user_id,
+		from_date.isoformat() if from_date else None,
+		to_date.isoformat() if to_date else None,
+	)
+	return await records_response(query, params)
+
+
 @app.put("/users/{user_id}/profile")
 async def update_user_profile_endpoint(user_id: int, payload: UserProfileUpdate):
 	"""Update user profile with comprehensive health data"""
@@ -405,17 +687,34 @@ async def create_user_notification(user_id: int, payload: NotificationCreate):
 
 @app.get("/notifications/{user_id}", response_model=List[NotificationOut])
 async def get_user_notifications_endpoint(
+	request: Request,
 	user_id: int, 
 	unread_only: bool = False, 
-	limit: Optional[int] = None
+	limit: Optional[int] = None,
+	stream: bool = False
+):
+	"""Get notifications for a specific user; honours If-None-Match"""
+	query, params = notifications_repo.user_notifications_query(user_id, unread_only, limit)
+	return await conditional_rows_response(
+		request, user_id, "Notifications", query, params, stream, converters={"is_read": bool}
+	)
+
+
+@app.get("/notifications/{user_id}/page", response_model=NotificationPage)
+async def get_user_notifications_page_endpoint(
+	user_id: int,
+	cursor: Optional[str] = None,
+	page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+	unread_only: bool = False
 ):
-	"""Get notifications for a specific user"""
-	notifications = await get_user_notifications(
-		user_id=user_id, 
-		unread_only=unread_only, 
-		limit=limit
+	"""Get notifications newest first, one page at a time; pass next_cursor back as cursor"""
+	items, next_cursor = await get_user_notifications_page(
+		user_id=user_id,
+		page_size=page_size,
+		cursor=cursor,
+		unread_only=unread_only
 	)
-	return notifications
+	return {"items": items, "next_cursor": next_cursor}
 
 
 @app.put("/notifications/{user_id}/mark-read/{notification_id}")
@@ -469,17 +768,33 @@ async def create_user_alert(user_id: int, payload: AlertCreate):
 
 @app.get("/alerts/{user_id}", response_model=List[AlertOut])
 async def get_user_alerts_endpoint(
+	request: Request,
 	user_id: int, 
 	active_only: bool = True, 
 	limit: Optional[int] = None
 ):
-	"""Get alerts for a specific user"""
-	alerts = await get_user_alerts(
-		user_id=user_id, 
-		active_only=active_only, 
-		limit=limit
+	"""Get alerts for a specific user; honours If-None-Match"""
+	query, params = alerts_repo.user_alerts_query(user_id, active_only, limit)
+	return await conditional_records_response(
+		request, user_id, "Alerts", query, params, converters={"is_active": bool}
 	)
-	return alerts
+
+
+@app.get("/alerts/{user_id}/page", response_model=AlertPage)
+async def get_user_alerts_page_endpoint(
+	user_id: int,
+	cursor: Optional[str] = None,
+	page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+	active_only: bool = True
+):
+	"""Get alerts soonest first, one page at a time; pass next_cursor back as cursor"""
+	items, next_cursor = await get_user_alerts_page(
+		user_id=user_id,
+		page_size=page_size,
+		cursor=cursor,
+		active_only=active_only
+	)
+	return {"items": items, "next_cursor": next_cursor}
 
 
 @app.get("/alerts/{user_id}/upcoming")
@@ -540,14 +855,35 @@ async def add_user_symptom(user_id: int, payload: SymptomCreate):
 	return result
 
 
+@app.post("/symptoms/{user_id}/bulk", status_code=201)
+async def add_user_symptoms_bulk(user_id: int, payload: List[Dict[str, Any]]):
+	"""Log many symptoms (SymptomCreate rows) for a user in one transaction"""
+	valid, errors = _validate_bulk_rows(payload, SymptomCreate)
+	ids, db_errors = await add_symptom_logs_bulk(user_id=user_id, symptoms=[row for _, row in valid])
+	return _bulk_response(valid, ids, db_errors, errors)
+
+
 @app.get("/symptoms/{user_id}", response_model=List[SymptomOut])
 async def get_user_symptoms_endpoint(
+	request: Request,
 	user_id: int, 
-	limit: Optional[int] = None
+	limit: Optional[int] = None,
+	stream: bool = False
 ):
-	"""Get symptoms for a specific user"""
-	symptoms = await get_user_symptoms(user_id=user_id, limit=limit)
-	return symptoms
+	"""Get symptoms for a specific user; honours If-None-Match"""
+	query, params = symptoms_repo.user_symptoms_query(user_id, limit)
+	return await conditional_rows_response(request, user_id, "Symptoms", query, params, stream)
+
+
+@app.get("/symptoms/{user_id}/page", response_model=SymptomPage)
+async def get_user_symptoms_page_endpoint(
+	user_id: int,
+	cursor: Optional[str] = None,
+	page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+	"""Get symptoms newest first, one page at a time; pass next_cursor back as cursor"""
+	items, next_cursor = await get_user_symptoms_page(user_id=user_id, page_size=page_size, cursor=cursor)
+	return {"items": items, "next_cursor": next_cursor}
 
 
 @app.get("/symptoms/{user_id}/recent")
@@ -577,6 +913,8 @@ async def create_disorder_endpoint(payload: DisorderCreate):
 @app.post("/disorders/{user_id}/assign", status_code=201)
 async def assign_disorder_to_user(user_id: int, payload: UserDisorderCreate):
 	"""Assign a disorder to a specific user"""
+	if await find_disorder(payload.disorder_id) is None:
+		raise HTTPException(status_code=404, detail="Disorder not found")
 	result = await add_user_disorder(
 		user_id=user_id,
 		disorder_id=payload.disorder_id,
@@ -588,31 +926,15 @@ async def assign_disorder_to_user(user_id: int, payload: UserDisorderCreate):
 
 @app.get("/disorders")
 async def get_all_disorders():
-	"""Get all available disorders"""
-	async for conn in get_db_connection():
-		cursor = await conn.execute("SELECT * FROM Disorders ORDER BY name")
-		rows = await cursor.fetchall()
-		return [dict(row) for row in rows]
+	"""Get all available disorders, served from the in-process catalog cache"""
+	catalog = await get_disorder_catalog()
+	return Response(catalog.to_json(), media_type=JSON_MEDIA_TYPE)
 
 
 @app.get("/disorders/{user_id}")
 async def get_user_disorders(user_id: int):
 	"""Get disorders assigned to a specific user"""
-	async for conn in get_db_connection():
-		cursor = await conn.execute(
-			"""
-			SELECT 
-				ud.user_disorder_id, ud.user_id, ud.disorder_id, ud.diagnosed_date, ud.resolved_date,
-				d.name as disorder_name, d.description
-			FROM UserDisorders ud
-			JOIN Disorders d ON ud.disorder_id = d.disorder_id
-			WHERE ud.user_id = ?
-			ORDER BY ud.diagnosed_date DESC
-			""",
-			(user_id,)
-		)
-		rows = await cursor.fetchall()
-		return [dict(row) for row in rows]
+	return await records_response(disorders_repo.USER_DISORDERS_QUERY, (user_id,))
 
 
 # ===========================
@@ -632,16 +954,25 @@ async def create_medication_endpoint(payload: MedicationCreate):
 
 @app.get("/medications")
 async def get_all_medications():
-	"""Get all available medications"""
-	async for conn in get_db_connection():
-		cursor = await conn.execute("SELECT * FROM Medications ORDER BY name")
-		rows = await cursor.fetchall()
-		return [dict(row) for row in rows]
+	"""Get all available medications, served from the in-process catalog cache"""
+	catalog = await get_medication_catalog()
+	return Response(catalog.to_json(), media_type=JSON_MEDIA_TYPE)
+
+
+@app.get("/medications/search")
+async def search_medications_endpoint(
+	q: str = Query(..., min_length=1),
+	limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE)
+):
+	"""Get medications whose name starts with q (case-insensitive), alphabetically"""
+	return await search_medications(prefix=q, limit=limit)
 
 
 @app.post("/medications/{user_id}/assign", status_code=201)
 async def assign_medication_to_user(user_id: int, payload: UserMedicationCreate):
 	"""Assign a medication to a specific user"""
+	if await find_medication(payload.medication_id) is None:
+		raise HTTPException(status_code=404, detail="Medication not found")
 	result = await add_user_medication(
 		user_id=user_id,
 		medication_id=payload.medication_id,
@@ -652,24 +983,29 @@ async def assign_medication_to_user(user_id: int, payload: UserMedicationCreate)
 	return result
 
 
+@app.post("/medications/{user_id}/regimen", status_code=201)
+async def create_medication_regimen(user_id: int, payload: MedicationRegimenCreate):
+	"""Create a medication assignment and its schedule for a user in one transaction"""
+	if (payload.medication_id is None) == (payload.medication is None):
+		raise HTTPException(status_code=400, detail="Provide exactly one of medication_id or medication")
+	if payload.medication_id is not None and await find_medication(payload.medication_id) is None:
+		raise HTTPException(status_code=404, detail="Medication not found")
+	result = await add_medication_regimen(
+		user_id=user_id,
+		start_date=payload.start_date,
+		medication_id=payload.medication_id,
+		medication=payload.medication.dict() if payload.medication else None,
+		end_date=payload.end_date,
+		frequency=payload.frequency,
+		schedule=[entry.dict() for entry in payload.schedule],
+	)
+	return result
+
+
 @app.get("/medications/{user_id}")
 async def get_user_medications(user_id: int):
 	"""Get medications assigned to a specific user"""
-	async for conn in get_db_connection():
-		cursor = await conn.execute(
-			"""
-			SELECT 
-				um.user_med_id, um.user_id, um.medication_id, um.start_date, um.end_date, um.frequency,
-				m.name as medication_name, m.dosage, m.description
-			FROM UserMedications um
-			JOIN Medications m ON um.medication_id = m.medication_id
-			WHERE um.user_id = ?
-			ORDER BY um.start_date DESC
-			""",
-			(user_id,)
-		)
-		rows = await cursor.fetchall()
-		return [dict(row) for row in rows]
+	return await records_response(medications_repo.USER_MEDICATIONS_QUERY, (user_id,))
 
 
 @app.post("/medications/schedule", status_code=201)
@@ -684,31 +1020,35 @@ async def create_medication_schedule_endpoint(payload: MedicationScheduleCreate)
 	return result
 
 
+@app.post("/medications/schedule/bulk", status_code=201)
+async def create_medication_schedules_bulk_endpoint(payload: List[Dict[str, Any]]):
+	"""Create many medication schedule entries (MedicationScheduleCreate rows) in one transaction"""
+	valid, errors = _validate_bulk_rows(payload, MedicationScheduleCreate)
+	ids, db_errors = await add_medication_schedules_bulk(schedules=[row for _, row in valid])
+	return _bulk_response(valid, ids, db_errors, errors)
+
+
+@app.put("/medications/schedule/{schedule_id}/status")
+async def update_medication_schedule_status_endpoint(schedule_id: int, payload: MedicationScheduleStatusUpdate):
+	"""Mark a scheduled dose as pending, taken or missed"""
+	if payload.status not in MEDICATION_SCHEDULE_STATUSES:
+		raise HTTPException(status_code=400, detail=f"status must be one of {', '.join(MEDICATION_SCHEDULE_STATUSES)}")
+	result = await update_medication_schedule_status(schedule_id=schedule_id, status=payload.status)
+	if not result:
+		raise HTTPException(status_code=404, detail="Schedule entry not found")
+	return result
+
+
 @app.get("/medications/{user_id}/schedule")
-async def get_user_medication_schedule(user_id: int, date: Optional[str] = None):
+async def get_user_medication_schedule(
+	request: Request,
+	user_id: int,
+	date: Optional[str] = None,
+	stream: bool = False
+):
 	"""Get medication schedule for a user"""
-	async for conn in get_db_connection():
-		query = """
-			SELECT 
-				ms.schedule_id, ms.user_med_id, ms.date, ms.time, ms.status,
-				m.name as medication_name, m.dosage, m.description,
-				um.frequency
-			FROM MedicationSchedule ms
-			JOIN UserMedications um ON ms.user_med_id = um.user_med_id
-			JOIN Medications m ON um.medication_id = m.medication_id
-			WHERE um.user_id = ?
-		"""
-		params = [user_id]
-		
-		if date:
-			query += " AND ms.date = ?"
-			params.append(date)
-		
-		query += " ORDER BY ms.date DESC, ms.time DESC"
-		
-		cursor = await conn.execute(query, params)
-		rows = await cursor.fetchall()
-		return [dict(row) for row in rows]
+	query, params = medications_repo.user_medication_schedule_query(user_id, date)
+	return await rows_response(request, query, params, stream)
 
 
 # ===========================
@@ -731,34 +1071,36 @@ async def add_user_daily_metric(user_id: int, payload: DailyMetricCreate):
 	return result
 
 
+@app.post("/metrics/{user_id}/bulk", status_code=201)
+async def add_user_daily_metrics_bulk(user_id: int, payload: List[Dict[str, Any]]):
+	"""Add many days of metrics (DailyMetricCreate rows) for a user in one transaction"""
+	valid, errors = _validate_bulk_rows(payload, DailyMetricCreate)
+	ids, db_errors = await add_daily_metrics_bulk(user_id=user_id, metrics=[row for _, row in valid])
+	return _bulk_response(valid, ids, db_errors, errors)
+
+
 @app.get("/metrics/{user_id}")
 async def get_user_metrics(
+	request: Request,
 	user_id: int, 
 	date: Optional[str] = None,
-	limit: Optional[int] = None
+	limit: Optional[int] = None,
+	stream: bool = False
+):
+	"""Get daily metrics for a specific user; honours If-None-Match"""
+	query, params = daily_metrics_repo.user_metrics_query(user_id, date, limit)
+	return await conditional_rows_response(request, user_id, "DailyMetrics", query, params, stream)
+
+
+@app.get("/metrics/{user_id}/page")
+async def get_user_metrics_page_endpoint(
+	user_id: int,
+	cursor: Optional[str] = None,
+	page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
 ):
-	"""Get daily metrics for a specific user"""
-	async for conn in get_db_connection():
-		query = """
-			SELECT metric_id, user_id, date, steps, heart_rate, sleep_hours, 
-				   blood_pressure, mood, notes
-			FROM DailyMetrics
-			WHERE user_id = ?
-		"""
-		params = [user_id]
-		
-		if date:
-			query += " AND date = ?"
-			params.append(date)
-		
-		query += " ORDER BY date DESC"
-		
-		if limit:
-			query += f" LIMIT {limit}"
-		
-		cursor = await conn.execute(query, params)
-		rows = await cursor.fetchall()
-		return [dict(row) for row in rows]
+	"""Get daily metrics most recent day first, one page at a time; pass next_cursor back as cursor"""
+	items, next_cursor = await get_user_metrics_page(user_id=user_id, page_size=page_size, cursor=cursor)
+	return {"items": items, "next_cursor": next_cursor}
 
 
 # ===========================
@@ -779,40 +1121,101 @@ async def create_user_report(user_id: int, payload: ReportCreate):
 
 @app.get("/reports/{user_id}")
 async def get_user_reports(
+	request: Request,
 	user_id: int,
 	report_type: Optional[str] = None,
-	limit: Optional[int] = None
+	limit: Optional[int] = None,
+	stream: bool = False
+):
+	"""Get reports for a specific user; honours If-None-Match"""
+	query, params = reports_repo.user_reports_query(user_id, report_type, limit)
+	return await conditional_rows_response(request, user_id, "Reports", query, params, stream)
+
+
+@app.get("/reports/{user_id}/page")
+async def get_user_reports_page_endpoint(
+	user_id: int,
+	cursor: Optional[str] = None,
+	page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+	report_type: Optional[str] = None
 ):
-	"""Get reports for a specific user"""
-	async for conn in get_db_connection():
-		query = """
-			SELECT report_id, user_id, report_date, report_type, content
-			FROM Reports
-			WHERE user_id = ?
-		"""
-		params = [user_id]
-		
-		if report_type:
-			query += " AND report_type = ?"
-			params.append(report_type)
-		
-		query += " ORDER BY report_date DESC"
-		
-		if limit:
-			query += f" LIMIT {limit}"
-		
-		cursor = await conn.execute(query, params)
-		rows = await cursor.fetchall()
-		return [dict(row) for row in rows]
+	"""Get reports most recent first, one page at a time; pass next_cursor back as cursor"""
+	items, next_cursor = await get_user_reports_page(
+		user_id=user_id,
+		page_size=page_size,
+		cursor=cursor,
+		report_type=report_type
+	)
+	return {"items": items, "next_cursor": next_cursor}
 
 
 @app.get("/reports/{user_id}/summary")
-async def get_user_data_summary(user_id: int, date: str):
-	"""Get comprehensive data summary for a user on a specific date"""
-	data = await get_user_data_by_date(user_id=user_id, date=date)
+async def get_user_data_summary(user_id: int, date: str, debug: bool = False):
+	"""Get comprehensive data summary for a user on a specific date; debug=true adds per-section timings"""
+	data = await get_user_data_by_date(user_id=user_id, date=date, debug=debug)
 	return data
 
 
+@app.get("/reports/{user_id}/summary/range")
+async def get_user_data_summary_range(
+	user_id: int,
+	start_date: datetime.date,
+	end_date: datetime.date,
+	debug: bool = False,
+):
+	"""Get the per-day data summary for every date from start_date to end_date (inclusive)"""
+	if end_date < start_date:
+		raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+	if (end_date - start_date).days + 1 > MAX_SUMMARY_RANGE_DAYS:
+		raise HTTPException(status_code=400, detail=f"At most {MAX_SUMMARY_RANGE_DAYS} days per request")
+	return await get_user_data_by_date_range(
+		user_id=user_id,
+		start_date=start_date,
+		end_date=end_date,
+		debug=debug,
+	)
+
+
+# ===========================
+# AI CONVERSATION ENDPOINTS
+# ===========================
+
+@app.post("/chat")
+async def chat_endpoint(payload: ChatRequest, debug: bool = False):
+	"""
+	One turn with the AI health companion. The user's profile, today's conversation and
+	past summaries are the context; symptoms mentioned in the message are logged.
+	debug=true adds per-stage timings.
+	"""
+	if not payload.message.strip():
+		raise HTTPException(status_code=400, detail="message is required")
+	return await handle_chat_turn(user_id=payload.user_id, message=payload.message, debug=debug)
+
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(payload: ChatRequest, debug: bool = False):
+	"""
+	/chat with the answer streamed as server-sent events: "delta" events carry the answer
+	text as the model produces it, and a final "symptoms" event carries the extracted
+	symptoms and the whole answer once the turn is complete.
+	"""
+	if not payload.message.strip():
+		raise HTTPException(status_code=400, detail="message is required")
+	return EventStreamResponse(stream_chat_turn(user_id=payload.user_id, message=payload.message, debug=debug))
+
+
+@app.post("/summarize")
+async def summarize_endpoint(payload: SummarizeRequest):
+	"""Summarize today's conversation for a user, replacing the raw chat log with the summary"""
+	summary = await summarize_user_day(user_id=payload.user_id)
+	if summary:
+		return {
+			"message": "Summarization successful. The raw chat log has been replaced with this summary.",
+			"summary": summary
+		}
+	return {"message": "Summarization process ran, but no summary was generated (e.g., no conversation)."}
+
+
 # ===========================
 # PERSONALIZED NOTIFICATION ENDPOINTS
 # ===========================
@@ -0,0 +1,58 @@
+-- ===========================
+-- Indexes for the per-user lookups in repositories/*.py and main.py.
+-- Each index leads with the equality predicate and continues with the
+-- range / ORDER BY column so lookups are SEARCHes and no sort is needed.
+--
+-- The indexes hold only those key columns; none of them is a covering index.
+-- The list, page and by-date queries they serve return whole rows, including
+-- the free-text notes / message / content columns, so covering them would copy
+-- nearly every table into its index and double the write cost of every
+-- insert. The key columns narrow the lookup to the user's rows, already
+-- ordered. The table lookup that follows, one per returned row, is bounded
+-- by the page size or LIMIT.
+-- ===========================
+
+-- symptoms.get_user_symptoms / get_recent_symptoms
+CREATE INDEX IF NOT EXISTS idx_symptoms_user_log_date
+    ON Symptoms(user_id, log_date);
+
+-- notifications.get_user_notifications (all)
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created
+    ON Notifications(user_id, created_at);
+
+-- notifications.get_user_notifications (unread_only), get_unread_notification_count,
+-- mark_all_notifications_read
+CREATE INDEX IF NOT EXISTS idx_notifications_user_read_created
+    ON Notifications(user_id, is_read, created_at);
+
+-- alerts.get_user_alerts (active_only = False)
+CREATE INDEX IF NOT EXISTS idx_alerts_user_time
+    ON Alerts(user_id, alert_time);
+
+-- alerts.get_user_alerts (active_only), get_upcoming_alerts, get_active_alert_count
+CREATE INDEX IF NOT EXISTS idx_alerts_user_active_time
+    ON Alerts(user_id, is_active, alert_time);
+
+-- GET /medications/{user_id} and the schedule joins
+CREATE INDEX IF NOT EXISTS idx_user_medications_user_start
+    ON UserMedications(user_id, start_date);
+
+-- medications.get_user_medication_schedule_by_date, GET /medications/{user_id}/schedule
+CREATE INDEX IF NOT EXISTS idx_medication_schedule_user_med_date
+    ON MedicationSchedule(user_med_id, date, time);
+
+-- reports.get_user_reports_by_date, GET /reports/{user_id}
+CREATE INDEX IF NOT EXISTS idx_reports_user_date
+    ON Reports(user_id, report_date);
+
+-- GET /reports/{user_id}?report_type=
+CREATE INDEX IF NOT EXISTS idx_reports_user_type_date
+    ON Reports(user_id, report_type, report_date);
+
+-- disorders.get_user_disorders_by_date, GET /disorders/{user_id}
+CREATE INDEX IF NOT EXISTS idx_user_disorders_user_diagnosed
+    ON UserDisorders(user_id, diagnosed_date);
+
+-- GET /medications (ORDER BY name); Disorders.name is already UNIQUE-indexed
+CREATE INDEX IF NOT EXISTS idx_medications_name
+    ON Medications(name);
@@ -0,0 +1,181 @@
+-- ===========================
+-- Per-user data version, bumped by triggers whenever a row that feeds the
+-- user's health profile changes. Readers compare it with the version a
+-- cached rendering was built from (cache.py, profile_cache). Because the bump is
+-- done by the database, writes from any process or code path count.
+-- user_id 0 holds the version of the shared Disorders / Medications catalog.
+-- ===========================
+
+CREATE TABLE IF NOT EXISTS UserDataVersions (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+-- Users
+CREATE TRIGGER IF NOT EXISTS trg_users_insert_version
+AFTER INSERT ON Users
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_users_update_version
+AFTER UPDATE ON Users
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_users_delete_version
+AFTER DELETE ON Users
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+-- Symptoms
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_insert_version
+AFTER INSERT ON Symptoms
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_update_version
+AFTER UPDATE ON Symptoms
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_delete_version
+AFTER DELETE ON Symptoms
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+-- DailyMetrics
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_insert_version
+AFTER INSERT ON DailyMetrics
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_update_version
+AFTER UPDATE ON DailyMetrics
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_delete_version
+AFTER DELETE ON DailyMetrics
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+-- Reports
+CREATE TRIGGER IF NOT EXISTS trg_reports_insert_version
+AFTER INSERT ON Reports
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_reports_update_version
+AFTER UPDATE ON Reports
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_reports_delete_version
+AFTER DELETE ON Reports
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+-- UserDisorders
+CREATE TRIGGER IF NOT EXISTS trg_user_disorders_insert_version
+AFTER INSERT ON UserDisorders
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_user_disorders_update_version
+AFTER UPDATE ON UserDisorders
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_user_disorders_delete_version
+AFTER DELETE ON UserDisorders
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+-- UserMedications
+CREATE TRIGGER IF NOT EXISTS trg_user_medications_insert_version
+AFTER INSERT ON UserMedications
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_user_medications_update_version
+AFTER UPDATE ON UserMedications
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_user_medications_delete_version
+AFTER DELETE ON UserMedications
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (OLD.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+-- MedicationSchedule rows belong to a user through UserMedications
+CREATE TRIGGER IF NOT EXISTS trg_medication_schedule_insert_version
+AFTER INSERT ON MedicationSchedule
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version)
+        SELECT user_id, 1 FROM UserMedications WHERE user_med_id = NEW.user_med_id
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medication_schedule_update_version
+AFTER UPDATE ON MedicationSchedule
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version)
+        SELECT user_id, 1 FROM UserMedications WHERE user_med_id = NEW.user_med_id
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medication_schedule_delete_version
+AFTER DELETE ON MedicationSchedule
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version)
+        SELECT user_id, 1 FROM UserMedications WHERE user_med_id = OLD.user_med_id
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+
+-- Catalog edits change how every user's disorders / medications render
+CREATE TRIGGER IF NOT EXISTS trg_disorders_update_version
+AFTER UPDATE ON Disorders
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (0, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_disorders_delete_version
+AFTER DELETE ON Disorders
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (0, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medications_update_version
+AFTER UPDATE ON Medications
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (0, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medications_delete_version
+AFTER DELETE ON Medications
+BEGIN
+    INSERT INTO UserDataVersions (user_id, version) VALUES (0, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+END;
@@ -0,0 +1,168 @@
+-- ===========================
+-- Per-user, per-day rollup for the dashboard and health pages: symptom count,
+-- medication adherence counts, that day's metric values and notification count.
+-- Triggers keep it current inside the transaction of every write to the source
+-- tables (from any process or code path); each write adjusts only the one
+-- (user_id, day) row it touches. scripts/rebuild_daily_rollups.py recomputes
+-- it from scratch.
+-- ===========================
+
+CREATE TABLE IF NOT EXISTS DailyRollups (
+    user_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    symptom_count INTEGER NOT NULL DEFAULT 0,
+    doses_scheduled INTEGER NOT NULL DEFAULT 0,
+    doses_taken INTEGER NOT NULL DEFAULT 0,
+    doses_missed INTEGER NOT NULL DEFAULT 0,
+    notification_count INTEGER NOT NULL DEFAULT 0,
+    steps INTEGER,
+    heart_rate INTEGER,
+    sleep_hours REAL,
+    blood_pressure TEXT,
+    mood TEXT,
+    PRIMARY KEY (user_id, day)
+) WITHOUT ROWID;
+
+-- Symptoms: one per row, on the calendar day of log_date
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_insert_rollup
+AFTER INSERT ON Symptoms
+WHEN date(NEW.log_date) IS NOT NULL
+BEGIN
+    INSERT INTO DailyRollups (user_id, day, symptom_count) VALUES (NEW.user_id, date(NEW.log_date), 1)
+        ON CONFLICT(user_id, day) DO UPDATE SET symptom_count = symptom_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_update_rollup
+AFTER UPDATE OF user_id, log_date ON Symptoms
+BEGIN
+    UPDATE DailyRollups SET symptom_count = symptom_count - 1
+        WHERE user_id = OLD.user_id AND day = date(OLD.log_date);
+    INSERT INTO DailyRollups (user_id, day, symptom_count)
+        SELECT NEW.user_id, date(NEW.log_date), 1 WHERE date(NEW.log_date) IS NOT NULL
+        ON CONFLICT(user_id, day) DO UPDATE SET symptom_count = symptom_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_delete_rollup
+AFTER DELETE ON Symptoms
+BEGIN
+    UPDATE DailyRollups SET symptom_count = symptom_count - 1
+        WHERE user_id = OLD.user_id AND day = date(OLD.log_date);
+END;
+
+-- DailyMetrics: at most one row per user and day, copied as-is
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_insert_rollup
+AFTER INSERT ON DailyMetrics
+WHEN date(NEW.date) IS NOT NULL
+BEGIN
+    INSERT INTO DailyRollups (user_id, day, steps, heart_rate, sleep_hours, blood_pressure, mood)
+        VALUES (NEW.user_id, date(NEW.date), NEW.steps, NEW.heart_rate, NEW.sleep_hours, NEW.blood_pressure, NEW.mood)
+        ON CONFLICT(user_id, day) DO UPDATE SET
+            steps = excluded.steps, heart_rate = excluded.heart_rate, sleep_hours = excluded.sleep_hours,
+            blood_pressure = excluded.blood_pressure, mood = excluded.mood;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_update_rollup
+AFTER UPDATE ON DailyMetrics
+BEGIN
+    UPDATE DailyRollups SET steps = NULL, heart_rate = NULL, sleep_hours = NULL, blood_pressure = NULL, mood = NULL
+        WHERE user_id = OLD.user_id AND day = date(OLD.date);
+    INSERT INTO DailyRollups (user_id, day, steps, heart_rate, sleep_hours, blood_pressure, mood)
+        SELECT NEW.user_id, date(NEW.date), NEW.steps, NEW.heart_rate, NEW.sleep_hours, NEW.blood_pressure, NEW.mood
+        WHERE date(NEW.date) IS NOT NULL
+        ON CONFLICT(user_id, day) DO UPDATE SET
+            steps = excluded.steps, heart_rate = excluded.heart_rate, sleep_hours = excluded.sleep_hours,
+            blood_pressure = excluded.blood_pressure, mood = excluded.mood;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_delete_rollup
+AFTER DELETE ON DailyMetrics
+BEGIN
+    UPDATE DailyRollups SET steps = NULL, heart_rate = NULL, sleep_hours = NULL, blood_pressure = NULL, mood = NULL
+        WHERE user_id = OLD.user_id AND day = date(OLD.date);
+END;
+
+-- MedicationSchedule: scheduled / taken / missed doses, attributed through UserMedications
+CREATE TRIGGER IF NOT EXISTS trg_medication_schedule_insert_rollup
+AFTER INSERT ON MedicationSchedule
+BEGIN
+    INSERT INTO DailyRollups (user_id, day, doses_scheduled, doses_taken, doses_missed)
+        SELECT user_id, date(NEW.date), 1, NEW.status IS 'taken', NEW.status IS 'missed'
+        FROM UserMedications WHERE user_med_id = NEW.user_med_id AND date(NEW.date) IS NOT NULL
+        ON CONFLICT(user_id, day) DO UPDATE SET
+            doses_scheduled = doses_scheduled + 1,
+            doses_taken = doses_taken + excluded.doses_taken,
+            doses_missed = doses_missed + excluded.doses_missed;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medication_schedule_update_rollup
+AFTER UPDATE OF user_med_id, date, status ON MedicationSchedule
+BEGIN
+    UPDATE DailyRollups SET
+            doses_scheduled = doses_scheduled - 1,
+            doses_taken = doses_taken - (OLD.status IS 'taken'),
+            doses_missed = doses_missed - (OLD.status IS 'missed')
+        WHERE user_id = (SELECT user_id FROM UserMedications WHERE user_med_id = OLD.user_med_id)
+            AND day = date(OLD.date);
+    INSERT INTO DailyRollups (user_id, day, doses_scheduled, doses_taken, doses_missed)
+        SELECT user_id, date(NEW.date), 1, NEW.status IS 'taken', NEW.status IS 'missed'
+        FROM UserMedications WHERE user_med_id = NEW.user_med_id AND date(NEW.date) IS NOT NULL
+        ON CONFLICT(user_id, day) DO UPDATE SET
+            doses_scheduled = doses_scheduled + 1,
+            doses_taken = doses_taken + excluded.doses_taken,
+            doses_missed = doses_missed + excluded.doses_missed;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medication_schedule_delete_rollup
+AFTER DELETE ON MedicationSchedule
+BEGIN
+    UPDATE DailyRollups SET
+            doses_scheduled = doses_scheduled - 1,
+            doses_taken = doses_taken - (OLD.status IS 'taken'),
+            doses_missed = doses_missed - (OLD.status IS 'missed')
+        WHERE user_id = (SELECT user_id FROM UserMedications WHERE user_med_id = OLD.user_med_id)
+            AND day = date(OLD.date);
+END;
+
+-- Notifications: one per row, on the calendar day of created_at
+CREATE TRIGGER IF NOT EXISTS trg_notifications_insert_rollup
+AFTER INSERT ON Notifications
+WHEN date(NEW.created_at) IS NOT NULL
+BEGIN
+    INSERT INTO DailyRollups (user_id, day, notification_count) VALUES (NEW.user_id, date(NEW.created_at), 1)
+        ON CONFLICT(user_id, day) DO UPDATE SET notification_count = notification_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notifications_update_rollup
+AFTER UPDATE OF user_id, created_at ON Notifications
+BEGIN
+    UPDATE DailyRollups SET notification_count = notification_count - 1
+        WHERE user_id = OLD.user_id AND day = date(OLD.created_at);
+    INSERT INTO DailyRollups (user_id, day, notification_count)
+        SELECT NEW.user_id, date(NEW.created_at), 1 WHERE date(NEW.created_at) IS NOT NULL
+        ON CONFLICT(user_id, day) DO UPDATE SET notification_count = notification_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notifications_delete_rollup
+AFTER DELETE ON Notifications
+BEGIN
+    UPDATE DailyRollups SET notification_count = notification_count - 1
+        WHERE user_id = OLD.user_id AND day = date(OLD.created_at);
+END;
+
+-- Backfill from the rows written before this migration
+DELETE FROM DailyRollups;
+INSERT INTO DailyRollups (
+    user_id, day, symptom_count, doses_scheduled, doses_taken, doses_missed, notification_count,
+    steps, heart_rate, sleep_hours, blood_pressure, mood
+)
+SELECT
+    user_id, day, SUM(symptom_count), SUM(doses_scheduled), SUM(doses_taken), SUM(doses_missed), SUM(notification_count),
+    MAX(steps), MAX(heart_rate), MAX(sleep_hours), MAX(blood_pressure), MAX(mood)
+FROM (
+    SELECT user_id, date(log_date) AS day, 1 AS symptom_count, 0 AS doses_scheduled, 0 AS doses_taken, 0 AS doses_missed,
+        0 AS notification_count, NULL AS steps, NULL AS heart_rate, NULL AS sleep_hours, NULL AS blood_pressure, NULL AS mood
+    FROM Symptoms
+    UNION ALL
+    SELECT um.user_id, date(ms.date), 0, 1, ms.status IS 'taken', ms.status IS 'missed', 0, NULL, NULL, NULL, NULL, NULL
+    FROM MedicationSchedule ms JOIN UserMedications um ON ms.user_med_id = um.user_med_id
+    UNION ALL
+    SELECT user_id, date(created_at), 0, 0, 0, 0, 1, NULL, NULL, NULL, NULL, NULL
+    FROM Notifications
+    UNION ALL
+    SELECT user_id, date(date), 0, 0, 0, 0, 0, steps, heart_rate, sleep_hours, blood_pressure, mood
+    FROM DailyMetrics
+)
+WHERE day IS NOT NULL
+GROUP BY user_id, day;
@@ -0,0 +1,169 @@
+-- ===========================
+-- Running count / sum per user of the DailyMetrics values behind the Users
+-- average columns (avg_sleep_hours, avg_heart_rate, steps_per_day,
+-- avg_blood_pressure). Triggers on DailyMetrics add or subtract one row's
+-- contribution, and a trigger on this table writes the new averages back to
+-- Users, so every metric write updates the profile in O(1) inside its own
+-- transaction. Averages with no data yet leave the Users column as it was.
+-- scripts/recompute_metric_aggregates.py recomputes the totals from scratch.
+-- Blood pressure counts only "systolic/diastolic" readings such as "120/80".
+-- ===========================
+
+CREATE TABLE IF NOT EXISTS UserMetricAggregates (
+    user_id INTEGER PRIMARY KEY,
+    sleep_count INTEGER NOT NULL DEFAULT 0,
+    sleep_sum REAL NOT NULL DEFAULT 0,
+    heart_rate_count INTEGER NOT NULL DEFAULT 0,
+    heart_rate_sum INTEGER NOT NULL DEFAULT 0,
+    steps_count INTEGER NOT NULL DEFAULT 0,
+    steps_sum INTEGER NOT NULL DEFAULT 0,
+    blood_pressure_count INTEGER NOT NULL DEFAULT 0,
+    systolic_sum INTEGER NOT NULL DEFAULT 0,
+    diastolic_sum INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_insert_aggregate
+AFTER INSERT ON DailyMetrics
+BEGIN
+    INSERT INTO UserMetricAggregates (
+        user_id, sleep_count, sleep_sum, heart_rate_count, heart_rate_sum, steps_count, steps_sum,
+        blood_pressure_count, systolic_sum, diastolic_sum
+    )
+    VALUES (
+        NEW.user_id,
+        NEW.sleep_hours IS NOT NULL, COALESCE(NEW.sleep_hours, 0),
+        NEW.heart_rate IS NOT NULL, COALESCE(NEW.heart_rate, 0),
+        NEW.steps IS NOT NULL, COALESCE(NEW.steps, 0),
+        IFNULL(NEW.blood_pressure GLOB '[0-9]*/[0-9]*', 0),
+        CASE WHEN NEW.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(NEW.blood_pressure, 1, instr(NEW.blood_pressure, '/') - 1) AS INTEGER) ELSE 0 END,
+        CASE WHEN NEW.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(NEW.blood_pressure, instr(NEW.blood_pressure, '/') + 1) AS INTEGER) ELSE 0 END
+    )
+    ON CONFLICT(user_id) DO UPDATE SET
+        sleep_count = sleep_count + excluded.sleep_count,
+        sleep_sum = sleep_sum + excluded.sleep_sum,
+        heart_rate_count = heart_rate_count + excluded.heart_rate_count,
+        heart_rate_sum = heart_rate_sum + excluded.heart_rate_sum,
+        steps_count = steps_count + excluded.steps_count,
+        steps_sum = steps_sum + excluded.steps_sum,
+        blood_pressure_count = blood_pressure_count + excluded.blood_pressure_count,
+        systolic_sum = systolic_sum + excluded.systolic_sum,
+        diastolic_sum = diastolic_sum + excluded.diastolic_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_update_aggregate
+AFTER UPDATE OF user_id, sleep_hours, heart_rate, steps, blood_pressure ON DailyMetrics
+BEGIN
+    UPDATE UserMetricAggregates SET
+        sleep_count = sleep_count - (OLD.sleep_hours IS NOT NULL),
+        sleep_sum = sleep_sum - COALESCE(OLD.sleep_hours, 0),
+        heart_rate_count = heart_rate_count - (OLD.heart_rate IS NOT NULL),
+        heart_rate_sum = heart_rate_sum - COALESCE(OLD.heart_rate, 0),
+        steps_count = steps_count - (OLD.steps IS NOT NULL),
+        steps_sum = steps_sum - COALESCE(OLD.steps, 0),
+        blood_pressure_count = blood_pressure_count - IFNULL(OLD.blood_pressure GLOB '[0-9]*/[0-9]*', 0),
+        systolic_sum = systolic_sum - CASE WHEN OLD.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(OLD.blood_pressure, 1, instr(OLD.blood_pressure, '/') - 1) AS INTEGER) ELSE 0 END,
+        diastolic_sum = diastolic_sum - CASE WHEN OLD.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(OLD.blood_pressure, instr(OLD.blood_pressure, '/') + 1) AS INTEGER) ELSE 0 END
+    WHERE user_id = OLD.user_id;
+    INSERT INTO UserMetricAggregates (
+        user_id, sleep_count, sleep_sum, heart_rate_count, heart_rate_sum, steps_count, steps_sum,
+        blood_pressure_count, systolic_sum, diastolic_sum
+    )
+    VALUES (
+        NEW.user_id,
+        NEW.sleep_hours IS NOT NULL, COALESCE(NEW.sleep_hours, 0),
+        NEW.heart_rate IS NOT NULL, COALESCE(NEW.heart_rate, 0),
+        NEW.steps IS NOT NULL, COALESCE(NEW.steps, 0),
+        IFNULL(NEW.blood_pressure GLOB '[0-9]*/[0-9]*', 0),
+        CASE WHEN NEW.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(NEW.blood_pressure, 1, instr(NEW.blood_pressure, '/') - 1) AS INTEGER) ELSE 0 END,
+        CASE WHEN NEW.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(NEW.blood_pressure, instr(NEW.blood_pressure, '/') + 1) AS INTEGER) ELSE 0 END
+    )
+    ON CONFLICT(user_id) DO UPDATE SET
+        sleep_count = sleep_count + excluded.sleep_count,
+        sleep_sum = sleep_sum + excluded.sleep_sum,
+        heart_rate_count = heart_rate_count + excluded.heart_rate_count,
+        heart_rate_sum = heart_rate_sum + excluded.heart_rate_sum,
+        steps_count = steps_count + excluded.steps_count,
+        steps_sum = steps_sum + excluded.steps_sum,
+        blood_pressure_count = blood_pressure_count + excluded.blood_pressure_count,
+        systolic_sum = systolic_sum + excluded.systolic_sum,
+        diastolic_sum = diastolic_sum + excluded.diastolic_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_delete_aggregate
+AFTER DELETE ON DailyMetrics
+BEGIN
+    UPDATE UserMetricAggregates SET
+        sleep_count = sleep_count - (OLD.sleep_hours IS NOT NULL),
+        sleep_sum = sleep_sum - COALESCE(OLD.sleep_hours, 0),
+        heart_rate_count = heart_rate_count - (OLD.heart_rate IS NOT NULL),
+        heart_rate_sum = heart_rate_sum - COALESCE(OLD.heart_rate, 0),
+        steps_count = steps_count - (OLD.steps IS NOT NULL),
+        steps_sum = steps_sum - COALESCE(OLD.steps, 0),
+        blood_pressure_count = blood_pressure_count - IFNULL(OLD.blood_pressure GLOB '[0-9]*/[0-9]*', 0),
+        systolic_sum = systolic_sum - CASE WHEN OLD.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(OLD.blood_pressure, 1, instr(OLD.blood_pressure, '/') - 1) AS INTEGER) ELSE 0 END,
+        diastolic_sum = diastolic_sum - CASE WHEN OLD.blood_pressure GLOB '[0-9]*/[0-9]*'
+            THEN CAST(substr(OLD.blood_pressure, instr(OLD.blood_pressure, '/') + 1) AS INTEGER) ELSE 0 END
+    WHERE user_id = OLD.user_id;
+END;
+
+-- Write the averages back to Users whenever a user's totals change
+CREATE TRIGGER IF NOT EXISTS trg_user_metric_aggregates_insert_users
+AFTER INSERT ON UserMetricAggregates
+BEGIN
+    UPDATE Users SET
+        avg_sleep_hours = CASE WHEN NEW.sleep_count > 0
+            THEN ROUND(NEW.sleep_sum / NEW.sleep_count, 2) ELSE avg_sleep_hours END,
+        avg_heart_rate = CASE WHEN NEW.heart_rate_count > 0
+            THEN CAST(ROUND(1.0 * NEW.heart_rate_sum / NEW.heart_rate_count) AS INTEGER) ELSE avg_heart_rate END,
+        steps_per_day = CASE WHEN NEW.steps_count > 0
+            THEN CAST(ROUND(1.0 * NEW.steps_sum / NEW.steps_count) AS INTEGER) ELSE steps_per_day END,
+        avg_blood_pressure = CASE WHEN NEW.blood_pressure_count > 0
+            THEN printf('%d/%d',
+                CAST(ROUND(1.0 * NEW.systolic_sum / NEW.blood_pressure_count) AS INTEGER),
+                CAST(ROUND(1.0 * NEW.diastolic_sum / NEW.blood_pressure_count) AS INTEGER))
+            ELSE avg_blood_pressure END
+    WHERE user_id = NEW.user_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_user_metric_aggregates_update_users
+AFTER UPDATE ON UserMetricAggregates
+BEGIN
+    UPDATE Users SET
+        avg_sleep_hours = CASE WHEN NEW.sleep_count > 0
+            THEN ROUND(NEW.sleep_sum / NEW.sleep_count, 2) ELSE avg_sleep_hours END,
+        avg_heart_rate = CASE WHEN NEW.heart_rate_count > 0
+            THEN CAST(ROUND(1.0 * NEW.heart_rate_sum / NEW.heart_rate_count) AS INTEGER) ELSE avg_heart_rate END,
+        steps_per_day = CASE WHEN NEW.steps_count > 0
+            THEN CAST(ROUND(1.0 * NEW.steps_sum / NEW.steps_count) AS INTEGER) ELSE steps_per_day END,
+        avg_blood_pressure = CASE WHEN NEW.blood_pressure_count > 0
+            THEN printf('%d/%d',
+                CAST(ROUND(1.0 * NEW.systolic_sum / NEW.blood_pressure_count) AS INTEGER),
+                CAST(ROUND(1.0 * NEW.diastolic_sum / NEW.blood_pressure_count) AS INTEGER))
+            ELSE avg_blood_pressure END
+    WHERE user_id = NEW.user_id;
+END;
+
+-- Backfill from the metrics written before this migration (the insert trigger above updates Users)
+DELETE FROM UserMetricAggregates;
+INSERT INTO UserMetricAggregates (
+    user_id, sleep_count, sleep_sum, heart_rate_count, heart_rate_sum, steps_count, steps_sum,
+    blood_pressure_count, systolic_sum, diastolic_sum
+)
+SELECT
+    user_id,
+    COUNT(sleep_hours), COALESCE(SUM(sleep_hours), 0),
+    COUNT(heart_rate), COALESCE(SUM(heart_rate), 0),
+    COUNT(steps), COALESCE(SUM(steps), 0),
+    SUM(IFNULL(blood_pressure GLOB '[0-9]*/[0-9]*', 0)),
+    SUM(CASE WHEN blood_pressure GLOB '[0-9]*/[0-9]*'
+        THEN CAST(substr(blood_pressure, 1, instr(blood_pressure, '/') - 1) AS INTEGER) ELSE 0 END),
+    SUM(CASE WHEN blood_pressure GLOB '[0-9]*/[0-9]*'
+        THEN CAST(substr(blood_pressure, instr(blood_pressure, '/') + 1) AS INTEGER) ELSE 0 END)
+FROM DailyMetrics
+GROUP BY user_id;
@@ -0,0 +1,76 @@
+-- ===========================
+-- Per-user unread-notification and active-alert counts, so the polled
+-- /notifications/{user_id}/unread-count and /alerts/{user_id}/active-count
+-- endpoints are a primary-key lookup instead of a COUNT(*) over the user's
+-- rows. Triggers keep them exact on every insert, update (mark read,
+-- mark all read, deactivate, edits) and delete. A row counts exactly when
+-- the old COUNT(*) predicates (is_read = FALSE, is_active = TRUE) match it.
+-- scripts/check_user_counters.py reports and repairs drift.
+-- ===========================
+
+CREATE TABLE IF NOT EXISTS UserCounters (
+    user_id INTEGER PRIMARY KEY,
+    unread_notifications INTEGER NOT NULL DEFAULT 0,
+    active_alerts INTEGER NOT NULL DEFAULT 0
+);
+
+-- Notifications
+CREATE TRIGGER IF NOT EXISTS trg_notifications_insert_counter
+AFTER INSERT ON Notifications
+WHEN NEW.is_read = FALSE
+BEGIN
+    INSERT INTO UserCounters (user_id, unread_notifications) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET unread_notifications = unread_notifications + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notifications_update_counter
+AFTER UPDATE OF user_id, is_read ON Notifications
+WHEN OLD.user_id IS NOT NEW.user_id OR IFNULL(OLD.is_read = FALSE, 0) != IFNULL(NEW.is_read = FALSE, 0)
+BEGIN
+    UPDATE UserCounters SET unread_notifications = unread_notifications - 1
+        WHERE user_id = OLD.user_id AND OLD.is_read = FALSE;
+    INSERT INTO UserCounters (user_id, unread_notifications)
+        SELECT NEW.user_id, 1 WHERE NEW.is_read = FALSE
+        ON CONFLICT(user_id) DO UPDATE SET unread_notifications = unread_notifications + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notifications_delete_counter
+AFTER DELETE ON Notifications
+WHEN OLD.is_read = FALSE
+BEGIN
+    UPDATE UserCounters SET unread_notifications = unread_notifications - 1 WHERE user_id = OLD.user_id;
+END;
+
+-- Alerts
+CREATE TRIGGER IF NOT EXISTS trg_alerts_insert_counter
+AFTER INSERT ON Alerts
+WHEN NEW.is_active = TRUE
+BEGIN
+    INSERT INTO UserCounters (user_id, active_alerts) VALUES (NEW.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET active_alerts = active_alerts + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_update_counter
+AFTER UPDATE OF user_id, is_active ON Alerts
+WHEN OLD.user_id IS NOT NEW.user_id OR IFNULL(OLD.is_active = TRUE, 0) != IFNULL(NEW.is_active = TRUE, 0)
+BEGIN
+    UPDATE UserCounters SET active_alerts = active_alerts - 1
+        WHERE user_id = OLD.user_id AND OLD.is_active = TRUE;
+    INSERT INTO UserCounters (user_id, active_alerts)
+        SELECT NEW.user_id, 1 WHERE NEW.is_active = TRUE
+        ON CONFLICT(user_id) DO UPDATE SET active_alerts = active_alerts + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_delete_counter
+AFTER DELETE ON Alerts
+WHEN OLD.is_active = TRUE
+BEGIN
+    UPDATE UserCounters SET active_alerts = active_alerts - 1 WHERE user_id = OLD.user_id;
+END;
+
+-- Backfill from the rows written before this migration
+DELETE FROM UserCounters;
+INSERT INTO UserCounters (user_id, unread_notifications, active_alerts)
+SELECT user_id, SUM(unread), SUM(active)
+FROM (
+    SELECT user_id, IFNULL(is_read = FALSE, 0) AS unread, 0 AS active FROM Notifications
+    UNION ALL
+    SELECT user_id, 0, IFNULL(is_active = TRUE, 0) FROM Alerts
+)
+GROUP BY user_id;
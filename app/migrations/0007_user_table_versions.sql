@@ -0,0 +1,155 @@
+-- ===========================
+-- Per-user, per-table version stamps behind the ETag / If-None-Match
+-- support of the list and profile endpoints (conditional.py). Any insert,
+-- update or delete of a user's row in one of these tables bumps that
+-- (user_id, table_name) stamp, so a poll can compare stamps and answer
+-- 304 Not Modified without running the list query. Unlike
+-- UserDataVersions (one version for everything in the profile), a new
+-- metric does not invalidate the notification list. A version of 0 means
+-- no write since this migration.
+-- ===========================
+
+CREATE TABLE IF NOT EXISTS UserTableVersions (
+    user_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, table_name)
+) WITHOUT ROWID;
+
+-- Users
+CREATE TRIGGER IF NOT EXISTS trg_users_insert_table_version
+AFTER INSERT ON Users
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Users', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_users_update_table_version
+AFTER UPDATE ON Users
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Users', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+    INSERT INTO UserTableVersions (user_id, table_name, version)
+        SELECT OLD.user_id, 'Users', 1 WHERE OLD.user_id IS NOT NEW.user_id
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_users_delete_table_version
+AFTER DELETE ON Users
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (OLD.user_id, 'Users', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+
+-- Symptoms
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_insert_table_version
+AFTER INSERT ON Symptoms
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Symptoms', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_update_table_version
+AFTER UPDATE ON Symptoms
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Symptoms', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+    INSERT INTO UserTableVersions (user_id, table_name, version)
+        SELECT OLD.user_id, 'Symptoms', 1 WHERE OLD.user_id IS NOT NEW.user_id
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_symptoms_delete_table_version
+AFTER DELETE ON Symptoms
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (OLD.user_id, 'Symptoms', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+
+-- DailyMetrics
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_insert_table_version
+AFTER INSERT ON DailyMetrics
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'DailyMetrics', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_update_table_version
+AFTER UPDATE ON DailyMetrics
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'DailyMetrics', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+    INSERT INTO UserTableVersions (user_id, table_name, version)
+        SELECT OLD.user_id, 'DailyMetrics', 1 WHERE OLD.user_id IS NOT NEW.user_id
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_daily_metrics_delete_table_version
+AFTER DELETE ON DailyMetrics
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (OLD.user_id, 'DailyMetrics', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+
+-- Notifications
+CREATE TRIGGER IF NOT EXISTS trg_notifications_insert_table_version
+AFTER INSERT ON Notifications
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Notifications', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notifications_update_table_version
+AFTER UPDATE ON Notifications
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Notifications', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+    INSERT INTO UserTableVersions (user_id, table_name, version)
+        SELECT OLD.user_id, 'Notifications', 1 WHERE OLD.user_id IS NOT NEW.user_id
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_notifications_delete_table_version
+AFTER DELETE ON Notifications
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (OLD.user_id, 'Notifications', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+
+-- Alerts
+CREATE TRIGGER IF NOT EXISTS trg_alerts_insert_table_version
+AFTER INSERT ON Alerts
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Alerts', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_update_table_version
+AFTER UPDATE ON Alerts
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Alerts', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+    INSERT INTO UserTableVersions (user_id, table_name, version)
+        SELECT OLD.user_id, 'Alerts', 1 WHERE OLD.user_id IS NOT NEW.user_id
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_alerts_delete_table_version
+AFTER DELETE ON Alerts
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (OLD.user_id, 'Alerts', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+
+-- Reports
+CREATE TRIGGER IF NOT EXISTS trg_reports_insert_table_version
+AFTER INSERT ON Reports
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Reports', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_reports_update_table_version
+AFTER UPDATE ON Reports
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (NEW.user_id, 'Reports', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+    INSERT INTO UserTableVersions (user_id, table_name, version)
+        SELECT OLD.user_id, 'Reports', 1 WHERE OLD.user_id IS NOT NEW.user_id
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_reports_delete_table_version
+AFTER DELETE ON Reports
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (OLD.user_id, 'Reports', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
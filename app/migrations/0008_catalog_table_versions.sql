@@ -0,0 +1,47 @@
+-- ===========================
+-- Version stamps for the shared Disorders / Medications catalog, kept in
+-- UserTableVersions under user_id 0 (the catalog key, as in
+-- UserDataVersions). Unlike the UserDataVersions catalog version these also
+-- move on inserts, so the in-process catalog cache (cache.py) can tell when
+-- another process added, changed or removed an entry and reload.
+-- ===========================
+
+-- Disorders
+CREATE TRIGGER IF NOT EXISTS trg_disorders_insert_table_version
+AFTER INSERT ON Disorders
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (0, 'Disorders', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_disorders_update_table_version
+AFTER UPDATE ON Disorders
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (0, 'Disorders', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_disorders_delete_table_version
+AFTER DELETE ON Disorders
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (0, 'Disorders', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+
+-- Medications
+CREATE TRIGGER IF NOT EXISTS trg_medications_insert_table_version
+AFTER INSERT ON Medications
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (0, 'Medications', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medications_update_table_version
+AFTER UPDATE ON Medications
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (0, 'Medications', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medications_delete_table_version
+AFTER DELETE ON Medications
+BEGIN
+    INSERT INTO UserTableVersions (user_id, table_name, version) VALUES (0, 'Medications', 1)
+        ON CONFLICT(user_id, table_name) DO UPDATE SET version = version + 1;
+END;
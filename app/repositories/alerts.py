@@ -1,6 +1,13 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import aiosqlite
 
+from repositories.pagination import decode_cursor, split_page
+from repositories.records import fetch_dicts
+
+
+# Trigger-maintained, see UserCounters
+ACTIVE_ALERT_COUNT_QUERY = "SELECT active_alerts FROM UserCounters WHERE user_id = ?"
+
 
 async def create_alert(
 	conn: aiosqlite.Connection,
@@ -23,20 +30,19 @@ async def create_alert(
 	return dict(row)
 
 
-async def get_user_alerts(
-	conn: aiosqlite.Connection,
+def user_alerts_query(
 	user_id: int,
 	active_only: bool = True,
 	limit: Optional[int] = None,
-) -> List[Dict[str, Any]]:
-	"""Get alerts for a specific user"""
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's alert list"""
 	query = """
 		SELECT alert_id, user_id, alert_type, title, message, alert_time, is_active, created_at
 		FROM Alerts
 		WHERE user_id = ?
 	"""
 	
-	params = [user_id]
+	params: List[Any] = [user_id]
 	
 	if active_only:
 		query += " AND is_active = TRUE"
@@ -44,32 +50,84 @@ async def get_user_alerts(
 	query += " ORDER BY alert_time ASC"
 	
 	if limit:
-		query += f" LIMIT {limit}"
+		query += " LIMIT ?"
+		params.append(limit)
 	
-	cursor = await conn.execute(query, params)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+	return query, params
 
 
-async def get_upcoming_alerts(
+async def get_user_alerts(
 	conn: aiosqlite.Connection,
 	user_id: int,
-	hours_ahead: int = 24,
+	active_only: bool = True,
+	limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-	"""Get upcoming alerts for a user within specified hours"""
-	cursor = await conn.execute(
-		"""
+	"""Get alerts for a specific user"""
+	query, params = user_alerts_query(user_id, active_only, limit)
+	return await fetch_dicts(conn, query, params)
+
+
+def user_alerts_page_query(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	active_only: bool = True,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for one page of a user's alerts (page_size + 1 rows)"""
+	query = """
+		SELECT alert_id, user_id, alert_type, title, message, alert_time, is_active, created_at
+		FROM Alerts
+		WHERE user_id = ?
+	"""
+	params: List[Any] = [user_id]
+	
+	if active_only:
+		query += " AND is_active = TRUE"
+	
+	if cursor:
+		query += " AND (alert_time, alert_id) > (?, ?)"
+		params.extend(decode_cursor(cursor))
+	
+	query += " ORDER BY alert_time ASC, alert_id ASC LIMIT ?"
+	params.append(page_size + 1)
+	
+	return query, params
+
+
+async def get_user_alerts_page(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	active_only: bool = True,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	"""Get one page of a user's alerts, soonest first, seeking past `cursor`"""
+	query, params = user_alerts_page_query(user_id, page_size, cursor, active_only)
+	rows = await fetch_dicts(conn, query, params)
+	return split_page(rows, page_size, "alert_time", "alert_id")
+
+
+def upcoming_alerts_query(user_id: int, hours_ahead: int = 24) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's active alerts due within `hours_ahead` hours"""
+	query = """
 		SELECT alert_id, user_id, alert_type, title, message, alert_time, is_active, created_at
 		FROM Alerts
 		WHERE user_id = ? 
 		AND is_active = TRUE 
 		AND alert_time BETWEEN datetime('now') AND datetime('now', '+{} hours')
 		ORDER BY alert_time ASC
-		""".format(hours_ahead),
-		(user_id,),
-	)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+	""".format(int(hours_ahead))
+	return query, [user_id]
+
+
+async def get_upcoming_alerts(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	hours_ahead: int = 24,
+) -> List[Dict[str, Any]]:
+	"""Get upcoming alerts for a user within specified hours"""
+	query, params = upcoming_alerts_query(user_id, hours_ahead)
+	return await fetch_dicts(conn, query, params)
 
 
 async def update_alert(
@@ -141,14 +199,7 @@ async def get_active_alert_count(
 	conn: aiosqlite.Connection,
 	user_id: int,
 ) -> int:
-	"""Get count of active alerts for a user"""
-	cursor = await conn.execute(
-		"""
-		SELECT COUNT(*) as count
-		FROM Alerts
-		WHERE user_id = ? AND is_active = TRUE
-		""",
-		(user_id,),
-	)
+	"""Get count of active alerts for a user (trigger-maintained, see UserCounters)"""
+	cursor = await conn.execute(ACTIVE_ALERT_COUNT_QUERY, (user_id,))
 	row = await cursor.fetchone()
-	return row['count'] if row else 0
+	return row[0] if row else 0
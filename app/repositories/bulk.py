@@ -0,0 +1,55 @@
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import aiosqlite
+
+
+async def insert_many(
+	conn: aiosqlite.Connection,
+	sql: str,
+	rows: Sequence[Iterable],
+) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	"""
+	Insert rows with a single executemany.
+	Returns (ids, errors): ids[i] is the new rowid of rows[i], or None if that row was
+	rejected, and errors maps the index of each rejected row to the constraint message.
+	If any row violates a constraint the batch is retried row by row so the valid rows
+	are still inserted.
+	"""
+	if not rows:
+		return [], {}
+
+	await conn.execute("SAVEPOINT bulk_insert")
+	try:
+		await conn.executemany(sql, rows)
+	except sqlite3.IntegrityError:
+		await conn.execute("ROLLBACK TO bulk_insert")
+		await conn.execute("RELEASE bulk_insert")
+		return await _insert_one_by_one(conn, sql, rows)
+
+	cursor = await conn.execute("SELECT last_insert_rowid()")
+	last_id = (await cursor.fetchone())[0]
+	await conn.execute("RELEASE bulk_insert")
+	# The rows went in back to back inside one write transaction, so their ids are consecutive
+	first_id = last_id - len(rows) + 1
+	return list(range(first_id, last_id + 1)), {}
+
+
+async def _insert_one_by_one(
+	conn: aiosqlite.Connection,
+	sql: str,
+	rows: Sequence[Iterable],
+) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	ids: List[Optional[int]] = []
+	errors: Dict[int, str] = {}
+	for index, row in enumerate(rows):
+		await conn.execute("SAVEPOINT bulk_row")
+		try:
+			cursor = await conn.execute(sql, row)
+		except sqlite3.IntegrityError as e:
+			await conn.execute("ROLLBACK TO bulk_row")
+			ids.append(None)
+			errors[index] = str(e)
+		else:
+			ids.append(cursor.lastrowid)
+		await conn.execute("RELEASE bulk_row")
+	return ids, errors
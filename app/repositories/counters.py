@@ -0,0 +1,59 @@
+from typing import Any, Dict, List
+import aiosqlite
+
+
+# Recount every user from the base tables and compare with UserCounters.
+# Same predicates as the triggers in migrations/0006_user_counters.sql.
+COUNTER_DRIFT_QUERY = """
+	WITH actual AS (
+		SELECT user_id, SUM(unread) AS unread_notifications, SUM(active) AS active_alerts
+		FROM (
+			SELECT user_id, IFNULL(is_read = FALSE, 0) AS unread, 0 AS active FROM Notifications
+			UNION ALL
+			SELECT user_id, 0, IFNULL(is_active = TRUE, 0) FROM Alerts
+		)
+		GROUP BY user_id
+	),
+	counted_users AS (
+		SELECT user_id FROM actual
+		UNION
+		SELECT user_id FROM UserCounters
+	)
+	SELECT
+		k.user_id,
+		COALESCE(c.unread_notifications, 0) AS stored_unread_notifications,
+		COALESCE(a.unread_notifications, 0) AS actual_unread_notifications,
+		COALESCE(c.active_alerts, 0) AS stored_active_alerts,
+		COALESCE(a.active_alerts, 0) AS actual_active_alerts
+	FROM counted_users k
+	LEFT JOIN UserCounters c ON c.user_id = k.user_id
+	LEFT JOIN actual a ON a.user_id = k.user_id
+	WHERE COALESCE(c.unread_notifications, 0) != COALESCE(a.unread_notifications, 0)
+		OR COALESCE(c.active_alerts, 0) != COALESCE(a.active_alerts, 0)
+	ORDER BY k.user_id
+"""
+
+
+async def find_counter_drift(conn: aiosqlite.Connection) -> List[Dict[str, Any]]:
+	"""Users whose stored counters differ from a recount of their notifications and alerts"""
+	cursor = await conn.execute(COUNTER_DRIFT_QUERY)
+	return [dict(row) for row in await cursor.fetchall()]
+
+
+async def repair_counter_drift(conn: aiosqlite.Connection) -> List[Dict[str, Any]]:
+	"""
+	Overwrite drifted counters with the recounted values and return the rows that were fixed.
+	Run it inside a write transaction so no write lands between the recount and the fix.
+	"""
+	drift = await find_counter_drift(conn)
+	await conn.executemany(
+		"""
+		INSERT INTO UserCounters (user_id, unread_notifications, active_alerts)
+		VALUES (?, ?, ?)
+		ON CONFLICT(user_id) DO UPDATE SET
+			unread_notifications = excluded.unread_notifications,
+			active_alerts = excluded.active_alerts
+		""",
+		[(d["user_id"], d["actual_unread_notifications"], d["actual_active_alerts"]) for d in drift],
+	)
+	return drift
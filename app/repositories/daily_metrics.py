@@ -1,6 +1,27 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import aiosqlite
 
+from repositories.bulk import insert_many
+from repositories.pagination import decode_cursor, split_page
+from repositories.records import fetch_dicts
+
+
+METRIC_COLUMNS = "metric_id, user_id, date, steps, heart_rate, sleep_hours, blood_pressure, mood, notes"
+
+METRICS_BY_DATE_QUERY = f"""
+	SELECT {METRIC_COLUMNS}
+	FROM DailyMetrics
+	WHERE user_id = ? AND date = ?
+"""
+
+LATEST_METRICS_QUERY = f"""
+	SELECT {METRIC_COLUMNS}
+	FROM DailyMetrics
+	WHERE user_id = ?
+	ORDER BY date DESC
+	LIMIT ?
+"""
+
 
 async def create_daily_metric(
 	conn: aiosqlite.Connection,
@@ -26,17 +47,99 @@ async def create_daily_metric(
 	return dict(row)
 
 
-async def get_user_metrics_by_date(conn: aiosqlite.Connection, user_id: int, date: str) -> List[Dict[str, Any]]:
-	cursor = await conn.execute(
+async def create_daily_metrics_bulk(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	metrics: List[Dict[str, Any]],
+) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	"""Insert many daily metric rows for a user; returns (metric_ids, errors by index)"""
+	return await insert_many(
+		conn,
 		"""
-		SELECT metric_id, user_id, date, steps, heart_rate, sleep_hours, blood_pressure, mood, notes
-		FROM DailyMetrics
-		WHERE user_id = ? AND date = ?
+		INSERT INTO DailyMetrics (
+			user_id, date, steps, heart_rate, sleep_hours, blood_pressure, mood, notes
+		) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
 		""",
-		(user_id, date),
+		[
+			(
+				user_id, m["date"], m.get("steps"), m.get("heart_rate"), m.get("sleep_hours"),
+				m.get("blood_pressure"), m.get("mood"), m.get("notes"),
+			)
+			for m in metrics
+		],
 	)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+
+
+async def get_user_metrics_by_date(conn: aiosqlite.Connection, user_id: int, date: str) -> List[Dict[str, Any]]:
+	return await fetch_dicts(conn, METRICS_BY_DATE_QUERY, (user_id, date))
+
+
+async def get_latest_user_metrics(conn: aiosqlite.Connection, user_id: int, limit: int) -> List[Dict[str, Any]]:
+	"""Get the user's most recent `limit` days of metrics, newest first"""
+	return await fetch_dicts(conn, LATEST_METRICS_QUERY, (user_id, limit))
+
+
+def user_metrics_query(
+	user_id: int,
+	date: Optional[str] = None,
+	limit: Optional[int] = None,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's daily metrics, most recent day first"""
+	query = f"""
+		SELECT {METRIC_COLUMNS}
+		FROM DailyMetrics
+		WHERE user_id = ?
+	"""
+	params: List[Any] = [user_id]
+
+	if date:
+		query += " AND date = ?"
+		params.append(date)
+
+	query += " ORDER BY date DESC"
+
+	if limit:
+		query += " LIMIT ?"
+		params.append(limit)
+
+	return query, params
+
+
+def user_metrics_page_query(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for one page of a user's daily metrics (page_size + 1 rows)"""
+	query = f"""
+		SELECT {METRIC_COLUMNS}
+		FROM DailyMetrics
+		WHERE user_id = ?
+	"""
+	params: List[Any] = [user_id]
+
+	if cursor:
+		query += " AND (date, metric_id) < (?, ?)"
+		params.extend(decode_cursor(cursor))
+
+	query += " ORDER BY date DESC, metric_id DESC LIMIT ?"
+	params.append(page_size + 1)
+
+	return query, params
+
+
+async def get_user_metrics_page(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	"""Get one page of a user's daily metrics, most recent day first, seeking past `cursor`"""
+	query, params = user_metrics_page_query(user_id, page_size, cursor)
+	rows = await fetch_dicts(conn, query, params)
+	return split_page(rows, page_size, "date", "metric_id")
+
+
 async def save_user_tokens(
     conn: aiosqlite.Connection,
     user_id: int,
@@ -54,5 +157,4 @@ async def save_user_tokens(
         (user_id, access_token, refresh_token, expiry),
     )
     row = await cursor.fetchone()
-    await conn.commit()
     return dict(row)
@@ -0,0 +1,36 @@
+from typing import Tuple
+import aiosqlite
+
+
+# UserDataVersions row that tracks the shared Disorders / Medications catalog
+CATALOG_VERSION_KEY = 0
+
+USER_TABLE_VERSION_QUERY = "SELECT version FROM UserTableVersions WHERE user_id = ? AND table_name = ?"
+
+
+async def get_user_data_version(conn: aiosqlite.Connection, user_id: int) -> Tuple[int, int]:
+	"""
+	Current (user, catalog) data version. Both are bumped by the triggers in
+	migrations/0003_user_data_versions.sql, so any change to what the user's
+	profile is built from yields a different value.
+	"""
+	cursor = await conn.execute(
+		"""
+		SELECT
+			COALESCE((SELECT version FROM UserDataVersions WHERE user_id = ?), 0),
+			COALESCE((SELECT version FROM UserDataVersions WHERE user_id = ?), 0)
+		""",
+		(user_id, CATALOG_VERSION_KEY),
+	)
+	row = await cursor.fetchone()
+	return row[0], row[1]
+
+
+async def get_user_table_version(conn: aiosqlite.Connection, user_id: int, table: str) -> int:
+	"""
+	Version stamp of the user's rows in `table`, bumped by the triggers in
+	migrations/0007_user_table_versions.sql on every insert, update and delete.
+	"""
+	cursor = await conn.execute(USER_TABLE_VERSION_QUERY, (user_id, table))
+	row = await cursor.fetchone()
+	return row[0] if row else 0
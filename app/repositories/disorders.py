@@ -1,6 +1,28 @@
 from typing import Optional, Dict, Any, List
 import aiosqlite
 
+from repositories.records import fetch_dicts
+
+
+_USER_DISORDERS_SELECT = """
+	SELECT 
+		ud.user_disorder_id, ud.user_id, ud.disorder_id, ud.diagnosed_date, ud.resolved_date,
+		d.name as disorder_name, d.description
+	FROM UserDisorders ud
+	JOIN Disorders d ON ud.disorder_id = d.disorder_id
+"""
+
+USER_DISORDERS_QUERY = _USER_DISORDERS_SELECT + """
+	WHERE ud.user_id = ?
+	ORDER BY ud.diagnosed_date DESC
+"""
+
+# Disorders diagnosed or resolved on a given day
+USER_DISORDERS_BY_DATE_QUERY = _USER_DISORDERS_SELECT + """
+	WHERE ud.user_id = ? AND (ud.diagnosed_date = ? OR ud.resolved_date = ?)
+	ORDER BY ud.diagnosed_date DESC
+"""
+
 
 async def create_disorder(conn: aiosqlite.Connection, name: str, description: Optional[str]) -> Dict[str, Any]:
 	cursor = await conn.execute(
@@ -15,6 +37,10 @@ async def create_disorder(conn: aiosqlite.Connection, name: str, description: Op
 	return dict(row)
 
 
+async def get_all_disorders(conn: aiosqlite.Connection) -> List[Dict[str, Any]]:
+	return await fetch_dicts(conn, "SELECT disorder_id, name, description FROM Disorders ORDER BY name")
+
+
 async def create_user_disorder(
 	conn: aiosqlite.Connection,
 	user_id: int,
@@ -35,17 +61,4 @@ async def create_user_disorder(
 
 
 async def get_user_disorders_by_date(conn: aiosqlite.Connection, user_id: int, date: str) -> List[Dict[str, Any]]:
-	cursor = await conn.execute(
-		"""
-		SELECT 
-			ud.user_disorder_id, ud.user_id, ud.disorder_id, ud.diagnosed_date, ud.resolved_date,
-			d.name as disorder_name, d.description
-		FROM UserDisorders ud
-		JOIN Disorders d ON ud.disorder_id = d.disorder_id
-		WHERE ud.user_id = ? AND (ud.diagnosed_date = ? OR ud.resolved_date = ?)
-		ORDER BY ud.diagnosed_date DESC
-		""",
-		(user_id, date, date),
-	)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+	return await fetch_dicts(conn, USER_DISORDERS_BY_DATE_QUERY, (user_id, date, date))
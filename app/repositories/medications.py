@@ -1,6 +1,47 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import aiosqlite
 
+from repositories.bulk import insert_many
+from repositories.records import fetch_dicts
+
+
+USER_MEDICATIONS_QUERY = """
+	SELECT 
+		um.user_med_id, um.user_id, um.medication_id, um.start_date, um.end_date, um.frequency,
+		m.name as medication_name, m.dosage, m.description
+	FROM UserMedications um
+	JOIN Medications m ON um.medication_id = m.medication_id
+	WHERE um.user_id = ?
+	ORDER BY um.start_date DESC
+"""
+
+_SCHEDULE_SELECT = """
+	SELECT 
+		ms.schedule_id, ms.user_med_id, ms.date, ms.time, ms.status,
+		m.name as medication_name, m.dosage, m.description,
+		um.frequency
+	FROM MedicationSchedule ms
+	JOIN UserMedications um ON ms.user_med_id = um.user_med_id
+	JOIN Medications m ON um.medication_id = m.medication_id
+	WHERE um.user_id = ?
+"""
+
+# One day's doses in the order they are due
+MEDICATION_SCHEDULE_BY_DATE_QUERY = _SCHEDULE_SELECT + " AND ms.date = ? ORDER BY ms.time"
+
+
+def user_medication_schedule_query(user_id: int, date: Optional[str] = None) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's medication schedule, latest first"""
+	query = _SCHEDULE_SELECT
+	params: List[Any] = [user_id]
+	
+	if date:
+		query += " AND ms.date = ?"
+		params.append(date)
+	
+	query += " ORDER BY ms.date DESC, ms.time DESC"
+	return query, params
+
 
 async def create_medication(conn: aiosqlite.Connection, name: str, dosage: Optional[str], description: Optional[str]) -> Dict[str, Any]:
 	cursor = await conn.execute(
@@ -15,6 +56,10 @@ async def create_medication(conn: aiosqlite.Connection, name: str, dosage: Optio
 	return dict(row)
 
 
+async def get_all_medications(conn: aiosqlite.Connection) -> List[Dict[str, Any]]:
+	return await fetch_dicts(conn, "SELECT medication_id, name, dosage, description FROM Medications ORDER BY name")
+
+
 async def create_user_medication(
 	conn: aiosqlite.Connection,
 	user_id: int,
@@ -54,20 +99,39 @@ async def create_medication_schedule(
 	return dict(row)
 
 
-async def get_user_medication_schedule_by_date(conn: aiosqlite.Connection, user_id: int, date: str) -> List[Dict[str, Any]]:
+async def update_medication_schedule_status(
+	conn: aiosqlite.Connection,
+	schedule_id: int,
+	status: str,
+) -> Optional[Dict[str, Any]]:
+	"""Set the status (pending, taken, missed) of a schedule entry"""
 	cursor = await conn.execute(
 		"""
-		SELECT 
-			ms.schedule_id, ms.user_med_id, ms.date, ms.time, ms.status,
-			m.name as medication_name, m.dosage, m.description,
-			um.frequency
-		FROM MedicationSchedule ms
-		JOIN UserMedications um ON ms.user_med_id = um.user_med_id
-		JOIN Medications m ON um.medication_id = m.medication_id
-		WHERE um.user_id = ? AND ms.date = ?
-		ORDER BY ms.time
+		UPDATE MedicationSchedule
+		SET status = ?
+		WHERE schedule_id = ?
+		RETURNING schedule_id, user_med_id, date, time, status
+		""",
+		(status, schedule_id),
+	)
+	row = await cursor.fetchone()
+	return dict(row) if row else None
+
+
+async def create_medication_schedules_bulk(
+	conn: aiosqlite.Connection,
+	schedules: List[Dict[str, Any]],
+) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	"""Insert many schedule entries; returns (schedule_ids, errors by index)"""
+	return await insert_many(
+		conn,
+		"""
+		INSERT INTO MedicationSchedule (user_med_id, date, time, status)
+		VALUES (?, ?, ?, COALESCE(?, 'pending'))
 		""",
-		(user_id, date),
+		[(s["user_med_id"], s["date"], s["time"], s.get("status")) for s in schedules],
 	)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+
+
+async def get_user_medication_schedule_by_date(conn: aiosqlite.Connection, user_id: int, date: str) -> List[Dict[str, Any]]:
+	return await fetch_dicts(conn, MEDICATION_SCHEDULE_BY_DATE_QUERY, (user_id, date))
@@ -0,0 +1,44 @@
+from typing import Optional
+import aiosqlite
+
+
+_BLOOD_PRESSURE_READING = "blood_pressure GLOB '[0-9]*/[0-9]*'"
+
+# Same totals as the backfill in migrations/0005_user_metric_aggregates.sql; inserting them
+# fires the trigger that writes the averages back to Users
+_RECOMPUTE_AGGREGATES_TEMPLATE = f"""
+	INSERT INTO UserMetricAggregates (
+		user_id, sleep_count, sleep_sum, heart_rate_count, heart_rate_sum, steps_count, steps_sum,
+		blood_pressure_count, systolic_sum, diastolic_sum
+	)
+	SELECT
+		user_id,
+		COUNT(sleep_hours), COALESCE(SUM(sleep_hours), 0),
+		COUNT(heart_rate), COALESCE(SUM(heart_rate), 0),
+		COUNT(steps), COALESCE(SUM(steps), 0),
+		SUM(IFNULL({_BLOOD_PRESSURE_READING}, 0)),
+		SUM(CASE WHEN {_BLOOD_PRESSURE_READING}
+			THEN CAST(substr(blood_pressure, 1, instr(blood_pressure, '/') - 1) AS INTEGER) ELSE 0 END),
+		SUM(CASE WHEN {_BLOOD_PRESSURE_READING}
+			THEN CAST(substr(blood_pressure, instr(blood_pressure, '/') + 1) AS INTEGER) ELSE 0 END)
+	FROM DailyMetrics
+	{{user_filter}}
+	GROUP BY user_id
+"""
+RECOMPUTE_AGGREGATES_QUERY = _RECOMPUTE_AGGREGATES_TEMPLATE.format(user_filter="")
+RECOMPUTE_USER_AGGREGATES_QUERY = _RECOMPUTE_AGGREGATES_TEMPLATE.format(user_filter="WHERE user_id = :user_id")
+
+
+async def recompute_metric_aggregates(conn: aiosqlite.Connection, user_id: Optional[int] = None) -> int:
+	"""
+	Recompute the running metric totals from DailyMetrics, for one user or (user_id=None)
+	everyone, and refresh the Users averages from them. Meant for backfills; run it inside a
+	write transaction. Returns the number of users recomputed.
+	"""
+	if user_id is None:
+		await conn.execute("DELETE FROM UserMetricAggregates")
+		cursor = await conn.execute(RECOMPUTE_AGGREGATES_QUERY)
+	else:
+		await conn.execute("DELETE FROM UserMetricAggregates WHERE user_id = ?", (user_id,))
+		cursor = await conn.execute(RECOMPUTE_USER_AGGREGATES_QUERY, {"user_id": user_id})
+	return cursor.rowcount
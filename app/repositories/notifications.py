@@ -1,6 +1,19 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import aiosqlite
 
+from repositories.pagination import decode_cursor, split_page
+from repositories.records import fetch_dicts
+
+
+MARK_ALL_NOTIFICATIONS_READ_QUERY = """
+	UPDATE Notifications 
+	SET is_read = TRUE 
+	WHERE user_id = ? AND is_read = FALSE
+"""
+
+# Trigger-maintained, see UserCounters
+UNREAD_NOTIFICATION_COUNT_QUERY = "SELECT unread_notifications FROM UserCounters WHERE user_id = ?"
+
 
 async def create_notification(
 	conn: aiosqlite.Connection,
@@ -22,6 +35,32 @@ async def create_notification(
 	return dict(row)
 
 
+def user_notifications_query(
+	user_id: int,
+	unread_only: bool = False,
+	limit: Optional[int] = None,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's notification list"""
+	query = """
+		SELECT notification_id, user_id, title, message, notification_type, is_read, created_at
+		FROM Notifications
+		WHERE user_id = ?
+	"""
+	
+	params: List[Any] = [user_id]
+	
+	if unread_only:
+		query += " AND is_read = FALSE"
+	
+	query += " ORDER BY created_at DESC"
+	
+	if limit:
+		query += " LIMIT ?"
+		params.append(limit)
+	
+	return query, params
+
+
 async def get_user_notifications(
 	conn: aiosqlite.Connection,
 	user_id: int,
@@ -29,25 +68,48 @@ async def get_user_notifications(
 	limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
 	"""Get notifications for a specific user"""
+	query, params = user_notifications_query(user_id, unread_only, limit)
+	return await fetch_dicts(conn, query, params)
+
+
+def user_notifications_page_query(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	unread_only: bool = False,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for one page of a user's notifications (page_size + 1 rows)"""
 	query = """
 		SELECT notification_id, user_id, title, message, notification_type, is_read, created_at
 		FROM Notifications
 		WHERE user_id = ?
 	"""
-	
-	params = [user_id]
+	params: List[Any] = [user_id]
 	
 	if unread_only:
 		query += " AND is_read = FALSE"
 	
-	query += " ORDER BY created_at DESC"
+	if cursor:
+		query += " AND (created_at, notification_id) < (?, ?)"
+		params.extend(decode_cursor(cursor))
 	
-	if limit:
-		query += f" LIMIT {limit}"
+	query += " ORDER BY created_at DESC, notification_id DESC LIMIT ?"
+	params.append(page_size + 1)
 	
-	cursor = await conn.execute(query, params)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+	return query, params
+
+
+async def get_user_notifications_page(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	unread_only: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	"""Get one page of a user's notifications, newest first, seeking past `cursor`"""
+	query, params = user_notifications_page_query(user_id, page_size, cursor, unread_only)
+	rows = await fetch_dicts(conn, query, params)
+	return split_page(rows, page_size, "created_at", "notification_id")
 
 
 async def mark_notification_read(
@@ -72,14 +134,7 @@ async def mark_all_notifications_read(
 	user_id: int,
 ) -> int:
 	"""Mark all notifications as read for a user"""
-	cursor = await conn.execute(
-		"""
-		UPDATE Notifications 
-		SET is_read = TRUE 
-		WHERE user_id = ? AND is_read = FALSE
-		""",
-		(user_id,),
-	)
+	cursor = await conn.execute(MARK_ALL_NOTIFICATIONS_READ_QUERY, (user_id,))
 	return cursor.rowcount
 
 
@@ -87,17 +142,10 @@ async def get_unread_notification_count(
 	conn: aiosqlite.Connection,
 	user_id: int,
 ) -> int:
-	"""Get count of unread notifications for a user"""
-	cursor = await conn.execute(
-		"""
-		SELECT COUNT(*) as count
-		FROM Notifications
-		WHERE user_id = ? AND is_read = FALSE
-		""",
-		(user_id,),
-	)
+	"""Get count of unread notifications for a user (trigger-maintained, see UserCounters)"""
+	cursor = await conn.execute(UNREAD_NOTIFICATION_COUNT_QUERY, (user_id,))
 	row = await cursor.fetchone()
-	return row['count'] if row else 0
+	return row[0] if row else 0
 
 
 async def delete_notification(
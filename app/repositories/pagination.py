@@ -0,0 +1,44 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+	"""Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+	"""Opaque token for the position just after (sort_value, row_id)."""
+	raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode("utf-8")
+	return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+	try:
+		padded = cursor + "=" * (-len(cursor) % 4)
+		sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+	except Exception:
+		raise InvalidCursorError("Invalid pagination cursor")
+	if not isinstance(row_id, int):
+		raise InvalidCursorError("Invalid pagination cursor")
+	# Bound straight into the seek query, so only scalars are accepted
+	if sort_value is not None and not isinstance(sort_value, (str, int, float)):
+		raise InvalidCursorError("Invalid pagination cursor")
+	return sort_value, row_id
+
+
+def split_page(
+	rows: List[Dict[str, Any]],
+	page_size: int,
+	sort_column: str,
+	id_column: str,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	"""
+	Seek queries fetch page_size + 1 rows; the extra row only tells us there is a next page.
+	Returns the page and the cursor for the next one (None on the last page).
+	"""
+	if len(rows) <= page_size:
+		return rows, None
+	page = rows[:page_size]
+	last = page[-1]
+	return page, encode_cursor(last[sort_column], last[id_column])
@@ -0,0 +1,91 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiosqlite
+
+
+RowConverters = Dict[str, Callable[[Any], Any]]
+
+_encode_str = json.encoder.encode_basestring
+_encode_other = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+
+@lru_cache(maxsize=256)
+def column_names(description: Tuple[Tuple[Any, ...], ...]) -> Tuple[str, ...]:
+	"""One column-name tuple per distinct result shape, shared by every row and every call."""
+	return tuple(col[0] for col in description)
+
+
+@lru_cache(maxsize=256)
+def _key_prefixes(columns: Tuple[str, ...]) -> Tuple[str, ...]:
+	# '{"a":', ',"b":', ',"c":' so each row encodes as prefix + value pairs plus "}"
+	return tuple(("{" if i == 0 else ",") + _encode_str(name) + ":" for i, name in enumerate(columns))
+
+
+def encode_value(value: Any) -> str:
+	if value is None:
+		return "null"
+	kind = type(value)
+	if kind is str:
+		return _encode_str(value)
+	if kind is int:
+		return int.__repr__(value)
+	return _encode_other(value)
+
+
+def row_encoder(columns: Tuple[str, ...], converters: Optional[RowConverters] = None) -> Callable[[Sequence[Any]], str]:
+	"""Return a function that encodes a row tuple straight to a JSON object, without building a dict."""
+	prefixes = _key_prefixes(columns)
+	if not columns:
+		return lambda row: "{}"
+	if not converters:
+		return lambda row: "".join([key + encode_value(value) for key, value in zip(prefixes, row)]) + "}"
+	convert = [converters.get(name) for name in columns]
+
+	def encode(row: Sequence[Any]) -> str:
+		return "".join([
+			key + encode_value(fn(value) if fn is not None and value is not None else value)
+			for key, fn, value in zip(prefixes, convert, row)
+		]) + "}"
+	return encode
+
+
+class RecordSet:
+	"""Result rows as plain tuples plus the column names they share."""
+
+	__slots__ = ("columns", "rows")
+
+	def __init__(self, columns: Tuple[str, ...], rows: List[Tuple[Any, ...]]):
+		self.columns = columns
+		self.rows = rows
+
+	def __len__(self) -> int:
+		return len(self.rows)
+
+	def __iter__(self) -> Iterable[Tuple[Any, ...]]:
+		return iter(self.rows)
+
+	def dicts(self) -> List[Dict[str, Any]]:
+		columns = self.columns
+		return [dict(zip(columns, row)) for row in self.rows]
+
+	def to_json(self, converters: Optional[RowConverters] = None) -> bytes:
+		"""Encode as a JSON array of objects, byte-for-byte what JSONResponse would send for dicts()."""
+		encode = row_encoder(self.columns, converters)
+		return ("[" + ",".join([encode(row) for row in self.rows]) + "]").encode("utf-8")
+
+
+async def fetch_records(conn: aiosqlite.Connection, query: str, params: Sequence[Any] = ()) -> RecordSet:
+	"""Run a query and return its rows as tuples, skipping the per-row aiosqlite.Row objects."""
+	cursor = await conn.execute(query, params)
+	try:
+		cursor.row_factory = None
+		rows = await cursor.fetchall()
+		return RecordSet(column_names(cursor.description), rows)
+	finally:
+		await cursor.close()
+
+
+async def fetch_dicts(conn: aiosqlite.Connection, query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+	return (await fetch_records(conn, query, params)).dicts()
@@ -1,6 +1,17 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import aiosqlite
 
+from repositories.pagination import decode_cursor, split_page
+from repositories.records import fetch_dicts
+
+
+REPORTS_BY_DATE_QUERY = """
+	SELECT report_id, user_id, report_date, report_type, content
+	FROM Reports
+	WHERE user_id = ? AND report_date = ?
+	ORDER BY report_id DESC
+"""
+
 
 async def create_report(
 	conn: aiosqlite.Connection,
@@ -22,14 +33,71 @@ async def create_report(
 
 
 async def get_user_reports_by_date(conn: aiosqlite.Connection, user_id: int, date: str) -> List[Dict[str, Any]]:
-	cursor = await conn.execute(
-		"""
+	return await fetch_dicts(conn, REPORTS_BY_DATE_QUERY, (user_id, date))
+
+
+def user_reports_query(
+	user_id: int,
+	report_type: Optional[str] = None,
+	limit: Optional[int] = None,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's reports, most recent first"""
+	query = """
 		SELECT report_id, user_id, report_date, report_type, content
 		FROM Reports
-		WHERE user_id = ? AND report_date = ?
-		ORDER BY report_id DESC
-		""",
-		(user_id, date),
-	)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+		WHERE user_id = ?
+	"""
+	params: List[Any] = [user_id]
+
+	if report_type:
+		query += " AND report_type = ?"
+		params.append(report_type)
+
+	query += " ORDER BY report_date DESC"
+
+	if limit:
+		query += " LIMIT ?"
+		params.append(limit)
+
+	return query, params
+
+
+def user_reports_page_query(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	report_type: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for one page of a user's reports (page_size + 1 rows)"""
+	query = """
+		SELECT report_id, user_id, report_date, report_type, content
+		FROM Reports
+		WHERE user_id = ?
+	"""
+	params: List[Any] = [user_id]
+
+	if report_type:
+		query += " AND report_type = ?"
+		params.append(report_type)
+
+	if cursor:
+		query += " AND (report_date, report_id) < (?, ?)"
+		params.extend(decode_cursor(cursor))
+
+	query += " ORDER BY report_date DESC, report_id DESC LIMIT ?"
+	params.append(page_size + 1)
+
+	return query, params
+
+
+async def get_user_reports_page(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	report_type: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	"""Get one page of a user's reports, most recent first, seeking past `cursor`"""
+	query, params = user_reports_page_query(user_id, page_size, cursor, report_type)
+	rows = await fetch_dicts(conn, query, params)
+	return split_page(rows, page_size, "report_date", "report_id")
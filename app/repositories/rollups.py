@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Tuple
+import aiosqlite
+
+from repositories.records import fetch_dicts
+
+
+ROLLUP_COLUMNS = """
+	user_id, day, symptom_count, doses_scheduled, doses_taken, doses_missed, notification_count,
+	steps, heart_rate, sleep_hours, blood_pressure, mood
+"""
+
+# Same aggregation as the backfill in migrations/0004_daily_rollups.sql. {user_filter} and
+# {um_user_filter} narrow every branch to one user so each is an index lookup.
+_REBUILD_ROLLUPS_TEMPLATE = f"""
+	INSERT INTO DailyRollups ({ROLLUP_COLUMNS})
+	SELECT
+		user_id, day, SUM(symptom_count), SUM(doses_scheduled), SUM(doses_taken), SUM(doses_missed),
+		SUM(notification_count), MAX(steps), MAX(heart_rate), MAX(sleep_hours), MAX(blood_pressure), MAX(mood)
+	FROM (
+		SELECT user_id, date(log_date) AS day, 1 AS symptom_count, 0 AS doses_scheduled, 0 AS doses_taken,
+			0 AS doses_missed, 0 AS notification_count, NULL AS steps, NULL AS heart_rate, NULL AS sleep_hours,
+			NULL AS blood_pressure, NULL AS mood
+		FROM Symptoms {{user_filter}}
+		UNION ALL
+		SELECT um.user_id, date(ms.date), 0, 1, ms.status IS 'taken', ms.status IS 'missed', 0, NULL, NULL, NULL, NULL, NULL
+		FROM MedicationSchedule ms JOIN UserMedications um ON ms.user_med_id = um.user_med_id {{um_user_filter}}
+		UNION ALL
+		SELECT user_id, date(created_at), 0, 0, 0, 0, 1, NULL, NULL, NULL, NULL, NULL
+		FROM Notifications {{user_filter}}
+		UNION ALL
+		SELECT user_id, date(date), 0, 0, 0, 0, 0, steps, heart_rate, sleep_hours, blood_pressure, mood
+		FROM DailyMetrics {{user_filter}}
+	)
+	WHERE day IS NOT NULL
+	GROUP BY user_id, day
+"""
+REBUILD_ROLLUPS_QUERY = _REBUILD_ROLLUPS_TEMPLATE.format(user_filter="", um_user_filter="")
+REBUILD_USER_ROLLUPS_QUERY = _REBUILD_ROLLUPS_TEMPLATE.format(
+	user_filter="WHERE user_id = :user_id", um_user_filter="WHERE um.user_id = :user_id"
+)
+
+
+def user_rollups_query(
+	user_id: int,
+	from_day: Optional[str] = None,
+	to_day: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+	"""SQL and params for a user's rollups between from_day and to_day (inclusive), oldest first"""
+	query = f"""
+		SELECT {ROLLUP_COLUMNS}
+		FROM DailyRollups
+		WHERE user_id = ?
+	"""
+	params: List[Any] = [user_id]
+	if from_day is not None:
+		query += " AND day >= ?"
+		params.append(from_day)
+	if to_day is not None:
+		query += " AND day <= ?"
+		params.append(to_day)
+	query += " ORDER BY day"
+	return query, params
+
+
+async def get_user_rollups(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	from_day: Optional[str] = None,
+	to_day: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+	query, params = user_rollups_query(user_id, from_day, to_day)
+	return await fetch_dicts(conn, query, params)
+
+
+async def rebuild_daily_rollups(conn: aiosqlite.Connection, user_id: Optional[int] = None) -> int:
+	"""
+	Recompute DailyRollups from the source tables, for one user or (user_id=None) everyone.
+	Run it inside a write transaction; returns the number of rollup rows written.
+	"""
+	if user_id is None:
+		await conn.execute("DELETE FROM DailyRollups")
+		cursor = await conn.execute(REBUILD_ROLLUPS_QUERY)
+	else:
+		await conn.execute("DELETE FROM DailyRollups WHERE user_id = ?", (user_id,))
+		cursor = await conn.execute(REBUILD_USER_ROLLUPS_QUERY, {"user_id": user_id})
+	return cursor.rowcount
@@ -1,6 +1,10 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import aiosqlite
 
+from repositories.bulk import insert_many
+from repositories.pagination import decode_cursor, split_page
+from repositories.records import fetch_dicts
+
 
 async def add_symptom_log(
 	conn: aiosqlite.Connection,
@@ -23,41 +27,100 @@ async def add_symptom_log(
 	return dict(row)
 
 
+async def add_symptom_logs_bulk(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	symptoms: List[Dict[str, Any]],
+) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	"""Log many symptoms for a user; returns (symptom_ids, errors by index)"""
+	return await insert_many(
+		conn,
+		"""
+		INSERT INTO Symptoms (user_id, symptom, severity, duration, notes)
+		VALUES (?, ?, ?, ?, ?)
+		""",
+		[(user_id, s["symptom"], s.get("severity"), s.get("duration"), s.get("notes")) for s in symptoms],
+	)
+
+
+def user_symptoms_query(user_id: int, limit: Optional[int] = None) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's symptom list"""
+	query = """
+		SELECT symptom_id, user_id, symptom, severity, duration, notes, log_date
+		FROM Symptoms
+		WHERE user_id = ?
+		ORDER BY log_date DESC
+	"""
+	params: List[Any] = [user_id]
+	
+	if limit:
+		query += " LIMIT ?"
+		params.append(limit)
+	
+	return query, params
+
+
 async def get_user_symptoms(
 	conn: aiosqlite.Connection,
 	user_id: int,
 	limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
 	"""Get symptoms for a user, optionally limited by count"""
+	query, params = user_symptoms_query(user_id, limit)
+	return await fetch_dicts(conn, query, params)
+
+
+def user_symptoms_page_query(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for one page of a user's symptoms (page_size + 1 rows)"""
 	query = """
 		SELECT symptom_id, user_id, symptom, severity, duration, notes, log_date
 		FROM Symptoms
 		WHERE user_id = ?
-		ORDER BY log_date DESC
 	"""
+	params: List[Any] = [user_id]
 	
-	if limit:
-		query += f" LIMIT {limit}"
+	if cursor:
+		query += " AND (log_date, symptom_id) < (?, ?)"
+		params.extend(decode_cursor(cursor))
 	
-	cursor = await conn.execute(query, (user_id,))
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+	query += " ORDER BY log_date DESC, symptom_id DESC LIMIT ?"
+	params.append(page_size + 1)
+	
+	return query, params
 
 
-async def get_recent_symptoms(
+async def get_user_symptoms_page(
 	conn: aiosqlite.Connection,
 	user_id: int,
-	days: int = 7,
-) -> List[Dict[str, Any]]:
-	"""Get symptoms from the last N days"""
-	cursor = await conn.execute(
-		"""
+	page_size: int,
+	cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	"""Get one page of a user's symptoms, newest first, seeking past `cursor`"""
+	query, params = user_symptoms_page_query(user_id, page_size, cursor)
+	rows = await fetch_dicts(conn, query, params)
+	return split_page(rows, page_size, "log_date", "symptom_id")
+
+
+def recent_symptoms_query(user_id: int, days: int = 7) -> Tuple[str, List[Any]]:
+	"""Build the SQL and parameters for a user's symptoms from the last N days"""
+	query = """
 		SELECT symptom_id, user_id, symptom, severity, duration, notes, log_date
 		FROM Symptoms
 		WHERE user_id = ? AND log_date >= datetime('now', '-{} days')
 		ORDER BY log_date DESC
-		""".format(days),
-		(user_id,),
-	)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
+	""".format(int(days))
+	return query, [user_id]
+
+
+async def get_recent_symptoms(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	days: int = 7,
+) -> List[Dict[str, Any]]:
+	"""Get symptoms from the last N days"""
+	query, params = recent_symptoms_query(user_id, days)
+	return await fetch_dicts(conn, query, params)
@@ -1,6 +1,9 @@
-from typing import Optional, Dict, Any, List
+import json
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 import aiosqlite
 
+from repositories.records import fetch_dicts
+
 
 async def create_user(conn: aiosqlite.Connection, name: str, age: Optional[int], gender: Optional[str]) -> Dict[str, Any]:
 	cursor = await conn.execute(
@@ -27,15 +30,163 @@ async def get_user_profile(conn: aiosqlite.Connection, user_id: int) -> Optional
 	return dict(row) if row else None
 
 
+# Users columns a batch profile read can return; everything but the password hash
+PROFILE_FIELDS = (
+	"user_id", "name", "age", "gender", "email", "height_cm", "weight_kg", "bmi", "blood_group",
+	"activity_level", "gym_member", "smoker", "alcohol", "medications", "ever_hospitalized",
+	"ever_concussion", "allergies", "medical_conditions", "avg_sleep_hours", "avg_blood_pressure",
+	"avg_heart_rate", "avg_water_intake", "cholesterol_level", "blood_sugar_level", "steps_per_day",
+	"last_checkup", "emergency_contact", "yesterday_summary", "last_month_summary", "created_at",
+	"updated_at",
+)
+
+# Ids bound per IN (...) list, under the 999 host parameters older SQLite builds allow
+PROFILE_BATCH_CHUNK_SIZE = 500
+
+
+def user_profiles_query(user_ids: Sequence[int], columns: Sequence[str]) -> Tuple[str, List[Any]]:
+	"""Build the primary-key IN lookup for one chunk of get_user_profiles"""
+	placeholders = ", ".join("?" * len(user_ids))
+	return f"SELECT {', '.join(columns)} FROM Users WHERE user_id IN ({placeholders})", list(user_ids)
+
+
+async def get_user_profiles(
+	conn: aiosqlite.Connection,
+	user_ids: Sequence[int],
+	fields: Optional[Sequence[str]] = None,
+) -> Dict[int, Dict[str, Any]]:
+	"""
+	Profiles of the existing users among `user_ids`, keyed by user_id, read with one
+	primary-key IN lookup per PROFILE_BATCH_CHUNK_SIZE ids. `fields` (default: all of
+	PROFILE_FIELDS) must be taken from PROFILE_FIELDS; user_id is always included.
+	"""
+	columns = ["user_id"] + [name for name in fields or PROFILE_FIELDS if name != "user_id"]
+	unknown = [name for name in columns if name not in PROFILE_FIELDS]
+	if unknown:
+		raise ValueError(f"Unknown profile fields: {', '.join(unknown)}")
+	profiles: Dict[int, Dict[str, Any]] = {}
+	for start in range(0, len(user_ids), PROFILE_BATCH_CHUNK_SIZE):
+		query, params = user_profiles_query(user_ids[start:start + PROFILE_BATCH_CHUNK_SIZE], columns)
+		rows = await fetch_dicts(conn, query, params)
+		for row in rows:
+			profiles[row["user_id"]] = row
+	return profiles
+
+
+async def get_user_profile_header(conn: aiosqlite.Connection, user_id: int) -> Optional[Dict[str, Any]]:
+	"""Get the profile fields the dashboard header and summary cards show"""
+	cursor = await conn.execute(
+		"""
+		SELECT
+			user_id, name, age, gender, height_cm, weight_kg, bmi, blood_group, activity_level,
+			avg_sleep_hours, avg_blood_pressure, avg_heart_rate, steps_per_day, last_checkup
+		FROM Users
+		WHERE user_id = ?
+		""",
+		(user_id,),
+	)
+	row = await cursor.fetchone()
+	return dict(row) if row else None
+
+
+# Profile plus the related sections the AI prompt shows, in one statement. Each CTE is an
+# index-backed per-user lookup; json_group_array folds its rows into a single column
+# (aggregating a subquery keeps that subquery's ORDER BY).
+PROFILE_SNAPSHOT_QUERY = """
+	WITH symptom_rows AS (
+		SELECT symptom, severity, duration, notes, log_date
+		FROM Symptoms
+		WHERE user_id = :user_id AND log_date >= datetime('now', :window)
+		ORDER BY log_date DESC
+		LIMIT :symptom_limit
+	),
+	disorder_rows AS (
+		SELECT d.name AS disorder_name, d.description, ud.diagnosed_date, ud.resolved_date
+		FROM UserDisorders ud
+		JOIN Disorders d ON ud.disorder_id = d.disorder_id
+		WHERE ud.user_id = :user_id
+		ORDER BY ud.diagnosed_date DESC
+	),
+	medication_rows AS (
+		SELECT m.name AS medication_name, m.dosage, um.frequency, um.start_date, um.end_date
+		FROM UserMedications um
+		JOIN Medications m ON um.medication_id = m.medication_id
+		WHERE um.user_id = :user_id
+			AND um.start_date <= date('now')
+			AND (um.end_date IS NULL OR um.end_date >= date('now'))
+		ORDER BY um.start_date DESC
+		LIMIT :medication_limit
+	),
+	report_rows AS (
+		SELECT report_date, report_type, content
+		FROM Reports
+		WHERE user_id = :user_id AND report_date >= date('now', :window)
+		ORDER BY report_date DESC, report_id DESC
+		LIMIT :report_limit
+	)
+	SELECT
+		u.*,
+		(SELECT json_group_array(json_object(
+			'symptom', symptom, 'severity', severity, 'duration', duration, 'notes', notes, 'log_date', log_date
+		)) FROM symptom_rows) AS recent_symptoms,
+		(SELECT json_group_array(json_object(
+			'disorder_name', disorder_name, 'description', description,
+			'diagnosed_date', diagnosed_date, 'resolved_date', resolved_date
+		)) FROM disorder_rows) AS disorders,
+		(SELECT json_group_array(json_object(
+			'medication_name', medication_name, 'dosage', dosage, 'frequency', frequency,
+			'start_date', start_date, 'end_date', end_date
+		)) FROM medication_rows) AS current_medications,
+		(SELECT json_group_array(json_object(
+			'report_date', report_date, 'report_type', report_type, 'content', content
+		)) FROM report_rows) AS recent_reports
+	FROM Users u
+	WHERE u.user_id = :user_id
+"""
+
+PROFILE_SNAPSHOT_SECTIONS = ("recent_symptoms", "disorders", "current_medications", "recent_reports")
+
+
+async def get_user_profile_snapshot(
+	conn: aiosqlite.Connection,
+	user_id: int,
+	days: int = 30,
+	symptom_limit: int = 10,
+	medication_limit: int = 5,
+	report_limit: int = 3,
+) -> Optional[Dict[str, Any]]:
+	"""
+	Get the user profile with recent symptoms, disorders, current medications and
+	recent reports (the last `days` days) in a single query.
+	Each section comes back as a list of dicts (see PROFILE_SNAPSHOT_SECTIONS).
+	"""
+	cursor = await conn.execute(
+		PROFILE_SNAPSHOT_QUERY,
+		{
+			"user_id": user_id,
+			"window": f"-{int(days)} days",
+			"symptom_limit": symptom_limit,
+			"medication_limit": medication_limit,
+			"report_limit": report_limit,
+		},
+	)
+	row = await cursor.fetchone()
+	if row is None:
+		return None
+	snapshot = dict(row)
+	for section in PROFILE_SNAPSHOT_SECTIONS:
+		snapshot[section] = json.loads(snapshot[section])
+	return snapshot
+
+
 async def get_all_users(conn: aiosqlite.Connection) -> List[Dict[str, Any]]:
 	"""Get all users for UI dropdown"""
-	cursor = await conn.execute(
+	return await fetch_dicts(
+		conn,
 		"""
 		SELECT user_id, name, age, gender, email FROM Users ORDER BY name
 		"""
 	)
-	rows = await cursor.fetchall()
-	return [dict(row) for row in rows]
 
 
 async def update_user_profile(
@@ -0,0 +1,122 @@
+"""
+Verify that the per-user hot queries are served by indexes.
+
+Builds a scratch database from the migrations (or inspects an existing one),
+runs EXPLAIN QUERY PLAN for every query below and exits non-zero if any of them
+falls back to a full table scan.
+
+Run from the app directory:
+	python -m scripts.check_query_plans [path/to/db.sqlite3]
+"""
+import sqlite3
+import sys
+from typing import Any, List, Tuple
+
+from db import load_migrations
+from repositories import alerts, daily_metrics, disorders, medications, notifications, reports, symptoms
+from repositories.data_versions import USER_TABLE_VERSION_QUERY
+from repositories.metric_aggregates import RECOMPUTE_USER_AGGREGATES_QUERY
+from repositories.pagination import encode_cursor
+from repositories.rollups import REBUILD_USER_ROLLUPS_QUERY, user_rollups_query
+from repositories.users import PROFILE_SNAPSHOT_QUERY, user_profiles_query
+
+USER_ID = 1
+DAY = "2024-01-01"
+PAGE_SIZE = 50
+# Cursor for a page after the first, so the seek predicate is part of the plan
+DAY_CURSOR = encode_cursor(DAY, 1)
+TIME_CURSOR = encode_cursor(f"{DAY} 00:00:00", 1)
+
+# (name, sql, params), taken from the same constants and builders the repositories and main.py execute
+HOT_QUERIES: List[Tuple[str, str, Any]] = [
+	("symptoms.get_user_symptoms", *symptoms.user_symptoms_query(USER_ID, 10)),
+	("symptoms.get_recent_symptoms", *symptoms.recent_symptoms_query(USER_ID, 7)),
+	("symptoms.get_user_symptoms_page", *symptoms.user_symptoms_page_query(USER_ID, PAGE_SIZE, DAY_CURSOR)),
+	("notifications.get_user_notifications", *notifications.user_notifications_query(USER_ID)),
+	(
+		"notifications.get_user_notifications(unread_only)",
+		*notifications.user_notifications_query(USER_ID, unread_only=True),
+	),
+	(
+		"notifications.get_user_notifications_page",
+		*notifications.user_notifications_page_query(USER_ID, PAGE_SIZE, TIME_CURSOR),
+	),
+	(
+		"notifications.get_user_notifications_page(unread_only)",
+		*notifications.user_notifications_page_query(USER_ID, PAGE_SIZE, TIME_CURSOR, unread_only=True),
+	),
+	("notifications.get_unread_notification_count", notifications.UNREAD_NOTIFICATION_COUNT_QUERY, (USER_ID,)),
+	("notifications.mark_all_notifications_read", notifications.MARK_ALL_NOTIFICATIONS_READ_QUERY, (USER_ID,)),
+	("alerts.get_user_alerts", *alerts.user_alerts_query(USER_ID, active_only=False)),
+	("alerts.get_user_alerts(active_only)", *alerts.user_alerts_query(USER_ID)),
+	("alerts.get_user_alerts_page(active_only)", *alerts.user_alerts_page_query(USER_ID, PAGE_SIZE, TIME_CURSOR)),
+	("alerts.get_upcoming_alerts", *alerts.upcoming_alerts_query(USER_ID, 24)),
+	("alerts.get_active_alert_count", alerts.ACTIVE_ALERT_COUNT_QUERY, (USER_ID,)),
+	("data_versions.get_user_table_version", USER_TABLE_VERSION_QUERY, (USER_ID, "Notifications")),
+	("daily_metrics.get_user_metrics_by_date", daily_metrics.METRICS_BY_DATE_QUERY, (USER_ID, DAY)),
+	("GET /metrics/{user_id}", *daily_metrics.user_metrics_query(USER_ID)),
+	("daily_metrics.get_latest_user_metrics", daily_metrics.LATEST_METRICS_QUERY, (USER_ID, 7)),
+	("daily_metrics.get_user_metrics_page", *daily_metrics.user_metrics_page_query(USER_ID, PAGE_SIZE, DAY_CURSOR)),
+	(
+		"medications.get_user_medication_schedule_by_date",
+		medications.MEDICATION_SCHEDULE_BY_DATE_QUERY,
+		(USER_ID, DAY),
+	),
+	("GET /medications/{user_id}/schedule", *medications.user_medication_schedule_query(USER_ID)),
+	("GET /medications/{user_id}", medications.USER_MEDICATIONS_QUERY, (USER_ID,)),
+	("disorders.get_user_disorders_by_date", disorders.USER_DISORDERS_BY_DATE_QUERY, (USER_ID, DAY, DAY)),
+	("GET /disorders/{user_id}", disorders.USER_DISORDERS_QUERY, (USER_ID,)),
+	("reports.get_user_reports_by_date", reports.REPORTS_BY_DATE_QUERY, (USER_ID, DAY)),
+	("GET /reports/{user_id}", *reports.user_reports_query(USER_ID)),
+	("GET /reports/{user_id}?report_type=", *reports.user_reports_query(USER_ID, "daily")),
+	("users.get_user_profiles", *user_profiles_query([1, 2, 3], ["user_id", "name", "age"])),
+	(
+		"users.get_user_profile_snapshot",
+		PROFILE_SNAPSHOT_QUERY,
+		{"user_id": USER_ID, "window": "-30 days", "symptom_limit": 10, "medication_limit": 5, "report_limit": 3},
+	),
+	("reports.get_user_reports_page", *reports.user_reports_page_query(USER_ID, PAGE_SIZE, DAY_CURSOR)),
+	(
+		"reports.get_user_reports_page(report_type)",
+		*reports.user_reports_page_query(USER_ID, PAGE_SIZE, DAY_CURSOR, "daily"),
+	),
+	("rollups.get_user_rollups", *user_rollups_query(USER_ID, DAY, "2024-01-31")),
+	("rollups.rebuild_daily_rollups(user_id)", REBUILD_USER_ROLLUPS_QUERY, {"user_id": USER_ID}),
+	("metric_aggregates.recompute_metric_aggregates(user_id)", RECOMPUTE_USER_AGGREGATES_QUERY, {"user_id": USER_ID}),
+]
+
+
+def build_scratch_database() -> sqlite3.Connection:
+	conn = sqlite3.connect(":memory:")
+	for _, _, sql in load_migrations():
+		conn.executescript(sql)
+	return conn
+
+
+def find_full_scans(conn: sqlite3.Connection, sql: str, params: Any) -> List[str]:
+	"""Return the plan steps that scan a whole table (SCAN without an index). Scans of CTEs are fine."""
+	rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+	ctes = {detail.split()[1] for *_, detail in rows if detail.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+	return [
+		detail for *_, detail in rows
+		if detail.startswith("SCAN ") and "USING" not in detail and detail.split()[1] not in ctes
+	]
+
+
+def main(argv: List[str]) -> int:
+	conn = sqlite3.connect(argv[1]) if len(argv) > 1 else build_scratch_database()
+	failures = 0
+	for name, sql, params in HOT_QUERIES:
+		scans = find_full_scans(conn, sql, params)
+		if scans:
+			failures += 1
+			print(f"FAIL {name}: {'; '.join(scans)}")
+		else:
+			print(f"ok   {name}")
+	conn.close()
+	print(f"{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} queries use indexes")
+	return 1 if failures else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv))
@@ -0,0 +1,103 @@
+"""
+Check that ResponseFieldStream (src/chatbot/response_stream.py) streams exactly the
+"response" value of the model's JSON reply, however the reply is chunked.
+
+Every reply below is fed split at each single position, then one character at a time,
+then in the chunks listed with it (the splits that have broken the parser before). The
+joined deltas must equal json.loads(reply)["response"], fences removed as
+conversational_agent._parse_ai_response does, and the field must be marked complete.
+Exits non-zero if any case fails.
+
+Run from the app directory:
+	python -m scripts.check_response_stream
+"""
+import json
+import sys
+from typing import List, Tuple
+
+from src.chatbot.response_stream import ResponseFieldStream
+
+# (name, reply, chunks of the reply that hit the case)
+CASES: List[Tuple[str, str, List[str]]] = [
+	(
+		"key split mid-word",
+		'{"response": "Hello there", "symptoms": []}',
+		['{"resp', 'onse": "Hel', 'lo there", "symptoms": []}'],
+	),
+	(
+		"whitespace around the colon across chunks",
+		'{"response"        :  "Hello there"}',
+		['{"response"        ', ':  "Hello', ' there"}'],
+	),
+	(
+		"newline escape split",
+		'{"response": "line one\\nline two"}',
+		['{"response": "line one\\', 'nline two"}'],
+	),
+	(
+		"quote escape split",
+		'{"response": "she said \\"rest\\" today"}',
+		['{"response": "she said \\', '"rest\\', '" today"}'],
+	),
+	(
+		"unicode escape split",
+		'{"response": "caf\\u00e9 au lait"}',
+		['{"response": "caf\\u0', '0e', '9 au lait"}'],
+	),
+	(
+		"surrogate pair split",
+		'{"response": "get well \\ud83d\\ude00 soon"}',
+		['{"response": "get well \\ud83d', '\\ud', 'e00 soon"}'],
+	),
+	(
+		"symptoms before response",
+		'{"symptoms": ["headache", "response", "a, {b}"], "response": "Drink some water."}',
+		['{"symptoms": ["headache", "response"', ', "a, {b}"], "resp', 'onse": "Drink some water."}'],
+	),
+	(
+		"code-fenced reply",
+		'```json\n{\n  "response": "Take it easy today.",\n  "symptoms": ["fatigue"]\n}\n```',
+		['```js', 'on\n{\n  "response":', ' "Take it easy', ' today.",\n  "symptoms": ["fatigue"]\n}\n```'],
+	),
+]
+
+
+def expected_response(reply: str) -> str:
+	cleaned = reply.strip().replace("```json", "").replace("```", "").strip()
+	return json.loads(cleaned)["response"]
+
+
+def stream(chunks: List[str]) -> Tuple[str, bool]:
+	parser = ResponseFieldStream()
+	streamed = "".join(parser.feed(chunk) for chunk in chunks)
+	return streamed, parser.complete
+
+
+def chunkings(reply: str, chunks: List[str]) -> List[Tuple[str, List[str]]]:
+	assert "".join(chunks) == reply, "the listed chunks must add up to the reply"
+	splits = [(f"split at {n}", [reply[:n], reply[n:]]) for n in range(1, len(reply))]
+	return [("listed chunks", chunks), ("one character at a time", list(reply))] + splits
+
+
+def main() -> int:
+	failures = 0
+	for name, reply, chunks in CASES:
+		expected = expected_response(reply)
+		failed = []
+		for label, pieces in chunkings(reply, chunks):
+			streamed, complete = stream(pieces)
+			if streamed != expected or not complete:
+				failed.append(f"{label}: got {streamed!r}, complete={complete}")
+		if failed:
+			failures += 1
+			print(f"FAIL {name}: expected {expected!r}")
+			for line in failed[:5]:
+				print(f"     {line}")
+		else:
+			print(f"ok   {name}")
+	print(f"{len(CASES) - failures}/{len(CASES)} cases stream the response exactly")
+	return 1 if failures else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Check the trigger-maintained UserCounters (unread notifications, active alerts)
+against a recount of the Notifications and Alerts rows.
+
+Prints every user whose stored counts differ and exits non-zero if any do. With
+--repair the drifted rows are overwritten with the recounted values; the check
+and the repair run in one write transaction, so concurrent writes cannot slip
+in between.
+
+Run from the app directory:
+	python -m scripts.check_user_counters [--repair] [path/to/db.sqlite3]
+"""
+import argparse
+import asyncio
+import sys
+from typing import Any, Dict, List
+
+import aiosqlite
+
+from db import DB_PATH, apply_migrations
+from repositories.counters import find_counter_drift, repair_counter_drift
+
+
+async def check(path: str, repair: bool) -> List[Dict[str, Any]]:
+	async with aiosqlite.connect(path) as conn:
+		conn.row_factory = aiosqlite.Row
+		await conn.execute("PRAGMA busy_timeout = 5000;")
+		await apply_migrations(conn)
+		if not repair:
+			return await find_counter_drift(conn)
+		await conn.execute("BEGIN IMMEDIATE")
+		try:
+			drift = await repair_counter_drift(conn)
+		except BaseException:
+			await conn.rollback()
+			raise
+		await conn.commit()
+		return drift
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description="Check (and optionally repair) the UserCounters table")
+	parser.add_argument("database", nargs="?", default=DB_PATH.as_posix())
+	parser.add_argument("--repair", action="store_true", help="overwrite drifted counters with recounted values")
+	args = parser.parse_args()
+
+	drift = asyncio.run(check(args.database, args.repair))
+	for d in drift:
+		print(
+			f"{'FIXED' if args.repair else 'DRIFT'} user {d['user_id']}: "
+			f"unread_notifications {d['stored_unread_notifications']} -> {d['actual_unread_notifications']}, "
+			f"active_alerts {d['stored_active_alerts']} -> {d['actual_active_alerts']}"
+		)
+	if not drift:
+		print("UserCounters match the Notifications and Alerts tables")
+		return 0
+	return 0 if args.repair else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Recompute DailyRollups from Symptoms, MedicationSchedule, Notifications and DailyMetrics.
+
+The triggers in migrations/0004_daily_rollups.sql keep the table current as rows
+are written; use this after restoring or hand-editing data with the triggers
+dropped, or whenever the rollups are suspect. The rebuild runs in one write
+transaction, so readers see either the old or the new rollups.
+
+Run from the app directory:
+	python -m scripts.rebuild_daily_rollups [--user-id N] [path/to/db.sqlite3]
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+import aiosqlite
+
+from db import DB_PATH, apply_migrations
+from repositories.rollups import rebuild_daily_rollups
+
+
+async def rebuild(path: str, user_id: Optional[int]) -> int:
+	async with aiosqlite.connect(path) as conn:
+		await conn.execute("PRAGMA busy_timeout = 5000;")
+		await apply_migrations(conn)
+		await conn.execute("BEGIN IMMEDIATE")
+		try:
+			rows = await rebuild_daily_rollups(conn, user_id=user_id)
+		except BaseException:
+			await conn.rollback()
+			raise
+		await conn.commit()
+	return rows
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Recompute the DailyRollups table from scratch")
+	parser.add_argument("database", nargs="?", default=DB_PATH.as_posix())
+	parser.add_argument("--user-id", type=int, default=None, help="only rebuild this user's rollups")
+	args = parser.parse_args()
+
+	start = time.perf_counter()
+	rows = asyncio.run(rebuild(args.database, args.user_id))
+	scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+	print(f"Rebuilt {rows} DailyRollups rows for {scope} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,51 @@
+"""
+Recompute the UserMetricAggregates running totals from DailyMetrics and refresh
+the Users average columns (avg_sleep_hours, avg_heart_rate, steps_per_day,
+avg_blood_pressure) from them.
+
+The triggers in migrations/0005_user_metric_aggregates.sql keep both current as
+metrics are written; use this after a backfill that ran with the triggers
+dropped, or to overwrite averages that were set by hand. The recompute runs in
+one write transaction.
+
+Run from the app directory:
+	python -m scripts.recompute_metric_aggregates [--user-id N] [path/to/db.sqlite3]
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+import aiosqlite
+
+from db import DB_PATH, apply_migrations
+from repositories.metric_aggregates import recompute_metric_aggregates
+
+
+async def recompute(path: str, user_id: Optional[int]) -> int:
+	async with aiosqlite.connect(path) as conn:
+		await conn.execute("PRAGMA busy_timeout = 5000;")
+		await apply_migrations(conn)
+		await conn.execute("BEGIN IMMEDIATE")
+		try:
+			users = await recompute_metric_aggregates(conn, user_id=user_id)
+		except BaseException:
+			await conn.rollback()
+			raise
+		await conn.commit()
+	return users
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Recompute the running metric totals and Users averages")
+	parser.add_argument("database", nargs="?", default=DB_PATH.as_posix())
+	parser.add_argument("--user-id", type=int, default=None, help="only recompute this user")
+	args = parser.parse_args()
+
+	start = time.perf_counter()
+	users = asyncio.run(recompute(args.database, args.user_id))
+	print(f"Recomputed metric averages for {users} users in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+	main()
@@ -1,6 +1,14 @@
-from typing import Dict, Any, Optional, List
+import asyncio
+import os
+import time
+from datetime import date as Date, datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Iterable, Optional, List, Tuple
 
-from db import get_db_connection
+import aiosqlite
+
+from cache import CatalogCache, disorder_catalog, medication_catalog, profile_cache
+from db import acquire_connection, DB_READ_POOL_SIZE, READ, run_write, unit_of_work
+from latency import chat_stream_model_time, chat_time_to_first_token
 from repositories import users as users_repo
 from repositories import daily_metrics as metrics_repo
 from repositories import medications as meds_repo
@@ -9,14 +17,12 @@ from repositories import reports as reports_repo
 from repositories import symptoms as symptoms_repo
 from repositories import notifications as notifications_repo
 from repositories import alerts as alerts_repo
+from repositories import data_versions as data_versions_repo
 
 
 # Users
 async def add_user(name: str, age: Optional[int] = None, gender: Optional[str] = None) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await users_repo.create_user(conn, name=name, age=age, gender=gender)
-		await conn.commit()
-		return result
+	return await run_write(users_repo.create_user, name=name, age=age, gender=gender)
 
 
 # Daily Metrics
@@ -30,16 +36,13 @@ async def add_user_tokens(
     """
     Wrapper function to save user OAuth tokens in the database.
     """
-    async for conn in get_db_connection():
-        result = await metrics_repo.save_user_tokens(
-            conn,
-            user_id=user_id,
-            access_token=access_token,
-            refresh_token=refresh_token,
-            expiry=expiry
-        )
-        await conn.commit()
-        return result
+    return await run_write(
+        metrics_repo.save_user_tokens,
+        user_id=user_id,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expiry=expiry
+    )
 async def add_daily_metric(
 	user_id: int,
 	date: str,
@@ -50,28 +53,103 @@ async def add_daily_metric(
 	mood: Optional[str] = None,
 	notes: Optional[str] = None,
 ) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await metrics_repo.create_daily_metric(
-			conn,
-			user_id=user_id,
-			date=date,
-			steps=steps,
-			heart_rate=heart_rate,
-			sleep_hours=sleep_hours,
-			blood_pressure=blood_pressure,
-			mood=mood,
-			notes=notes,
+	return await run_write(
+		metrics_repo.create_daily_metric,
+		user_id=user_id,
+		date=date,
+		steps=steps,
+		heart_rate=heart_rate,
+		sleep_hours=sleep_hours,
+		blood_pressure=blood_pressure,
+		mood=mood,
+		notes=notes,
+	)
+
+
+async def add_daily_metrics_bulk(user_id: int, metrics: List[Dict[str, Any]]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	return await run_write(metrics_repo.create_daily_metrics_bulk, user_id=user_id, metrics=metrics)
+
+
+async def get_user_metrics_page(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	async with acquire_connection(READ) as conn:
+		return await metrics_repo.get_user_metrics_page(
+			conn, user_id=user_id, page_size=page_size, cursor=cursor
 		)
-		await conn.commit()
-		return result
+
+
+# Disorders / Medications catalogs, served from the in-process caches in cache.py
+CatalogLoader = Callable[[Any], Awaitable[List[Dict[str, Any]]]]
+
+
+async def _fresh_catalog(cache: CatalogCache, table: str, load: CatalogLoader, force: bool = False) -> CatalogCache:
+	"""
+	Return `cache`, first checking its version against the table's stamp if the last check
+	is older than its revalidate interval (or `force`), and reloading it if they differ.
+	"""
+	if not force and cache.is_fresh():
+		return cache
+	# One snapshot, so the rows are exactly the ones the version stamp describes
+	async with unit_of_work(READ) as conn:
+		version = await data_versions_repo.get_user_table_version(conn, data_versions_repo.CATALOG_VERSION_KEY, table)
+		if version == cache.version:
+			cache.confirm()
+		else:
+			cache.replace(version, await load(conn))
+	return cache
+
+
+async def get_disorder_catalog(force: bool = False) -> CatalogCache:
+	return await _fresh_catalog(disorder_catalog, "Disorders", disorders_repo.get_all_disorders, force)
+
+
+async def get_medication_catalog(force: bool = False) -> CatalogCache:
+	return await _fresh_catalog(medication_catalog, "Medications", meds_repo.get_all_medications, force)
+
+
+async def load_catalog_caches() -> None:
+	await get_disorder_catalog(force=True)
+	await get_medication_catalog(force=True)
+
+
+async def search_medications(prefix: str, limit: int) -> List[Dict[str, Any]]:
+	catalog = await get_medication_catalog()
+	return catalog.search(prefix, limit)
+
+
+async def find_disorder(disorder_id: int) -> Optional[Dict[str, Any]]:
+	"""Catalog entry for disorder_id; a miss re-checks the version stamp, so just-added entries are found"""
+	row = (await get_disorder_catalog()).get(disorder_id)
+	return row if row is not None else (await get_disorder_catalog(force=True)).get(disorder_id)
+
+
+async def find_medication(medication_id: int) -> Optional[Dict[str, Any]]:
+	"""Catalog entry for medication_id; a miss re-checks the version stamp, so just-added entries are found"""
+	row = (await get_medication_catalog()).get(medication_id)
+	return row if row is not None else (await get_medication_catalog(force=True)).get(medication_id)
+
+
+async def _create_catalog_row(conn: Any, create: Callable[..., Awaitable[Dict[str, Any]]], table: str, **kwargs) -> Tuple[Dict[str, Any], int]:
+	"""Run `create` and return its row with the catalog version it produced, for the write-through"""
+	row = await create(conn, **kwargs)
+	return row, await data_versions_repo.get_user_table_version(conn, data_versions_repo.CATALOG_VERSION_KEY, table)
 
 
 # Medications
 async def add_medication(name: str, dosage: Optional[str] = None, description: Optional[str] = None) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await meds_repo.create_medication(conn, name=name, dosage=dosage, description=description)
-		await conn.commit()
-		return result
+	row, version = await run_write(
+		_create_catalog_row,
+		create=meds_repo.create_medication,
+		table="Medications",
+		name=name,
+		dosage=dosage,
+		description=description,
+	)
+	medication_catalog.apply_write(version, row)
+	return row
 
 
 async def add_user_medication(
@@ -81,8 +159,52 @@ async def add_user_medication(
 	end_date: Optional[str] = None,
 	frequency: Optional[str] = None,
 ) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await meds_repo.create_user_medication(
+	return await run_write(
+		meds_repo.create_user_medication,
+		user_id=user_id,
+		medication_id=medication_id,
+		start_date=start_date,
+		end_date=end_date,
+		frequency=frequency,
+	)
+
+
+async def add_medication_schedule(
+	user_med_id: int,
+	date: str,
+	time: str,
+	status: Optional[str] = None,
+) -> Dict[str, Any]:
+	return await run_write(meds_repo.create_medication_schedule, user_med_id=user_med_id, date=date, time=time, status=status)
+
+
+async def add_medication_regimen(
+	user_id: int,
+	start_date: str,
+	medication_id: Optional[int] = None,
+	medication: Optional[Dict[str, Any]] = None,
+	end_date: Optional[str] = None,
+	frequency: Optional[str] = None,
+	schedule: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+	"""
+	Create a medication (or reuse medication_id), assign it to the user and add its
+	schedule entries in a single transaction. Nothing is saved if any step fails.
+	"""
+	async with unit_of_work() as conn:
+		created_medication = None
+		if medication is not None:
+			created_medication, catalog_version = await _create_catalog_row(
+				conn,
+				create=meds_repo.create_medication,
+				table="Medications",
+				name=medication["name"],
+				dosage=medication.get("dosage"),
+				description=medication.get("description"),
+			)
+			medication_id = created_medication["medication_id"]
+
+		user_medication = await meds_repo.create_user_medication(
 			conn,
 			user_id=user_id,
 			medication_id=medication_id,
@@ -90,28 +212,47 @@ async def add_user_medication(
 			end_date=end_date,
 			frequency=frequency,
 		)
-		await conn.commit()
-		return result
 
+		schedule_entries = []
+		for entry in schedule or []:
+			schedule_entries.append(
+				await meds_repo.create_medication_schedule(
+					conn,
+					user_med_id=user_medication["user_med_id"],
+					date=entry["date"],
+					time=entry["time"],
+					status=entry.get("status"),
+				)
+			)
+
+	if created_medication is not None:
+		medication_catalog.apply_write(catalog_version, created_medication)
+	return {
+		"medication": created_medication,
+		"user_medication": user_medication,
+		"schedule": schedule_entries,
+	}
 
-async def add_medication_schedule(
-	user_med_id: int,
-	date: str,
-	time: str,
-	status: Optional[str] = None,
-) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await meds_repo.create_medication_schedule(conn, user_med_id=user_med_id, date=date, time=time, status=status)
-		await conn.commit()
-		return result
+
+async def add_medication_schedules_bulk(schedules: List[Dict[str, Any]]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	return await run_write(meds_repo.create_medication_schedules_bulk, schedules=schedules)
+
+
+async def update_medication_schedule_status(schedule_id: int, status: str) -> Optional[Dict[str, Any]]:
+	return await run_write(meds_repo.update_medication_schedule_status, schedule_id=schedule_id, status=status)
 
 
 # Disorders
 async def add_disorder(name: str, description: Optional[str] = None) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await disorders_repo.create_disorder(conn, name=name, description=description)
-		await conn.commit()
-		return result
+	row, version = await run_write(
+		_create_catalog_row,
+		create=disorders_repo.create_disorder,
+		table="Disorders",
+		name=name,
+		description=description,
+	)
+	disorder_catalog.apply_write(version, row)
+	return row
 
 
 async def add_user_disorder(
@@ -120,16 +261,13 @@ async def add_user_disorder(
 	diagnosed_date: str,
 	resolved_date: Optional[str] = None,
 ) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await disorders_repo.create_user_disorder(
-			conn,
-			user_id=user_id,
-			disorder_id=disorder_id,
-			diagnosed_date=diagnosed_date,
-			resolved_date=resolved_date,
-		)
-		await conn.commit()
-		return result
+	return await run_write(
+		disorders_repo.create_user_disorder,
+		user_id=user_id,
+		disorder_id=disorder_id,
+		diagnosed_date=diagnosed_date,
+		resolved_date=resolved_date,
+	)
 
 
 # Reports
@@ -139,16 +277,25 @@ async def add_report(
 	report_type: Optional[str] = None,
 	content: Optional[str] = None,
 ) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await reports_repo.create_report(
-			conn,
-			user_id=user_id,
-			report_date=report_date,
-			report_type=report_type,
-			content=content,
+	return await run_write(
+		reports_repo.create_report,
+		user_id=user_id,
+		report_date=report_date,
+		report_type=report_type,
+		content=content,
+	)
+
+
+async def get_user_reports_page(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	report_type: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	async with acquire_connection(READ) as conn:
+		return await reports_repo.get_user_reports_page(
+			conn, user_id=user_id, page_size=page_size, cursor=cursor, report_type=report_type
 		)
-		await conn.commit()
-		return result
 
 
 # Symptoms
@@ -159,63 +306,185 @@ async def add_symptom_log(
 	duration: Optional[str] = None,
 	notes: Optional[str] = None,
 ) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await symptoms_repo.add_symptom_log(
-			conn, user_id=user_id, symptom=symptom, severity=severity, duration=duration, notes=notes
-		)
-		await conn.commit()
-		return result
+	return await run_write(
+		symptoms_repo.add_symptom_log,
+		user_id=user_id, symptom=symptom, severity=severity, duration=duration, notes=notes
+	)
+
+
+async def add_symptom_logs_bulk(user_id: int, symptoms: List[Dict[str, Any]]) -> Tuple[List[Optional[int]], Dict[int, str]]:
+	return await run_write(symptoms_repo.add_symptom_logs_bulk, user_id=user_id, symptoms=symptoms)
 
 
 async def get_user_symptoms(user_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await symptoms_repo.get_user_symptoms(conn, user_id=user_id, limit=limit)
 
 
+async def get_user_symptoms_page(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	async with acquire_connection(READ) as conn:
+		return await symptoms_repo.get_user_symptoms_page(
+			conn, user_id=user_id, page_size=page_size, cursor=cursor
+		)
+
+
 async def get_recent_symptoms(user_id: int, days: int = 7) -> List[Dict[str, Any]]:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await symptoms_repo.get_recent_symptoms(conn, user_id=user_id, days=days)
 
 
 # User Profile Functions
 async def get_user_profile(user_id: int) -> Optional[Dict[str, Any]]:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await users_repo.get_user_profile(conn, user_id=user_id)
 
 
+async def get_user_profiles(
+	user_ids: Iterable[int],
+	fields: Optional[Iterable[str]] = None,
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+	"""
+	Profiles for many users on one read connection: (profiles in request order with
+	repeated ids once, ids that match no user). Raises ValueError for unknown fields.
+	"""
+	ids = list(dict.fromkeys(user_ids))
+	async with acquire_connection(READ) as conn:
+		found = await users_repo.get_user_profiles(conn, ids, list(fields) if fields else None)
+	return [found[user_id] for user_id in ids if user_id in found], [user_id for user_id in ids if user_id not in found]
+
+
 async def get_all_users() -> List[Dict[str, Any]]:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await users_repo.get_all_users(conn)
 
 
 async def update_user_profile(user_id: int, **kwargs) -> Optional[Dict[str, Any]]:
-	async for conn in get_db_connection():
-		result = await users_repo.update_user_profile(conn, user_id=user_id, **kwargs)
-		await conn.commit()
-		return result
+	return await run_write(users_repo.update_user_profile, user_id=user_id, **kwargs)
 
 
 # Search functions - get all user data for a specific date
-async def get_user_data_by_date(user_id: int, date: str) -> Dict[str, Any]:
+DateSectionQuery = Callable[[Any, int, str], Awaitable[List[Dict[str, Any]]]]
+
+# Sections of a per-day summary; each is an independent per-user, per-date read
+DATE_SUMMARY_SECTIONS: Tuple[Tuple[str, DateSectionQuery], ...] = (
+	("daily_metrics", metrics_repo.get_user_metrics_by_date),
+	("medication_schedule", meds_repo.get_user_medication_schedule_by_date),
+	("disorders", disorders_repo.get_user_disorders_by_date),
+	("reports", reports_repo.get_user_reports_by_date),
+)
+
+# Days summarized at once by get_user_data_by_date_range. Each day holds one read
+# connection per section, so the default keeps a range request within the read pool.
+SUMMARY_RANGE_CONCURRENCY = int(os.getenv(
+	"SUMMARY_RANGE_CONCURRENCY", str(max(1, DB_READ_POOL_SIZE // len(DATE_SUMMARY_SECTIONS)))
+))
+
+
+async def _read_section(query: Callable[..., Awaitable[Any]], *args: Any) -> Tuple[Any, float]:
+	"""Run one repository read on its own read connection; returns the result and elapsed ms (including pool wait)"""
+	start = time.perf_counter()
+	async with acquire_connection(READ) as conn:
+		result = await query(conn, *args)
+	return result, (time.perf_counter() - start) * 1000
+
+
+async def get_user_data_by_date(user_id: int, date: str, debug: bool = False) -> Dict[str, Any]:
 	"""
 	Get all user data for a specific date across all tables.
 	Returns a dictionary with all relevant data grouped by table.
+	The sections are independent, so they run concurrently, each on its own read connection.
+	With debug=True the result also carries per-section latency in "timings_ms".
+	"""
+	start = time.perf_counter()
+	results = await asyncio.gather(*(
+		_read_section(query, user_id, date) for _, query in DATE_SUMMARY_SECTIONS
+	))
+	data: Dict[str, Any] = {"user_id": user_id, "date": date}
+	for (section, _), (rows, _) in zip(DATE_SUMMARY_SECTIONS, results):
+		data[section] = rows
+	if debug:
+		timings = {section: round(ms, 3) for (section, _), (_, ms) in zip(DATE_SUMMARY_SECTIONS, results)}
+		timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+		data["timings_ms"] = timings
+	return data
+
+
+async def get_user_data_by_date_range(
+	user_id: int,
+	start_date: Date,
+	end_date: Date,
+	debug: bool = False,
+) -> Dict[str, Any]:
+	"""
+	Per-day get_user_data_by_date summaries for every date from start_date to end_date
+	(inclusive), oldest first. At most SUMMARY_RANGE_CONCURRENCY days are in flight at once.
+	"""
+	start = time.perf_counter()
+	limiter = asyncio.Semaphore(SUMMARY_RANGE_CONCURRENCY)
+
+	async def summarize(day: Date) -> Dict[str, Any]:
+		async with limiter:
+			return await get_user_data_by_date(user_id, day.isoformat(), debug=debug)
+
+	span = (end_date - start_date).days
+	days = await asyncio.gather(*(summarize(start_date + timedelta(days=n)) for n in range(span + 1)))
+	data: Dict[str, Any] = {
+		"user_id": user_id,
+		"start_date": start_date.isoformat(),
+		"end_date": end_date.isoformat(),
+		"days": days,
+	}
+	if debug:
+		data["timings_ms"] = {"total": round((time.perf_counter() - start) * 1000, 3)}
+	return data
+
+
+DASHBOARD_SECTIONS = ("profile", "metrics", "upcoming_alerts", "unread_count", "medication_schedule")
+
+
+async def get_user_dashboard(
+	user_id: int,
+	sections: Optional[Iterable[str]] = None,
+	metrics_limit: int = 7,
+	alerts_hours_ahead: int = 24,
+	date: Optional[str] = None,
+	debug: bool = False,
+) -> Optional[Dict[str, Any]]:
 	"""
-	async for conn in get_db_connection():
-		# Get data from all tables that have user_id + date fields
-		daily_metrics = await metrics_repo.get_user_metrics_by_date(conn, user_id, date)
-		medication_schedule = await meds_repo.get_user_medication_schedule_by_date(conn, user_id, date)
-		disorders = await disorders_repo.get_user_disorders_by_date(conn, user_id, date)
-		reports = await reports_repo.get_user_reports_by_date(conn, user_id, date)
-		
-		return {
-			"user_id": user_id,
-			"date": date,
-			"daily_metrics": daily_metrics,
-			"medication_schedule": medication_schedule,
-			"disorders": disorders,
-			"reports": reports,
-		}
+	Everything the dashboard page shows, in one call: profile header, latest daily metrics,
+	upcoming alerts, unread notification count and the medication schedule for `date`
+	(default: today, UTC). Only `sections` (default: all of DASHBOARD_SECTIONS) are read,
+	concurrently, each on its own read connection. Returns None if the profile was
+	requested and the user does not exist.
+	"""
+	day = date or datetime.now(timezone.utc).date().isoformat()
+	reads = {
+		"profile": (users_repo.get_user_profile_header, user_id),
+		"metrics": (metrics_repo.get_latest_user_metrics, user_id, metrics_limit),
+		"upcoming_alerts": (alerts_repo.get_upcoming_alerts, user_id, alerts_hours_ahead),
+		"unread_count": (notifications_repo.get_unread_notification_count, user_id),
+		"medication_schedule": (meds_repo.get_user_medication_schedule_by_date, user_id, day),
+	}
+	selected = [name for name in DASHBOARD_SECTIONS if sections is None or name in sections]
+
+	start = time.perf_counter()
+	results = await asyncio.gather(*(_read_section(*reads[name]) for name in selected))
+	data: Dict[str, Any] = {"user_id": user_id}
+	for name, (value, _) in zip(selected, results):
+		data[name] = value
+	if "profile" in data and data["profile"] is None:
+		return None
+	if "medication_schedule" in data:
+		data["date"] = day
+	if debug:
+		timings = {name: round(ms, 3) for name, (_, ms) in zip(selected, results)}
+		timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+		data["timings_ms"] = timings
+	return data
 
 
 # COMPREHENSIVE USER DATA FETCHER
@@ -223,22 +492,46 @@ async def get_comprehensive_user_data(user_id: int) -> str:
 	"""
 	ONE BIG FUNCTION: Fetches ALL user data from ALL tables and formats it as a comprehensive string.
 	This is designed to be appended to the master/system prompt for the AI.
+	The rendered string is cached per user until a write bumps the user's data version.
+	"""
+	_, user_data = await get_comprehensive_user_data_versioned(user_id)
+	return user_data
+
+
+async def get_comprehensive_user_data_versioned(user_id: int) -> Tuple[Tuple[int, int], str]:
+	"""get_comprehensive_user_data plus the data version the string was rendered from"""
+	async with acquire_connection(READ) as conn:
+		return await render_comprehensive_user_data(conn, user_id)
+
+
+async def render_comprehensive_user_data(conn: aiosqlite.Connection, user_id: int) -> Tuple[Tuple[int, int], str]:
 	"""
-	async for conn in get_db_connection():
-		# Get user profile
-		user_profile = await users_repo.get_user_profile(conn, user_id)
-		if not user_profile:
-			return f"User with ID {user_id} not found."
-		
-		# Get all related data
-		recent_symptoms = await symptoms_repo.get_recent_symptoms(conn, user_id, days=30)
-		user_disorders = await disorders_repo.get_user_disorders_by_date(conn, user_id, "2024-01-01")  # Get all disorders
-		user_medications = await meds_repo.get_user_medication_schedule_by_date(conn, user_id, "2024-01-01")  # Get all medications
-		recent_metrics = await metrics_repo.get_user_metrics_by_date(conn, user_id, "2024-01-01")  # Get all metrics
-		recent_reports = await reports_repo.get_user_reports_by_date(conn, user_id, "2024-01-01")  # Get all reports
-		
-		# Format comprehensive user data string
-		user_data = f"""
+	(data version, comprehensive user data) read over `conn`, served from profile_cache while
+	the version is unchanged. Shared by the pooled path above and sqlite_handler's own connection.
+	"""
+	# Read the version first: a write landing mid-render can only make the entry stale, never wrong
+	version = await data_versions_repo.get_user_data_version(conn, user_id)
+	user_data = profile_cache.get(user_id, version)
+	if user_data is not None:
+		return version, user_data
+	snapshot = await users_repo.get_user_profile_snapshot(conn, user_id)
+	if snapshot is None:
+		return version, f"User with ID {user_id} not found."
+	user_data = format_comprehensive_user_data(user_id, snapshot)
+	profile_cache.put(user_id, version, user_data)
+	return version, user_data
+
+
+def format_comprehensive_user_data(user_id: int, snapshot: Dict[str, Any]) -> str:
+	"""Render a users_repo.get_user_profile_snapshot() result as the AI prompt profile block"""
+	user_profile = snapshot
+	recent_symptoms = snapshot["recent_symptoms"]
+	user_disorders = snapshot["disorders"]
+	user_medications = snapshot["current_medications"]
+	recent_reports = snapshot["recent_reports"]
+	
+	# Format comprehensive user data string
+	user_data = f"""
 === COMPREHENSIVE USER HEALTH PROFILE ===
 User ID: {user_id}
 
@@ -281,41 +574,41 @@ Blood Sugar Level: {user_profile.get('blood_sugar_level', 'N/A')} mg/dL
 
 --- RECENT SYMPTOMS (Last 30 days) ---
 """
-		
-		if recent_symptoms:
-			for symptom in recent_symptoms[:10]:  # Limit to 10 most recent
-				user_data += f"• {symptom.get('symptom', 'N/A')} (Severity: {symptom.get('severity', 'N/A')}, Duration: {symptom.get('duration', 'N/A')}) - {symptom.get('log_date', 'N/A')}\n"
-		else:
-			user_data += "No recent symptoms recorded.\n"
-		
-		user_data += f"""
+	
+	if recent_symptoms:
+		for symptom in recent_symptoms:
+			user_data += f"• {symptom.get('symptom', 'N/A')} (Severity: {symptom.get('severity', 'N/A')}, Duration: {symptom.get('duration', 'N/A')}) - {symptom.get('log_date', 'N/A')}\n"
+	else:
+		user_data += "No recent symptoms recorded.\n"
+	
+	user_data += f"""
 --- DIAGNOSED DISORDERS ---
 """
-		if user_disorders:
-			for disorder in user_disorders:
-				user_data += f"• {disorder.get('disorder_name', 'N/A')} (Diagnosed: {disorder.get('diagnosed_date', 'N/A')}, Resolved: {disorder.get('resolved_date', 'Ongoing')})\n"
-		else:
-			user_data += "No diagnosed disorders recorded.\n"
-		
-		user_data += f"""
+	if user_disorders:
+		for disorder in user_disorders:
+			user_data += f"• {disorder.get('disorder_name', 'N/A')} (Diagnosed: {disorder.get('diagnosed_date', 'N/A')}, Resolved: {disorder.get('resolved_date', 'Ongoing')})\n"
+	else:
+		user_data += "No diagnosed disorders recorded.\n"
+	
+	user_data += f"""
 --- CURRENT MEDICATIONS ---
 """
-		if user_medications:
-			for med in user_medications[:5]:  # Limit to 5 most recent
-				user_data += f"• {med.get('medication_name', 'N/A')} ({med.get('dosage', 'N/A')}) - {med.get('frequency', 'N/A')}\n"
-		else:
-			user_data += "No current medications recorded.\n"
-		
-		user_data += f"""
+	if user_medications:
+		for med in user_medications:
+			user_data += f"• {med.get('medication_name', 'N/A')} ({med.get('dosage', 'N/A')}) - {med.get('frequency', 'N/A')}\n"
+	else:
+		user_data += "No current medications recorded.\n"
+	
+	user_data += f"""
 --- RECENT HEALTH REPORTS ---
 """
-		if recent_reports:
-			for report in recent_reports[:3]:  # Limit to 3 most recent
-				user_data += f"• {report.get('report_type', 'N/A')} Report ({report.get('report_date', 'N/A')}): {report.get('content', 'N/A')[:100]}...\n"
-		else:
-			user_data += "No health reports available.\n"
-		
-		user_data += f"""
+	if recent_reports:
+		for report in recent_reports:
+			user_data += f"• {report.get('report_type', 'N/A')} Report ({report.get('report_date', 'N/A')}): {(report.get('content') or 'N/A')[:100]}...\n"
+	else:
+		user_data += "No health reports available.\n"
+	
+	user_data += f"""
 --- EMERGENCY CONTACT ---
 {user_profile.get('emergency_contact', 'N/A')}
 
@@ -328,8 +621,8 @@ Last Month's Summary: {user_profile.get('last_month_summary', 'N/A')}
 
 === END OF USER HEALTH PROFILE ===
 """
-		
-		return user_data
+	
+	return user_data
 
 
 # Notifications
@@ -339,12 +632,10 @@ async def create_notification(
 	message: str,
 	notification_type: Optional[str] = None,
 ) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await notifications_repo.create_notification(
-			conn, user_id=user_id, title=title, message=message, notification_type=notification_type
-		)
-		await conn.commit()
-		return result
+	return await run_write(
+		notifications_repo.create_notification,
+		user_id=user_id, title=title, message=message, notification_type=notification_type
+	)
 
 
 async def get_user_notifications(
@@ -352,40 +643,45 @@ async def get_user_notifications(
 	unread_only: bool = False,
 	limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await notifications_repo.get_user_notifications(
 			conn, user_id=user_id, unread_only=unread_only, limit=limit
 		)
 
 
-async def mark_notification_read(notification_id: int, user_id: int) -> bool:
-	async for conn in get_db_connection():
-		result = await notifications_repo.mark_notification_read(
-			conn, notification_id=notification_id, user_id=user_id
+async def get_user_notifications_page(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	unread_only: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	async with acquire_connection(READ) as conn:
+		return await notifications_repo.get_user_notifications_page(
+			conn, user_id=user_id, page_size=page_size, cursor=cursor, unread_only=unread_only
 		)
-		await conn.commit()
-		return result
+
+
+async def mark_notification_read(notification_id: int, user_id: int) -> bool:
+	return await run_write(
+		notifications_repo.mark_notification_read,
+		notification_id=notification_id, user_id=user_id
+	)
 
 
 async def mark_all_notifications_read(user_id: int) -> int:
-	async for conn in get_db_connection():
-		result = await notifications_repo.mark_all_notifications_read(conn, user_id=user_id)
-		await conn.commit()
-		return result
+	return await run_write(notifications_repo.mark_all_notifications_read, user_id=user_id)
 
 
 async def get_unread_notification_count(user_id: int) -> int:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await notifications_repo.get_unread_notification_count(conn, user_id=user_id)
 
 
 async def delete_notification(notification_id: int, user_id: int) -> bool:
-	async for conn in get_db_connection():
-		result = await notifications_repo.delete_notification(
-			conn, notification_id=notification_id, user_id=user_id
-		)
-		await conn.commit()
-		return result
+	return await run_write(
+		notifications_repo.delete_notification,
+		notification_id=notification_id, user_id=user_id
+	)
 
 
 # Alerts
@@ -396,12 +692,10 @@ async def create_alert(
 	message: str,
 	alert_time: str,
 ) -> Dict[str, Any]:
-	async for conn in get_db_connection():
-		result = await alerts_repo.create_alert(
-			conn, user_id=user_id, alert_type=alert_type, title=title, message=message, alert_time=alert_time
-		)
-		await conn.commit()
-		return result
+	return await run_write(
+		alerts_repo.create_alert,
+		user_id=user_id, alert_type=alert_type, title=title, message=message, alert_time=alert_time
+	)
 
 
 async def get_user_alerts(
@@ -409,43 +703,140 @@ async def get_user_alerts(
 	active_only: bool = True,
 	limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await alerts_repo.get_user_alerts(
 			conn, user_id=user_id, active_only=active_only, limit=limit
 		)
 
 
+async def get_user_alerts_page(
+	user_id: int,
+	page_size: int,
+	cursor: Optional[str] = None,
+	active_only: bool = True,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+	async with acquire_connection(READ) as conn:
+		return await alerts_repo.get_user_alerts_page(
+			conn, user_id=user_id, page_size=page_size, cursor=cursor, active_only=active_only
+		)
+
+
 async def get_upcoming_alerts(user_id: int, hours_ahead: int = 24) -> List[Dict[str, Any]]:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await alerts_repo.get_upcoming_alerts(conn, user_id=user_id, hours_ahead=hours_ahead)
 
 
 async def update_alert(alert_id: int, user_id: int, **kwargs) -> Optional[Dict[str, Any]]:
-	async for conn in get_db_connection():
-		result = await alerts_repo.update_alert(conn, alert_id=alert_id, user_id=user_id, **kwargs)
-		await conn.commit()
-		return result
+	return await run_write(alerts_repo.update_alert, alert_id=alert_id, user_id=user_id, **kwargs)
 
 
 async def deactivate_alert(alert_id: int, user_id: int) -> bool:
-	async for conn in get_db_connection():
-		result = await alerts_repo.deactivate_alert(conn, alert_id=alert_id, user_id=user_id)
-		await conn.commit()
-		return result
+	return await run_write(alerts_repo.deactivate_alert, alert_id=alert_id, user_id=user_id)
 
 
 async def delete_alert(alert_id: int, user_id: int) -> bool:
-	async for conn in get_db_connection():
-		result = await alerts_repo.delete_alert(conn, alert_id=alert_id, user_id=user_id)
-		await conn.commit()
-		return result
+	return await run_write(alerts_repo.delete_alert, alert_id=alert_id, user_id=user_id)
 
 
 async def get_active_alert_count(user_id: int) -> int:
-	async for conn in get_db_connection():
+	async with acquire_connection(READ) as conn:
 		return await alerts_repo.get_active_alert_count(conn, user_id=user_id)
 
 
+# AI conversation (POST /chat, POST /summarize)
+async def _save_user_message(user_id: int, message: str, timings: Dict[str, float]) -> None:
+	from src.storage.firebase_handler import save_chat_history_async
+
+	stage_start = time.perf_counter()
+	await save_chat_history_async(user_id, "user", message)
+	timings["save_user_message"] = round((time.perf_counter() - stage_start) * 1000, 3)
+
+
+async def _finish_chat_turn(
+	user_id: int,
+	ai_message: str,
+	extracted_symptoms: List[Any],
+	timings: Dict[str, float],
+) -> None:
+	"""Log the symptoms extracted from the user's message and save the AI's answer"""
+	from src.storage.firebase_handler import save_chat_history_async
+
+	stage_start = time.perf_counter()
+	if extracted_symptoms:
+		_, errors = await add_symptom_logs_bulk(
+			user_id=user_id,
+			symptoms=[{"symptom": str(symptom)} for symptom in extracted_symptoms],
+		)
+		for index, error in errors.items():
+			print(f"Could not log symptom '{extracted_symptoms[index]}' for user_id '{user_id}': {error}")
+	timings["log_symptoms"] = round((time.perf_counter() - stage_start) * 1000, 3)
+
+	stage_start = time.perf_counter()
+	await save_chat_history_async(user_id, "ai", ai_message)
+	timings["save_ai_message"] = round((time.perf_counter() - stage_start) * 1000, 3)
+
+
+async def handle_chat_turn(user_id: int, message: str, debug: bool = False) -> Dict[str, Any]:
+	"""
+	One conversational turn: save the user's message, answer it with the AI health companion,
+	log any symptoms it mentions and save the answer. Everything is awaited on the app's event
+	loop; SQLite reads and writes go through the shared pool and the single writer.
+	With debug=True the result also carries per-stage latency in "timings_ms".
+	"""
+	from src.chatbot.conversational_agent import handle_conversation_async
+
+	start = time.perf_counter()
+	timings: Dict[str, float] = {}
+	await _save_user_message(user_id, message, timings)
+	ai_message, extracted_symptoms = await handle_conversation_async(user_id, message, timings)
+	await _finish_chat_turn(user_id, ai_message, extracted_symptoms, timings)
+
+	data: Dict[str, Any] = {"response": ai_message}
+	if debug:
+		timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+		data["timings_ms"] = timings
+	return data
+
+
+async def stream_chat_turn(user_id: int, message: str, debug: bool = False) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+	"""
+	handle_chat_turn with the answer streamed as (event, data) pairs: a "delta" with each new
+	piece of the answer text as the model produces it, then a final "symptoms" event with the
+	extracted symptoms and the whole answer, sent once the symptoms are logged and the answer
+	is saved. Time to first token is recorded in latency.chat_time_to_first_token.
+	"""
+	from src.chatbot.conversational_agent import stream_conversation_async
+
+	start = time.perf_counter()
+	timings: Dict[str, float] = {}
+	await _save_user_message(user_id, message, timings)
+
+	ai_message, extracted_symptoms = "", []
+	async for kind, value in stream_conversation_async(user_id, message, timings):
+		if kind == "text":
+			yield "delta", {"text": value}
+		else:
+			ai_message, extracted_symptoms = value
+	if "time_to_first_token" in timings:
+		chat_time_to_first_token.record(timings["time_to_first_token"])
+	if "model" in timings:
+		chat_stream_model_time.record(timings["model"])
+
+	await _finish_chat_turn(user_id, ai_message, extracted_symptoms, timings)
+	data: Dict[str, Any] = {"symptoms": extracted_symptoms, "response": ai_message}
+	if debug:
+		timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+		data["timings_ms"] = timings
+	yield "symptoms", data
+
+
+async def summarize_user_day(user_id: int) -> Optional[str]:
+	"""Summarize today's conversation and replace the raw chat log with the summary"""
+	from src.chatbot.summarizer import summarize_day_for_user_async
+
+	return await summarize_day_for_user_async(user_id)
+
+
 # Personalized Notification Generation
 async def generate_personalized_notification(
 	user_id: int,
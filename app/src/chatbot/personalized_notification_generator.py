@@ -4,7 +4,12 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 
 # Import the database handlers
-from src.storage.sqlite_handler import get_comprehensive_user_data_sync
+from src.storage.sqlite_handler import get_comprehensive_user_data_versioned_sync
+from cache import notification_cache
+from src.chatbot.prompt_budget import estimate_tokens, fit_profile
+
+# Estimated tokens the user's profile may take up in a notification prompt
+NOTIFICATION_PROFILE_TOKEN_BUDGET = int(os.getenv("NOTIFICATION_PROFILE_TOKEN_BUDGET", "1000"))
 
 # Configure the Gemini API key
 try:
@@ -64,9 +69,20 @@ def _format_disorders_for_prompt(disorders: List[Dict[str, Any]]) -> str:
 
 def _get_notification_context(user_id: int) -> str:
     """Gets comprehensive user context for personalized notifications."""
+    _, context = _get_notification_context_versioned(user_id)
+    return context
+
+def _get_notification_context_versioned(user_id: int):
+    """_get_notification_context plus the user data version it was built from (None if unavailable)."""
     try:
-        # Get comprehensive user data
-        comprehensive_data = get_comprehensive_user_data_sync(user_id)
+        # Get comprehensive user data, trimmed to the notification budget
+        version, comprehensive_data = get_comprehensive_user_data_versioned_sync(user_id)
+        comprehensive_data, trimmed = fit_profile(comprehensive_data, NOTIFICATION_PROFILE_TOKEN_BUDGET)
+        if trimmed:
+            print(
+                f"Trimmed notification profile for user {user_id} to ~{estimate_tokens(comprehensive_data)} tokens, "
+                f"budget {NOTIFICATION_PROFILE_TOKEN_BUDGET}: {', '.join(trimmed)}"
+            )
         
         # Extract key information for notification context
         context = f"""
@@ -77,10 +93,10 @@ def _get_notification_context(user_id: int) -> str:
 This user has been actively tracking their health data. Based on their profile, recent symptoms, medications, and conditions, create a personalized, engaging notification.
 """
         
-        return context
+        return version, context
     except Exception as e:
         print(f"Error getting user context for user {user_id}: {e}")
-        return f"User {user_id} context unavailable."
+        return None, f"User {user_id} context unavailable."
 
 def generate_personalized_notification(
     user_id: int, 
@@ -97,10 +113,18 @@ def generate_personalized_notification(
     
     Returns:
         Dict with title, message, and notification_type
+
+    A notification generated for the same type and custom context while the user's data is
+    unchanged (within NOTIFICATION_CACHE_TTL) is reused instead of calling the model again.
     """
     try:
         # Get user context
-        user_context = _get_notification_context(user_id)
+        version, user_context = _get_notification_context_versioned(user_id)
+        if version is not None:
+            cached = notification_cache.get(user_id, notification_type, custom_context, version)
+            if cached is not None:
+                print(f"Reused cached {notification_type} notification for user {user_id}")
+                return cached
         
         # Create personalized prompt based on notification type
         if notification_type == "medication":
@@ -232,6 +256,10 @@ def generate_personalized_notification(
             # Ensure notification_type matches request
             parsed_response['notification_type'] = notification_type
             
+            # Fallback notifications below are not cached, so the next request tries the model again
+            if version is not None:
+                notification_cache.put(user_id, notification_type, custom_context, version, parsed_response)
+            
             print(f"Successfully generated personalized notification for user {user_id}")
             return parsed_response
             
@@ -0,0 +1,100 @@
+"""
+Token budgets for the AI prompts.
+
+Token counts are estimated from the text length (about CHARS_PER_TOKEN characters per
+token for English text), which is close enough to size a prompt without a round trip to
+the model's tokenizer. When a prompt section is over its budget, the lowest-priority
+content is trimmed first, one step at a time, stopping as soon as it fits:
+1. profile fields with no value ("N/A", "None")
+2. long free-text lines (stored summaries, conditions, past-day summaries) are shortened
+3. past-day summaries, oldest first, keeping the most recent one
+4. the most recent summary
+The caller logs the returned list of what was trimmed.
+"""
+import os
+import re
+
+CHARS_PER_TOKEN = 4
+# Lines longer than this are shortened by step 2
+PROMPT_LINE_MAX_CHARS = int(os.getenv("PROMPT_LINE_MAX_CHARS", "300"))
+
+_EMPTY_FIELD = re.compile(r"^[^\n:]+: (?:N/A|None)(?: [A-Za-z/]+)?\n", re.MULTILINE)
+# A section whose only content is an empty value, e.g. "--- LAST CHECKUP ---\nNone\n"
+_EMPTY_VALUE_SECTION = re.compile(r"^--- [^\n]+ ---\n(?:N/A|None)\n\n?", re.MULTILINE)
+# A section header left with nothing under it
+_EMPTY_SECTION = re.compile(r"^--- [^\n]+ ---\n(?:\n|(?====))", re.MULTILINE)
+_SUMMARY_ENTRY = re.compile(r"^(?=Date: )", re.MULTILINE)
+
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def drop_empty_fields(profile):
+    """The profile without fields (or whole sections) that have no value; returns (text, fields dropped)."""
+    profile, fields = _EMPTY_FIELD.subn("", profile)
+    profile, sections = _EMPTY_VALUE_SECTION.subn("", profile)
+    profile = _EMPTY_SECTION.sub("", profile)
+    return profile, fields + sections
+
+def shorten_long_lines(text, max_chars=None):
+    """Cut every line longer than max_chars to that length; returns (text, lines shortened)."""
+    max_chars = PROMPT_LINE_MAX_CHARS if max_chars is None else max_chars
+    lines = text.split("\n")
+    shortened = 0
+    for index, line in enumerate(lines):
+        if len(line) > max_chars:
+            lines[index] = line[:max_chars - 3].rstrip() + "..."
+            shortened += 1
+    return "\n".join(lines), shortened
+
+def _split_summaries(summaries_context):
+    """(header, [entry, ...]) of a rendered summaries block, entries most recent first."""
+    parts = _SUMMARY_ENTRY.split(summaries_context)
+    return parts[0], [part for part in parts[1:] if part]
+
+def fit_profile(profile, budget_tokens):
+    """Trim a rendered profile (steps 1-2) until it fits budget_tokens; returns (profile, trimmed)."""
+    trimmed = []
+    if estimate_tokens(profile) <= budget_tokens:
+        return profile, trimmed
+    profile, dropped = drop_empty_fields(profile)
+    if dropped:
+        trimmed.append(f"{dropped} empty profile fields")
+    if estimate_tokens(profile) <= budget_tokens:
+        return profile, trimmed
+    profile, shortened = shorten_long_lines(profile)
+    if shortened:
+        trimmed.append(f"{shortened} long profile lines shortened")
+    return profile, trimmed
+
+def fit_profile_and_summaries(profile, summaries_context, budget_tokens):
+    """
+    Trim a rendered profile and past-summaries block together (steps 1-4) until they fit
+    budget_tokens; returns (profile, summaries_context, trimmed). Only the summaries count
+    against what is left after the profile has been trimmed as far as it goes.
+    """
+    if estimate_tokens(profile) + estimate_tokens(summaries_context) <= budget_tokens:
+        return profile, summaries_context, []
+    profile, trimmed = fit_profile(profile, budget_tokens - estimate_tokens(summaries_context))
+    remaining = budget_tokens - estimate_tokens(profile)
+    if estimate_tokens(summaries_context) <= remaining:
+        return profile, summaries_context, trimmed
+
+    summaries_context, shortened = shorten_long_lines(summaries_context)
+    if shortened:
+        trimmed.append(f"{shortened} long summaries shortened")
+    if estimate_tokens(summaries_context) <= remaining:
+        return profile, summaries_context, trimmed
+
+    header, entries = _split_summaries(summaries_context)
+    dropped = 0
+    while len(entries) > 1 and estimate_tokens(header + "".join(entries)) > remaining:
+        entries.pop()
+        dropped += 1
+    if dropped:
+        trimmed.append(f"{dropped} oldest summaries")
+    summaries_context = header + "".join(entries)
+    if estimate_tokens(summaries_context) > remaining and entries:
+        summaries_context = ""
+        trimmed.append("the most recent summary")
+    return profile, summaries_context, trimmed
@@ -0,0 +1,293 @@
+"""
+Assembles the AI Health Companion's conversation prompt from cached segments.
+
+The prompt is, in order: the instruction block, the user's health profile, their past-day
+summaries, today's conversation, the current message and the response format. The first
+three only change when the user's data or summaries do, so they are rendered once into a
+prefix cached per user in cache.prompt_segment_cache, tagged with the profile's data
+version and the summaries version. A turn whose versions match renders only the history
+tail and the message, and skips the Firestore reads for the summaries.
+
+The profile, today's history and the summaries are independent, so they are fetched at once,
+each within its own deadline. A source that misses it is marked unavailable in the prompt
+(and nothing built from it is cached) rather than holding up the turn.
+
+The whole prompt is held to CHAT_PROMPT_TOKEN_BUDGET estimated tokens. The profile and
+summaries are fitted into the budget less CHAT_HISTORY_TOKEN_RESERVE when the prefix is
+built (see prompt_budget for what goes first), and today's conversation gets what is left,
+dropping its oldest messages if needed. The instructions and the message are never cut.
+"""
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from cache import prompt_segment_cache
+from src.chatbot.prompt_budget import estimate_tokens, fit_profile_and_summaries
+from services import get_comprehensive_user_data_versioned
+from src.storage.firebase_handler import (
+    get_past_summaries,
+    get_past_summaries_async,
+    get_summaries_version,
+    get_todays_chat_history,
+    get_todays_chat_history_async,
+)
+from src.storage.sqlite_handler import get_comprehensive_user_data_versioned_sync
+
+# How long each context source may take before the turn goes ahead without it
+CHAT_PROFILE_DEADLINE_MS = float(os.getenv("CHAT_PROFILE_DEADLINE_MS", "1000"))
+CHAT_HISTORY_DEADLINE_MS = float(os.getenv("CHAT_HISTORY_DEADLINE_MS", "2000"))
+CHAT_SUMMARIES_DEADLINE_MS = float(os.getenv("CHAT_SUMMARIES_DEADLINE_MS", "2000"))
+
+# Estimated tokens (see prompt_budget) a whole conversation prompt may use, and how many of
+# them the profile and summaries leave for today's conversation and the message
+CHAT_PROMPT_TOKEN_BUDGET = int(os.getenv("CHAT_PROMPT_TOKEN_BUDGET", "3000"))
+CHAT_HISTORY_TOKEN_RESERVE = int(os.getenv("CHAT_HISTORY_TOKEN_RESERVE", "600"))
+
+# A context source that missed its deadline or failed
+UNAVAILABLE = object()
+
+INSTRUCTIONS = """
+        You are an AI Health Companion. Your role is to be a supportive and helpful conversational partner.
+        You have access to COMPREHENSIVE user health data including:
+        1. Complete Health Profile: All physical metrics, medical conditions, medications, disorders, lab values
+        2. Recent Symptoms: Last 30 days of symptom logs with severity and duration
+        3. Previous Day Summaries: Concise summaries of past conversations for long-term memory
+        4. Today's Conversation: The most recent messages from today
+
+        Use ALL this information to have a deeply context-aware conversation. You can reference:
+        - Specific health metrics (BMI, blood pressure, heart rate, etc.)
+        - Medical conditions and allergies
+        - Current medications and their schedules
+        - Recent symptoms and their patterns
+        - Lab values and health indicators
+        - Previous conversation summaries for continuity
+
+        Your secondary task is to silently identify and extract any medical symptoms the user mentions in their message.
+
+        """
+
+RESPONSE_FORMAT = """
+
+        Based on all information, provide a JSON response with two keys:
+        1. "response": Your natural, empathetic, and helpful conversational response that references relevant health data when appropriate.
+        2. "symptoms": A list of any medical symptoms from the *current user message only*. If none, provide an empty list.
+
+        JSON Response:
+        """
+
+PROFILE_UNAVAILABLE = "--- User Health Profile ---\nTemporarily unavailable for this message."
+SUMMARIES_UNAVAILABLE = "\n--- Previous Day Summaries (Most Recent First) ---\nTemporarily unavailable for this message.\n"
+HISTORY_UNAVAILABLE = "\n--- Today's Conversation (Most Recent) ---\nTemporarily unavailable for this message.\n"
+
+INSTRUCTIONS_BYTES = len(INSTRUCTIONS.encode("utf-8"))
+RESPONSE_FORMAT_BYTES = len(RESPONSE_FORMAT.encode("utf-8"))
+PROMPT_FIXED_TOKENS = estimate_tokens(INSTRUCTIONS) + estimate_tokens(RESPONSE_FORMAT)
+
+
+def _format_history_for_prompt(history):
+    """Formats today's recent chat history."""
+    if not history: return ""
+    formatted_history = "\n--- Today's Conversation (Most Recent) ---\n"
+    for message in history:
+        role = "User" if message.get('sender') == 'user' else "Health Companion"
+        formatted_history += f"{role}: {message.get('message')}\n"
+    return formatted_history
+
+def _format_summaries_for_prompt(summaries):
+    """Formats past daily summaries to provide long-term context."""
+    if not summaries: return ""
+    formatted_summaries = "\n--- Previous Day Summaries (Most Recent First) ---\n"
+    for entry in summaries:
+        formatted_summaries += f"Date: {entry['date']}\nSummary: {entry['summary']}\n\n"
+    return formatted_summaries
+
+def _profile_segment(comprehensive_user_data):
+    return f"{comprehensive_user_data}\n\n        "
+
+def _summaries_segment(summaries_context):
+    return f"{summaries_context}\n        "
+
+def _message_segment(user_message):
+    return f'\n\n        Current User Message: "{user_message}"'
+
+def build_master_prompt(comprehensive_user_data, summaries_context, history_context, user_message):
+    """The whole conversation prompt rendered from its parts, without the cache."""
+    return (
+        INSTRUCTIONS
+        + _profile_segment(comprehensive_user_data)
+        + _summaries_segment(summaries_context)
+        + history_context
+        + _message_segment(user_message)
+        + RESPONSE_FORMAT
+    )
+
+def _fit_history(history, available_tokens):
+    """Drop the oldest of today's messages until the history fits; returns (history_context, dropped)."""
+    history = list(history)
+    dropped = 0
+    history_context = _format_history_for_prompt(history)
+    while history and estimate_tokens(history_context) > available_tokens:
+        history.pop(0)
+        dropped += 1
+        history_context = _format_history_for_prompt(history)
+    return history_context, dropped
+
+def _finish_prompt(user_id, prefix, profile_bytes, reused, history, trimmed, user_message):
+    """
+    Append the per-turn tail to the prefix, fitting today's history into what is left of
+    the budget; log anything trimmed and record the size of every segment.
+    """
+    message_segment = _message_segment(user_message)
+    fixed_tokens = estimate_tokens(prefix) + estimate_tokens(message_segment) + estimate_tokens(RESPONSE_FORMAT)
+    if history is UNAVAILABLE:
+        history_context = HISTORY_UNAVAILABLE
+    else:
+        history_context, dropped = _fit_history(history, CHAT_PROMPT_TOKEN_BUDGET - fixed_tokens)
+        if dropped:
+            trimmed = trimmed + [f"{dropped} oldest messages of today's conversation"]
+    prompt = prefix + history_context + message_segment + RESPONSE_FORMAT
+
+    if trimmed:
+        tokens = estimate_tokens(prompt)
+        over = " (still over)" if tokens > CHAT_PROMPT_TOKEN_BUDGET else ""
+        print(
+            f"Trimmed chat prompt for user '{user_id}' to ~{tokens} tokens, budget "
+            f"{CHAT_PROMPT_TOKEN_BUDGET}{over}: {', '.join(trimmed)}"
+        )
+
+    prefix_bytes = len(prefix.encode("utf-8"))
+    prompt_segment_cache.record_prompt(
+        {
+            "instructions": INSTRUCTIONS_BYTES,
+            "profile": profile_bytes,
+            "summaries": prefix_bytes - INSTRUCTIONS_BYTES - profile_bytes,
+            "history": len(history_context.encode("utf-8")),
+            "message": len(message_segment.encode("utf-8")),
+            "response_format": RESPONSE_FORMAT_BYTES,
+        },
+        reused_bytes=prefix_bytes if reused else 0,
+    )
+    return prompt
+
+async def _fetch_async(name, fetch, deadline_ms, timings):
+    """Await one context source within its deadline; UNAVAILABLE if it misses it or fails."""
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(fetch, deadline_ms / 1000)
+    except asyncio.TimeoutError:
+        print(f"Chat context '{name}' missed its {deadline_ms:g} ms deadline; continuing without it.")
+        return UNAVAILABLE
+    except Exception as e:
+        print(f"Chat context '{name}' failed: {e}; continuing without it.")
+        return UNAVAILABLE
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+def _timed_call(fetch, user_id):
+    start = time.perf_counter()
+    return fetch(user_id), (time.perf_counter() - start) * 1000
+
+def _fetch_all_sync(user_id, sources, timings):
+    """Run the context sources on threads at once, waiting for each until its deadline."""
+    pool = ThreadPoolExecutor(max_workers=len(sources))
+    started = time.perf_counter()
+    try:
+        futures = {name: pool.submit(_timed_call, fetch, user_id) for name, (fetch, _) in sources.items()}
+        fetched = {}
+        for name, (_, deadline_ms) in sorted(sources.items(), key=lambda source: source[1][1]):
+            remaining = deadline_ms / 1000 - (time.perf_counter() - started)
+            try:
+                fetched[name], elapsed_ms = futures[name].result(timeout=max(0.0, remaining))
+                timings[name] = round(elapsed_ms, 3)
+            except FutureTimeoutError:
+                print(f"Chat context '{name}' missed its {deadline_ms:g} ms deadline; continuing without it.")
+                fetched[name] = UNAVAILABLE
+                timings[name] = round((time.perf_counter() - started) * 1000, 3)
+            except Exception as e:
+                print(f"Chat context '{name}' failed: {e}; continuing without it.")
+                fetched[name] = UNAVAILABLE
+                timings[name] = round((time.perf_counter() - started) * 1000, 3)
+        return fetched
+    finally:
+        # A source past its deadline keeps its thread until it returns; the turn does not wait for it
+        pool.shutdown(wait=False)
+
+def _assemble(user_id, user_message, summaries_version, summaries_context, fetched):
+    """Build the prompt from the gathered sources, caching the parts that were available."""
+    if fetched["profile"] is UNAVAILABLE:
+        profile_version, comprehensive_user_data = None, PROFILE_UNAVAILABLE
+    else:
+        profile_version, comprehensive_user_data = fetched["profile"]
+
+    if summaries_context is None:
+        if fetched["summaries"] is UNAVAILABLE:
+            summaries_version, summaries_context = None, SUMMARIES_UNAVAILABLE
+        else:
+            summaries_context = _format_summaries_for_prompt(fetched["summaries"])
+            prompt_segment_cache.put("summaries", user_id, summaries_version, summaries_context)
+
+    # A prefix with a section marked unavailable is used for this turn only
+    cacheable = profile_version is not None and summaries_version is not None
+    prefix_version = (profile_version, summaries_version)
+    cached = prompt_segment_cache.get("prefix", user_id, prefix_version) if cacheable else None
+    trimmed = []
+    if cached is not None:
+        prefix, profile_bytes = cached
+    else:
+        # Profile and summaries are fitted once per version; what they trimmed is logged on that turn
+        budget = CHAT_PROMPT_TOKEN_BUDGET - CHAT_HISTORY_TOKEN_RESERVE - PROMPT_FIXED_TOKENS
+        comprehensive_user_data, summaries_context, trimmed = fit_profile_and_summaries(
+            comprehensive_user_data, summaries_context, budget
+        )
+        profile_segment = _profile_segment(comprehensive_user_data)
+        prefix = INSTRUCTIONS + profile_segment + _summaries_segment(summaries_context)
+        profile_bytes = len(profile_segment.encode("utf-8"))
+        if cacheable:
+            prompt_segment_cache.put("prefix", user_id, prefix_version, (prefix, profile_bytes), size=sys.getsizeof(prefix))
+    return _finish_prompt(user_id, prefix, profile_bytes, cached is not None, fetched["history"], trimmed, user_message)
+
+async def assemble_prompt_async(user_id, user_message, timings=None):
+    """
+    The prompt for one conversational turn. The profile, today's history and (unless cached)
+    the past summaries are fetched concurrently, each within its deadline; a source that
+    misses it is marked unavailable in the prompt. Per-source and total ms go into `timings`.
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    summaries_version = get_summaries_version(user_id)
+    summaries_context = prompt_segment_cache.get("summaries", user_id, summaries_version)
+
+    sources = {
+        "profile": (get_comprehensive_user_data_versioned(user_id), CHAT_PROFILE_DEADLINE_MS),
+        "history": (get_todays_chat_history_async(user_id), CHAT_HISTORY_DEADLINE_MS),
+    }
+    if summaries_context is None:
+        sources["summaries"] = (get_past_summaries_async(user_id), CHAT_SUMMARIES_DEADLINE_MS)
+    results = await asyncio.gather(*(
+        _fetch_async(name, fetch, deadline_ms, timings) for name, (fetch, deadline_ms) in sources.items()
+    ))
+
+    prompt = _assemble(user_id, user_message, summaries_version, summaries_context, dict(zip(sources, results)))
+    timings["prompt"] = round((time.perf_counter() - start) * 1000, 3)
+    return prompt
+
+def assemble_prompt(user_id, user_message, timings=None):
+    """Synchronous assemble_prompt_async for the Flask app; the sources run on threads."""
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    summaries_version = get_summaries_version(user_id)
+    summaries_context = prompt_segment_cache.get("summaries", user_id, summaries_version)
+
+    sources = {
+        "profile": (get_comprehensive_user_data_versioned_sync, CHAT_PROFILE_DEADLINE_MS),
+        "history": (get_todays_chat_history, CHAT_HISTORY_DEADLINE_MS),
+    }
+    if summaries_context is None:
+        sources["summaries"] = (get_past_summaries, CHAT_SUMMARIES_DEADLINE_MS)
+    fetched = _fetch_all_sync(user_id, sources, timings)
+
+    prompt = _assemble(user_id, user_message, summaries_version, summaries_context, fetched)
+    timings["prompt"] = round((time.perf_counter() - start) * 1000, 3)
+    return prompt
@@ -0,0 +1,82 @@
+"""
+Incremental extraction of the "response" string from the model's streamed JSON reply.
+
+The conversation prompt asks for {"response": "...", "symptoms": [...]}. While the reply
+streams in, ResponseFieldStream picks the "response" value out of the partial text and
+returns each newly completed piece of it, with JSON escapes decoded, so it can be shown
+before the whole object (and the symptoms list) has arrived.
+"""
+import json
+import re
+
+_RESPONSE_KEY = re.compile(r'"response"\s*:\s*"')
+_HEX = set("0123456789abcdefABCDEF")
+
+
+class ResponseFieldStream:
+    def __init__(self):
+        self.text = ""          # everything received so far
+        self.response = ""      # the decoded "response" value so far
+        self.complete = False   # the closing quote of the value has been seen
+        self._pos = 0           # where scanning resumes in self.text
+        self._in_value = False
+
+    def feed(self, chunk):
+        """Add a chunk of the reply; returns the newly decoded part of "response" (maybe "")."""
+        self.text += chunk
+        if self.complete:
+            return ""
+        if not self._in_value:
+            match = _RESPONSE_KEY.search(self.text, self._pos)
+            if match is None:
+                # The key may be split across chunks, with any amount of whitespace around
+                # its colon: resume from the last "{" or "," (a key can only start after one)
+                self._pos = max(self._pos, self.text.rfind("{", self._pos), self.text.rfind(",", self._pos))
+                return ""
+            self._pos = match.end()
+            self._in_value = True
+
+        delta = []
+        text = self.text
+        pos = self._pos
+        while pos < len(text):
+            char = text[pos]
+            if char == '"':
+                self.complete = True
+                pos += 1
+                break
+            if char != "\\":
+                delta.append(char)
+                pos += 1
+                continue
+            escape = self._escape_at(text, pos)
+            if escape is None:
+                break  # the rest of the escape sequence has not arrived yet
+            decoded, length = escape
+            delta.append(decoded)
+            pos += length
+        self._pos = pos
+        piece = "".join(delta)
+        self.response += piece
+        return piece
+
+    @staticmethod
+    def _escape_at(text, pos):
+        """Decode the escape sequence at text[pos] ("\\"); None if it is still incomplete."""
+        if pos + 1 >= len(text):
+            return None
+        if text[pos + 1] != "u":
+            return json.loads(f'"{text[pos:pos + 2]}"'), 2
+        sequence = text[pos:pos + 6]
+        if len(sequence) < 6:
+            return None
+        if not set(sequence[2:]) <= _HEX:
+            raise ValueError(f"Invalid escape in model reply: {sequence!r}")
+        if 0xD800 <= int(sequence[2:], 16) <= 0xDBFF:
+            # A high surrogate is only decodable together with the low one after it
+            pair = text[pos:pos + 12]
+            if len(pair) < 12:
+                return None
+            if pair[6:8] == "\\u":
+                return json.loads(f'"{pair}"'), 12
+        return json.loads(f'"{sequence}"'), 6
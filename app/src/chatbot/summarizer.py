@@ -3,7 +3,12 @@ import google.generativeai as genai
 from datetime import datetime, timezone
 
 # Import the Firebase handler to get data and save the summary
-from src.storage.firebase_handler import get_full_daily_conversation, save_daily_summary
+from src.storage.firebase_handler import (
+    get_full_daily_conversation,
+    save_daily_summary,
+    get_full_daily_conversation_async,
+    save_daily_summary_async,
+)
 
 # Configure the Gemini API key
 try:
@@ -23,6 +28,24 @@ def _format_conversation_for_summary(conversation):
         script += f"{role}: {message.get('message')}\n"
     return script
 
+def _build_summary_prompt(conversation_script):
+    """The summarization prompt for one day's conversation script."""
+    return f"""
+        You are a medical data analyst. Your task is to read the following conversation script between a user and an AI Health Companion and create a concise summary.
+
+        The summary should be a single paragraph and must include:
+        - The main health symptoms or concerns mentioned by the user.
+        - Any activities or lifestyle choices discussed (e.g., exercise, diet).
+        - The overall mood or sentiment of the user if discernible.
+
+        Conversation Script:
+        ---
+        {conversation_script}
+        ---
+
+        Concise Summary:
+        """
+
 def summarize_day_for_user(user_id):
     """
     Orchestrates the daily summarization for a specific user.
@@ -42,21 +65,7 @@ def summarize_day_for_user(user_id):
         conversation_script = _format_conversation_for_summary(conversation_log)
 
         # 3. Create a specific prompt for the summarization task
-        prompt = f"""
-        You are a medical data analyst. Your task is to read the following conversation script between a user and an AI Health Companion and create a concise summary.
-
-        The summary should be a single paragraph and must include:
-        - The main health symptoms or concerns mentioned by the user.
-        - Any activities or lifestyle choices discussed (e.g., exercise, diet).
-        - The overall mood or sentiment of the user if discernible.
-
-        Conversation Script:
-        ---
-        {conversation_script}
-        ---
-
-        Concise Summary:
-        """
+        prompt = _build_summary_prompt(conversation_script)
 
         # 4. Call the Gemini API to generate the summary
         model = genai.GenerativeModel('gemini-1.5-flash')
@@ -72,3 +81,32 @@ def summarize_day_for_user(user_id):
     except Exception as e:
         print(f"Error during summarization for user '{user_id}': {e}")
         return None
+
+async def summarize_day_for_user_async(user_id):
+    """
+    Async version of summarize_day_for_user for the FastAPI app: the Firestore and Gemini
+    calls are awaited instead of blocking a worker thread.
+    """
+    try:
+        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+        conversation_log = await get_full_daily_conversation_async(user_id, today_str)
+
+        if not conversation_log:
+            print(f"No conversation to summarize for user '{user_id}' on {today_str}.")
+            return "No conversation to summarize."
+
+        prompt = _build_summary_prompt(_format_conversation_for_summary(conversation_log))
+
+        model = genai.GenerativeModel('gemini-1.5-flash')
+        api_response = await model.generate_content_async(prompt)
+        summary_text = api_response.text.strip()
+
+        await save_daily_summary_async(user_id, today_str, summary_text)
+
+        print(f"Successfully generated and saved summary for user '{user_id}' for date {today_str}.")
+        return summary_text
+
+    except Exception as e:
+        print(f"Error during summarization for user '{user_id}': {e}")
+        return None
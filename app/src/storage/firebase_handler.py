@@ -1,9 +1,16 @@
+import asyncio
 import os
+import threading
 import google.cloud.firestore
 from datetime import datetime, timezone, timedelta
 
 # Use a global variable to hold the client instance (singleton pattern)
 _db_client = None
+# AsyncClient for the *_async functions, used from the FastAPI event loop
+_async_db_client = None
+# Summaries saved by this process, per user; part of get_summaries_version
+_summary_generations = {}
+_summary_generations_lock = threading.Lock()
 
 def _get_firestore_client():
     """Initializes and returns a Firestore client instance."""
@@ -16,6 +23,36 @@ def _get_firestore_client():
             print(f"FATAL: Could not initialize Firestore. Error: {e}")
     return _db_client
 
+def _get_async_firestore_client():
+    """Initializes and returns an async Firestore client instance."""
+    global _async_db_client
+    if _async_db_client is None:
+        try:
+            _async_db_client = google.cloud.firestore.AsyncClient(database="kanhaiya")
+            print("Async Firestore client initialized successfully for database 'kanhaiya'.")
+        except Exception as e:
+            print(f"FATAL: Could not initialize async Firestore. Error: {e}")
+    return _async_db_client
+
+def _daily_doc(db, user_id, date_str):
+    """The users/{user_id}/dailyData/{date} document holding a day's conversation or summary."""
+    return db.collection("users").document(str(user_id)).collection("dailyData").document(date_str)
+
+def get_summaries_version(user_id, days_to_fetch=7):
+    """
+    Version of what get_past_summaries returns for a user: today's date and window length
+    (the window moves daily) and the number of summaries this process has saved for the user.
+    Summaries are only written for the current day, which is outside the window until it rolls.
+    """
+    today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    with _summary_generations_lock:
+        return today_str, days_to_fetch, _summary_generations.get(str(user_id), 0)
+
+def _summary_saved(user_id):
+    with _summary_generations_lock:
+        key = str(user_id)
+        _summary_generations[key] = _summary_generations.get(key, 0) + 1
+
 def save_chat_history(user_id, sender, message):
     """Saves a single message to the user's chat history for the current day."""
     db = _get_firestore_client()
@@ -23,7 +60,7 @@ def save_chat_history(user_id, sender, message):
 
     try:
         today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        doc_ref = db.collection("users").document(user_id).collection("dailyData").document(today_str)
+        doc_ref = _daily_doc(db, user_id, today_str)
         chat_message = {
             "sender": sender,
             "message": message,
@@ -44,7 +81,7 @@ def get_todays_chat_history(user_id, limit=10):
 
     try:
         today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        doc_ref = db.collection("users").document(user_id).collection("dailyData").document(today_str)
+        doc_ref = _daily_doc(db, user_id, today_str)
         doc = doc_ref.get()
         if doc.exists:
             conversation = doc.to_dict().get("conversation", [])
@@ -60,7 +97,7 @@ def get_full_daily_conversation(user_id, date_str):
     if not db: return []
     
     try:
-        doc_ref = db.collection("users").document(user_id).collection("dailyData").document(date_str)
+        doc_ref = _daily_doc(db, user_id, date_str)
         doc = doc_ref.get()
         if doc.exists:
             return doc.to_dict().get("conversation", [])
@@ -78,7 +115,7 @@ def save_daily_summary(user_id, date_str, summary):
     if not db: return
     
     try:
-        doc_ref = db.collection("users").document(user_id).collection("dailyData").document(date_str)
+        doc_ref = _daily_doc(db, user_id, date_str)
         # --- THIS IS THE KEY CHANGE ---
         # We now completely overwrite the daily document.
         # This deletes the 'conversation' array and replaces it with the 'summary'.
@@ -86,6 +123,7 @@ def save_daily_summary(user_id, date_str, summary):
             "summary": summary,
             "summarized_at": datetime.now(timezone.utc) # Good practice to log when this happened
         })
+        _summary_saved(user_id)
         print(f"Successfully REPLACED conversation with summary for user '{user_id}' on {date_str}.")
     except Exception as e:
         print(f"Error saving summary and replacing conversation for user '{user_id}' on {date_str}: {e}")
@@ -105,7 +143,7 @@ def get_past_summaries(user_id, days_to_fetch=7):
         try:
             past_date = today - timedelta(days=i)
             date_str = past_date.strftime("%Y-%m-%d")
-            doc_ref = db.collection("users").document(user_id).collection("dailyData").document(date_str)
+            doc_ref = _daily_doc(db, user_id, date_str)
             doc = doc_ref.get()
             if doc.exists:
                 summary = doc.to_dict().get("summary")
@@ -117,3 +155,95 @@ def get_past_summaries(user_id, days_to_fetch=7):
             
     return sorted(summaries, key=lambda x: x['date'], reverse=True)
 
+
+# --- ASYNC VERSIONS (FastAPI) ---
+# Same documents and behaviour as the functions above, awaited on the event loop
+# instead of blocking a worker thread.
+
+async def save_chat_history_async(user_id, sender, message):
+    """Saves a single message to the user's chat history for the current day."""
+    db = _get_async_firestore_client()
+    if not db: return
+
+    try:
+        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        chat_message = {
+            "sender": sender,
+            "message": message,
+            "timestamp": datetime.now(timezone.utc)
+        }
+        await _daily_doc(db, user_id, today_str).set(
+            {"conversation": google.cloud.firestore.ArrayUnion([chat_message])},
+            merge=True
+        )
+    except Exception as e:
+        print(f"Error saving chat history for user '{user_id}': {e}")
+
+async def get_todays_chat_history_async(user_id, limit=10):
+    """Retrieves the most recent chat history for a user from the current day."""
+    db = _get_async_firestore_client()
+    if not db: return []
+
+    try:
+        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        doc = await _daily_doc(db, user_id, today_str).get()
+        if doc.exists:
+            conversation = doc.to_dict().get("conversation", [])
+            return conversation[-limit:]
+        return []
+    except Exception as e:
+        print(f"Error retrieving today's chat history for user '{user_id}': {e}")
+        return []
+
+async def get_full_daily_conversation_async(user_id, date_str):
+    """Fetches the entire conversation log for a specific day for summarization."""
+    db = _get_async_firestore_client()
+    if not db: return []
+
+    try:
+        doc = await _daily_doc(db, user_id, date_str).get()
+        if doc.exists:
+            return doc.to_dict().get("conversation", [])
+        return []
+    except Exception as e:
+        print(f"Error fetching full conversation for user '{user_id}' on {date_str}: {e}")
+        return []
+
+async def save_daily_summary_async(user_id, date_str, summary):
+    """Saves the daily summary and REPLACES the detailed conversation log."""
+    db = _get_async_firestore_client()
+    if not db: return
+
+    try:
+        await _daily_doc(db, user_id, date_str).set({
+            "summary": summary,
+            "summarized_at": datetime.now(timezone.utc)
+        })
+        _summary_saved(user_id)
+        print(f"Successfully REPLACED conversation with summary for user '{user_id}' on {date_str}.")
+    except Exception as e:
+        print(f"Error saving summary and replacing conversation for user '{user_id}' on {date_str}: {e}")
+
+async def get_past_summaries_async(user_id, days_to_fetch=7):
+    """
+    Retrieves conversation summaries from the past few days to provide long-term context.
+    The day documents are fetched concurrently rather than one after another.
+    """
+    db = _get_async_firestore_client()
+    if not db: return []
+
+    today = datetime.now(timezone.utc)
+    dates = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(1, days_to_fetch + 1)]
+    docs = await asyncio.gather(*(_daily_doc(db, user_id, date_str).get() for date_str in dates), return_exceptions=True)
+
+    summaries = []
+    for date_str, doc in zip(dates, docs):
+        if isinstance(doc, Exception):
+            print(f"Could not fetch summary for {date_str} for user '{user_id}': {doc}")
+            continue
+        if doc.exists:
+            summary = doc.to_dict().get("summary")
+            if summary:
+                summaries.append({"date": date_str, "summary": summary})
+
+    return sorted(summaries, key=lambda x: x['date'], reverse=True)
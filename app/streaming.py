@@ -0,0 +1,150 @@
+import json
+import os
+from typing import Any, AsyncIterator, Optional, Sequence, Tuple
+
+import aiosqlite
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from db import acquire_connection, READ
+from repositories.records import column_names, fetch_records, row_encoder, RowConverters
+
+
+# Rows fetched from the cursor per chunk written to the client
+STREAM_CHUNK_SIZE = int(os.getenv("DB_STREAM_CHUNK_SIZE", "500"))
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_ndjson(request: Request) -> bool:
+	return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def wants_stream(request: Request, stream: bool = False) -> bool:
+	"""Stream when asked for explicitly (?stream=true) or when the client accepts NDJSON."""
+	return stream or wants_ndjson(request)
+
+
+async def iter_rows_encoded(
+	conn: aiosqlite.Connection,
+	query: str,
+	params: Sequence[Any],
+	ndjson: bool = False,
+	chunk_size: int = STREAM_CHUNK_SIZE,
+	converters: Optional[RowConverters] = None,
+) -> AsyncIterator[bytes]:
+	"""
+	Run `query` and yield the result as a JSON array (or NDJSON lines), one chunk of
+	`chunk_size` rows at a time. Only one chunk of rows is held in memory.
+	"""
+	cursor = await conn.execute(query, params)
+	try:
+		cursor.row_factory = None
+		encode = row_encoder(column_names(cursor.description), converters)
+		first = True
+		if not ndjson:
+			yield b"["
+		while True:
+			rows = await cursor.fetchmany(chunk_size)
+			if not rows:
+				break
+			if ndjson:
+				yield ("\n".join([encode(row) for row in rows]) + "\n").encode("utf-8")
+			else:
+				body = ",".join([encode(row) for row in rows])
+				yield (body if first else "," + body).encode("utf-8")
+			first = False
+		if not ndjson:
+			yield b"]"
+	finally:
+		await cursor.close()
+
+
+class RowStreamResponse(StreamingResponse):
+	"""
+	Streams the rows of a read query straight from the cursor.
+
+	The read connection is borrowed when the response starts sending, before any headers
+	go out, so a busy pool still surfaces as a 503, and it is returned once the last
+	chunk is written or the client disconnects.
+	"""
+
+	def __init__(
+		self,
+		query: str,
+		params: Sequence[Any],
+		ndjson: bool = False,
+		chunk_size: int = STREAM_CHUNK_SIZE,
+		converters: Optional[RowConverters] = None,
+	) -> None:
+		self.query = query
+		self.params = list(params)
+		self.ndjson = ndjson
+		self.chunk_size = chunk_size
+		self.converters = converters
+		super().__init__((), media_type=NDJSON_MEDIA_TYPE if ndjson else JSON_MEDIA_TYPE)
+
+	async def __call__(self, scope, receive, send) -> None:
+		async with acquire_connection(READ) as conn:
+			self.body_iterator = iter_rows_encoded(
+				conn, self.query, self.params, self.ndjson, self.chunk_size, self.converters
+			)
+			try:
+				await super().__call__(scope, receive, send)
+			finally:
+				await self.body_iterator.aclose()
+
+
+def encode_event(event: str, data: Any) -> bytes:
+	"""One server-sent event whose data is `data` as a single line of JSON"""
+	payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+	return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+async def iter_events_encoded(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[bytes]:
+	async for event, data in events:
+		yield encode_event(event, data)
+
+
+class EventStreamResponse(StreamingResponse):
+	"""
+	Server-sent events from an async iterator of (event, data) pairs, each written to the
+	client as soon as it is produced. Proxies are asked not to buffer or cache the stream.
+	"""
+
+	def __init__(self, events: AsyncIterator[Tuple[str, Any]]) -> None:
+		super().__init__(
+			iter_events_encoded(events),
+			media_type=EVENT_STREAM_MEDIA_TYPE,
+			headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+		)
+
+
+async def records_response(
+	query: str,
+	params: Sequence[Any] = (),
+	converters: Optional[RowConverters] = None,
+) -> Response:
+	async with acquire_connection(READ) as conn:
+		records = await fetch_records(conn, query, params)
+	return Response(records.to_json(converters), media_type=JSON_MEDIA_TYPE)
+
+
+async def rows_response(
+	request: Request,
+	query: str,
+	params: Sequence[Any],
+	stream: bool = False,
+	converters: Optional[RowConverters] = None,
+) -> Response:
+	"""
+	Serve a read query as a JSON list, streamed if the request asks for it. Either way rows
+	go from tuples straight to JSON text, with no dicts or response-model validation in
+	between; `converters` patches up columns whose JSON type differs from SQLite's
+	(e.g. 0/1 flags to booleans).
+	"""
+	if wants_stream(request, stream):
+		return RowStreamResponse(query, params, ndjson=wants_ndjson(request), converters=converters)
+	return await records_response(query, params, converters)
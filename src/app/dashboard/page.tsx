@@ -9,7 +9,7 @@ import { MedicationSchedule } from '@/components/dashboard/MedicationSchedule';
 import { SymptomLogger } from '@/components/dashboard/SymptomLogger';
 import { MetricCardSkeleton } from '@/components/ui/LoadingSkeleton';
 import { useAuth } from '@/lib/auth';
-import { userAPI, metricsAPI, alertAPI } from '@/lib/api';
+import { userAPI } from '@/lib/api';
 import { 
   HeartIcon, 
   FireIcon, 
@@ -28,15 +28,11 @@ export default function DashboardPage() {
 
   useEffect(() => {
     if (user?.id) {
-      Promise.all([
-        userAPI.getProfile(user.id),
-        metricsAPI.getAll(user.id, undefined, 1),
-        alertAPI.getUpcoming(user.id, 24)
-      ])
-      .then(([profileRes, metricsRes, alertsRes]) => {
-        setUserProfile(profileRes.data);
-        setMetrics(metricsRes.data[0] || {});
-        setUpcomingAlerts(alertsRes.data);
+      userAPI.getDashboard(user.id, ['profile', 'metrics', 'upcoming_alerts'], 1, 24)
+      .then(({ data }) => {
+        setUserProfile(data.profile);
+        setMetrics(data.metrics?.[0] || {});
+        setUpcomingAlerts(data.upcoming_alerts || []);
         setLoading(false);
       })
       .catch(error => {
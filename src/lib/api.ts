@@ -131,6 +131,16 @@ export interface Report {
   content?: string;
 }
 
+export interface Dashboard {
+  user_id: number;
+  date?: string;
+  profile?: Partial<User>;
+  metrics?: DailyMetric[];
+  upcoming_alerts?: Alert[];
+  unread_count?: number;
+  medication_schedule?: any[];
+}
+
 // API Functions
 export const userAPI = {
   getProfile: (userId: number) => api.get<User>(`/users/${userId}/profile`),
@@ -138,6 +148,10 @@ export const userAPI = {
     api.put<User>(`/users/${userId}/profile`, data),
   getComprehensive: (userId: number) => 
     api.get<{user_id: number; comprehensive_data: string}>(`/users/${userId}/comprehensive`),
+  getDashboard: (userId: number, sections?: string[], metricsLimit?: number, hoursAhead?: number) =>
+    api.get<Dashboard>(`/users/${userId}/dashboard`, {
+      params: { sections: sections?.join(','), metrics_limit: metricsLimit, hours_ahead: hoursAhead }
+    }),
 };
 
 export const notificationAPI = {